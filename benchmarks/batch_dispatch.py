@@ -0,0 +1,68 @@
+"""Compare per-event listeners with batch listeners for a high-volume event.
+
+Usage::
+
+    python benchmarks/batch_dispatch.py [events] [batch_size]
+
+Dispatches ``events`` payloads to one listener called per event and to one
+batch listener called with ``batch_size`` events at a time, in sequential and
+concurrent dispatch mode.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from disagreement.event_dispatcher import EventDispatcher
+
+
+async def run(events: int, batch_size: int, batched: bool, concurrent: bool) -> float:
+    options = {"max_concurrency": 1000} if concurrent else {}
+    dispatcher = EventDispatcher(object(), **options)
+    seen = 0
+
+    async def listener(data) -> None:
+        nonlocal seen
+        seen += 1
+
+    async def batch_listener(items) -> None:
+        nonlocal seen
+        seen += len(items)
+
+    if batched:
+        dispatcher.register_batch(
+            "BENCH_PRESENCE", batch_listener, max_size=batch_size, max_delay=60
+        )
+    else:
+        dispatcher.register("BENCH_PRESENCE", listener)
+
+    payload = {"user": {"id": "1"}, "status": "online"}
+    start = time.perf_counter()
+    for _ in range(events):
+        await dispatcher.dispatch("BENCH_PRESENCE", payload)
+    await dispatcher.flush_batches()
+    await dispatcher.join()
+    elapsed = time.perf_counter() - start
+    assert seen == events
+    return elapsed
+
+
+async def main() -> None:
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    for concurrent in (False, True):
+        for batched in (False, True):
+            elapsed = await run(events, batch_size, batched, concurrent)
+            mode = "concurrent" if concurrent else "sequential"
+            kind = f"batches of {batch_size}" if batched else "per event"
+            print(
+                f"{mode:>10} {kind:>16}: {events} events in "
+                f"{elapsed * 1000:8.1f} ms  {elapsed / events * 1e6:6.2f} us/event"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
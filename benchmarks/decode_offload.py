@@ -0,0 +1,99 @@
+"""Measure event loop stalls while a huge GUILD_CREATE is decoded.
+
+Usage::
+
+    python benchmarks/decode_offload.py [members] [frames]
+
+Feeds large GUILD_CREATE frames through ``GatewayClient._process_message``
+with decoding inline, in a thread pool and in a process pool, while a
+:class:`disagreement.decode_pool.LoopStallMonitor` measures how late the loop
+runs a 10 ms probe (a stand-in for heartbeats).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+import zlib
+from typing import Optional
+
+import aiohttp
+
+from disagreement.decode_pool import DecodePool, LoopStallMonitor
+from disagreement.gateway import GatewayClient
+from disagreement.json_codec import get_codec
+
+from payloads import guild_create
+
+
+class Dispatcher:
+    async def dispatch(self, event_name: str, data: dict) -> None:
+        pass
+
+
+class Message:
+    type = aiohttp.WSMsgType.BINARY
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+
+def build_frames(members: int, count: int) -> list[bytes]:
+    rng = random.Random(0)
+    codec = get_codec("json")
+    compressor = zlib.compressobj()
+    return [
+        compressor.compress(codec.dumps_bytes(guild_create(rng, members)))
+        + compressor.flush(zlib.Z_SYNC_FLUSH)
+        for _ in range(count)
+    ]
+
+
+async def run(name: str, frames: list[bytes], pool: Optional[DecodePool]) -> None:
+    gateway = GatewayClient(
+        http_client=None,
+        event_dispatcher=Dispatcher(),
+        token="t",
+        intents=0,
+        client_instance=object(),
+        max_decompression_size=1 << 30,
+        decode_pool=pool,
+        lazy_dispatch=False,
+    )
+    monitor = LoopStallMonitor(interval=0.01, threshold=0.02)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    for frame in frames:
+        await gateway._process_message(Message(frame))
+        await asyncio.sleep(0)  # the receive loop yields between frames
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    if pool is not None:
+        pool.close()
+
+    stats = gateway.decode_stats
+    print(
+        f"{name:>8}: {elapsed * 1000:8.1f} ms total  "
+        f"max stall {monitor.max_stall * 1000:7.1f} ms  "
+        f"stalled {monitor.total_stall * 1000:8.1f} ms  "
+        f"inline decode {stats.loop_time * 1000:8.1f} ms"
+    )
+
+
+async def main() -> None:
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    frames = build_frames(members, count)
+    size = sum(map(len, frames)) / count / 1024 / 1024
+    print(f"{count} GUILD_CREATE frames of {members} members ({size:.1f} MiB compressed)")
+    await run("inline", frames, None)
+    await run("thread", frames, DecodePool(threshold=0, executor="thread"))
+    await run("process", frames, DecodePool(threshold=0, executor="process"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
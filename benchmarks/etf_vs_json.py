@@ -0,0 +1,82 @@
+"""Compare ETF and JSON Gateway encodings on the same event stream.
+
+Usage::
+
+    python benchmarks/etf_vs_json.py [payloads.jsonl]
+
+Reports raw and zlib-stream compressed bytes on the wire together with decode
+time for :mod:`disagreement.etf` and each installed JSON backend. Snowflakes are
+sent as integers over ETF, so string IDs are converted before encoding to mirror
+what Discord transmits.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import zlib
+from typing import Any
+
+from disagreement import etf
+from disagreement.json_codec import available_codecs, get_codec
+
+from payloads import load_payloads
+
+
+def as_wire_etf(value: Any, key: Any = None) -> Any:
+    if isinstance(value, dict):
+        return {k: as_wire_etf(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [as_wire_etf(v, key) for v in value]
+    if (
+        isinstance(value, str)
+        and value.isdigit()
+        and len(value) >= 17
+        and (key in etf.SNOWFLAKE_LIST_KEYS or key == "id" or str(key).endswith("_id"))
+    ):
+        return int(value)
+    return value
+
+
+def compressed_size(frames: list[bytes]) -> int:
+    compressor = zlib.compressobj()
+    total = 0
+    for frame in frames:
+        total += len(compressor.compress(frame))
+        total += len(compressor.flush(zlib.Z_SYNC_FLUSH))
+    return total
+
+
+def time_decode(loads, frames: list[bytes], rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for frame in frames:
+            loads(frame)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    stream = load_payloads(sys.argv[1] if len(sys.argv) > 1 else None)
+    json_frames = [get_codec("json").dumps_bytes(p) for p in stream]
+    etf_frames = [etf.dumps(as_wire_etf(p), atom_keys=True) for p in stream]
+
+    print(f"{len(stream)} events")
+    print(f"{'encoding':>12} {'raw KiB':>10} {'zlib KiB':>10} {'decode ms':>10}")
+    for name in available_codecs():
+        codec = get_codec(name)
+        print(
+            f"{'json/' + name:>12} {sum(map(len, json_frames)) / 1024:10.1f} "
+            f"{compressed_size(json_frames) / 1024:10.1f} "
+            f"{time_decode(codec.loads, json_frames) * 1000:10.2f}"
+        )
+    print(
+        f"{'etf':>12} {sum(map(len, etf_frames)) / 1024:10.1f} "
+        f"{compressed_size(etf_frames) / 1024:10.1f} "
+        f"{time_decode(etf.loads, etf_frames) * 1000:10.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
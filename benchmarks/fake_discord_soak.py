@@ -0,0 +1,109 @@
+"""Soak a sharded client against the in-process fake Discord.
+
+Usage::
+
+    python benchmarks/fake_discord_soak.py [shards] [seconds]
+
+Starts a :class:`~disagreement.fake_discord.FakeDiscord`, connects a sharded
+:class:`~disagreement.client.Client` and reports time to READY, sustained
+event throughput, how long every shard takes to resume after a RECONNECT
+storm and how :class:`~disagreement.http.HTTPClient` paces a burst of REST
+calls against the fake's rate limits. No network access is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from disagreement.client import Client
+from disagreement.fake_discord import FakeDiscord
+
+
+async def wait_for(predicate, timeout: float = 30.0) -> float:
+    start = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("condition not met")
+        await asyncio.sleep(0.01)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    shards = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    async with FakeDiscord(
+        guilds=shards * 25,
+        members_per_guild=100,
+        shards=shards,
+        max_concurrency=shards,
+        heartbeat_interval=1000,
+        event_rate=500,
+        rest_rate_limit=5,
+        rest_rate_window=0.5,
+    ) as fake:
+        client = Client(
+            token=fake.token,
+            shard_count=shards,
+            sync_commands_on_ready=False,
+            http_options={"base_url": fake.api_url},
+        )
+        messages = 0
+
+        @client.on_event("MESSAGE_CREATE")
+        async def on_message(message) -> None:
+            nonlocal messages
+            messages += 1
+
+        start = time.perf_counter()
+        await client.connect()
+        await client.wait_until_ready()
+        ready = await wait_for(lambda: len(client.guilds) == len(fake.guilds))
+        print(
+            f"ready: {shards} shards, {len(client.guilds)} guilds in "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms "
+            f"(guilds cached {ready * 1000:.0f} ms after READY)"
+        )
+
+        dispatches = fake.stats.dispatches
+        messages = 0
+        await asyncio.sleep(seconds)
+        sent = fake.stats.dispatches - dispatches
+        print(
+            f"throughput: {sent / seconds:,.0f} dispatches/s sent, "
+            f"{messages / seconds:,.0f} messages/s handled"
+        )
+
+        for storm, inject in (
+            ("RECONNECT", fake.inject_reconnect),
+            ("dropped connections", fake.drop_connections),
+        ):
+            resumes = fake.stats.resumes
+            await inject()
+            recovered = await wait_for(
+                lambda: fake.stats.resumes - resumes == shards
+            )
+            print(f"{storm} storm: all shards resumed in {recovered * 1000:.0f} ms")
+
+        http = client._http
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(http.request("GET", "/users/@me") for _ in range(30)),
+            return_exceptions=True,
+        )
+        failed = sum(isinstance(r, Exception) for r in results)
+        print(
+            f"REST burst: 30 requests in {(time.perf_counter() - start) * 1000:.0f} ms, "
+            f"{fake.stats.rate_limited} answered with 429, {failed} failed"
+        )
+        print(
+            f"zombie disconnects: {client.zombie_disconnects}, "
+            f"identifies: {fake.stats.identifies}"
+        )
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
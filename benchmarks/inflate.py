@@ -0,0 +1,117 @@
+"""Measure zlib-stream inflation during a large READY burst.
+
+Usage::
+
+    python benchmarks/inflate.py [guilds] [members_per_guild]
+
+Compares the previous approach (copy every frame into a buffer, inflate the
+whole buffer, decode to ``str`` and parse) with
+:class:`disagreement.compression.ZlibStreamInflater`, which inflates frames in
+place and hands bytes straight to the codec. When a zstd implementation is
+installed the same burst is also sent through
+:class:`disagreement.compression.ZstdStreamInflater`. Reports wall time
+including JSON decoding, the peak memory traced while inflating the burst and
+the compressed size of each variant.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+
+from disagreement.compression import (
+    ZSTD_AVAILABLE,
+    ZlibStreamInflater,
+    ZstdStreamInflater,
+)
+from disagreement.json_codec import get_codec
+
+from payloads import guild_create
+
+
+def build_payloads(guilds: int, members: int) -> list[bytes]:
+    rng = random.Random(0)
+    codec = get_codec("json")
+    return [codec.dumps_bytes(guild_create(rng, members)) for _ in range(guilds)]
+
+
+def zlib_frames(payloads: list[bytes]) -> list[bytes]:
+    compressor = zlib.compressobj()
+    return [
+        compressor.compress(raw) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        for raw in payloads
+    ]
+
+
+def zstd_frames(payloads: list[bytes]) -> list[bytes]:
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor().compressobj()
+    return [
+        compressor.compress(raw) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        for raw in payloads
+    ]
+
+
+def legacy(frames: list[bytes], loads) -> None:
+    buffer = bytearray()
+    inflator = zlib.decompressobj()
+    for frame in frames:
+        buffer.extend(frame)
+        decompressed = inflator.decompress(buffer)
+        buffer.clear()
+        loads(decompressed.decode("utf-8"))
+
+
+def streaming(frames: list[bytes], loads) -> None:
+    inflater = ZlibStreamInflater(max_size=256 * 1024 * 1024)
+    for frame in frames:
+        loads(inflater.feed(frame))
+
+
+def zstd_streaming(frames: list[bytes], loads) -> None:
+    inflater = ZstdStreamInflater(max_size=256 * 1024 * 1024)
+    for frame in frames:
+        loads(inflater.feed(frame))
+
+
+def measure(name: str, func, frames: list[bytes], loads) -> None:
+    start = time.perf_counter()
+    func(frames, loads)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(frames, lambda data: None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:>10}: {elapsed * 1000:8.1f} ms  "
+        f"inflate peak {peak / 1024 / 1024:7.2f} MiB  "
+        f"wire {sum(map(len, frames)) / 1024:8.0f} KiB"
+    )
+
+
+def main() -> None:
+    guilds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    payloads = build_payloads(guilds, members)
+    frames = zlib_frames(payloads)
+    print(f"{guilds} GUILD_CREATE frames, {sum(map(len, payloads)) / 1024:.0f} KiB raw")
+    loads = get_codec("auto").loads
+    measure("legacy", legacy, frames, loads)
+    measure("streaming", streaming, frames, loads)
+    try:
+        measure("zstd", zstd_streaming, zstd_frames(payloads), loads)
+    except ImportError:
+        if ZSTD_AVAILABLE:
+            print("      zstd: install zstandard to build benchmark frames")
+        else:
+            print("      zstd: not installed, skipped")
+
+
+if __name__ == "__main__":
+    main()
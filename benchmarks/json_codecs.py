@@ -0,0 +1,54 @@
+"""Compare the JSON backends in :mod:`disagreement.json_codec`.
+
+Usage::
+
+    python benchmarks/json_codecs.py [payloads.jsonl]
+
+Each installed backend decodes and encodes the same Gateway payloads. When a
+file is given it should contain one Gateway message per line.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from disagreement.json_codec import available_codecs, get_codec
+
+from payloads import load_payloads
+
+
+def bench(name: str, frames: list[bytes], objects: list, rounds: int = 5) -> None:
+    codec = get_codec(name)
+
+    best_decode = float("inf")
+    best_encode = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for frame in frames:
+            codec.loads(frame)
+        best_decode = min(best_decode, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for obj in objects:
+            codec.dumps_bytes(obj)
+        best_encode = min(best_encode, time.perf_counter() - start)
+
+    print(
+        f"{name:>8}: decode {best_decode * 1000:8.2f} ms  "
+        f"encode {best_encode * 1000:8.2f} ms"
+    )
+
+
+def main() -> None:
+    objects = load_payloads(sys.argv[1] if len(sys.argv) > 1 else None)
+    stdlib = get_codec("json")
+    frames = [stdlib.dumps_bytes(obj) for obj in objects]
+    total = sum(len(f) for f in frames)
+    print(f"{len(frames)} payloads, {total / 1024:.1f} KiB of JSON")
+    for name in available_codecs():
+        bench(name, frames, objects)
+
+
+if __name__ == "__main__":
+    main()
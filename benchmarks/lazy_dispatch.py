@@ -0,0 +1,73 @@
+"""Measure the cost of a PRESENCE_UPDATE flood that no listener handles.
+
+Usage::
+
+    python benchmarks/lazy_dispatch.py [events]
+
+Feeds compressed presence frames through ``GatewayClient._process_message``
+with lazy dispatch disabled (every frame decoded and dispatched) and enabled
+(only the ``t``/``s`` header is read).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+import zlib
+
+import aiohttp
+
+from disagreement.event_dispatcher import EventDispatcher
+from disagreement.gateway import GatewayClient
+from disagreement.json_codec import get_codec
+
+from payloads import presence_update
+
+
+class Message:
+    type = aiohttp.WSMsgType.BINARY
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+
+def build_frames(count: int) -> list[bytes]:
+    rng = random.Random(0)
+    codec = get_codec("json")
+    compressor = zlib.compressobj()
+    return [
+        compressor.compress(codec.dumps_bytes(presence_update(rng, seq)))
+        + compressor.flush(zlib.Z_SYNC_FLUSH)
+        for seq in range(count)
+    ]
+
+
+async def run(frames: list[bytes], lazy: bool) -> float:
+    gateway = GatewayClient(
+        http_client=None,
+        event_dispatcher=EventDispatcher(object()),
+        token="t",
+        intents=0,
+        client_instance=object(),
+        lazy_dispatch=lazy,
+    )
+    messages = [Message(frame) for frame in frames]
+    start = time.perf_counter()
+    for message in messages:
+        await gateway._process_message(message)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    frames = build_frames(count)
+    print(f"{count} PRESENCE_UPDATE frames, codec {get_codec('auto').name}")
+    for name, lazy in (("eager", False), ("lazy", True)):
+        elapsed = await run(frames, lazy)
+        print(f"{name:>6}: {elapsed * 1000:8.1f} ms  {elapsed / count * 1e6:6.2f} us/event")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
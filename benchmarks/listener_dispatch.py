@@ -0,0 +1,53 @@
+"""Measure per-event overhead of ``EventDispatcher`` listener invocation.
+
+Usage::
+
+    python benchmarks/listener_dispatch.py [events] [listeners]
+
+Dispatches an event without a parser to a set of no-op listeners taking zero
+or one argument, so the timing is dominated by the dispatcher itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from disagreement.event_dispatcher import EventDispatcher
+
+
+async def main() -> None:
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    listeners = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    dispatcher = EventDispatcher(object())
+    for index in range(listeners):
+        if index % 2:
+
+            async def listener(data: dict) -> None:
+                pass
+
+        else:
+
+            async def listener() -> None:  # type: ignore[misc]
+                pass
+
+        dispatcher.register("BENCH_EVENT", listener)
+
+    payload = {"id": "1"}
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(events):
+            await dispatcher.dispatch("BENCH_EVENT", payload)
+        best = min(best, time.perf_counter() - start)
+
+    print(
+        f"{events} events x {listeners} listeners: {best * 1000:8.1f} ms  "
+        f"{best / events * 1e6:6.2f} us/event"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Measure the memory used by cached members and messages.
+
+Usage::
+
+    python benchmarks/model_memory.py [members] [messages]
+
+Builds ``members`` synthetic members in one guild's member cache, once as
+``Member`` objects and once in a ``ColumnarMemberStore``, and ``messages``
+messages in the client's message cache, and reports the bytes allocated per
+entry with :mod:`tracemalloc`. Payloads are JSON decoded inside the measured
+loop, as the Gateway would, so strings kept by the cache are counted. Member
+roles are one of 100 combinations of 30 guild roles. Run it on two revisions to
+compare model layouts, e.g. before and after adding ``__slots__``.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from disagreement.cache import Cache, MemberCache
+from disagreement.caching import MemberCacheFlags
+from disagreement.member_store import ColumnarMemberStore
+from disagreement.models import Member, Message
+
+from payloads import member, message_create
+
+
+def measure(
+    label: str,
+    cache: Cache[Any],
+    payloads: List[bytes],
+    build: Callable[[Dict[str, Any]], Any],
+) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for raw in payloads:
+        model = build(json.loads(raw))
+        cache.set(model.id, model)
+    elapsed = time.perf_counter() - start
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(payloads)
+    print(
+        f"{label:>8}: {count} cached  {used / 2**20:8.1f} MiB  "
+        f"{used / count:7.0f} B/entry  {elapsed / count * 1e6:6.2f} us/entry"
+    )
+
+
+def main() -> None:
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    rng = random.Random(0)
+    roles = [str(rng.randrange(10**17, 10**18)) for _ in range(30)]
+    role_sets = [rng.sample(roles, rng.randrange(0, 6)) for _ in range(100)]
+    member_payloads = []
+    for _ in range(members):
+        data = member(rng)
+        data["roles"] = rng.choice(role_sets)
+        member_payloads.append(json.dumps(data).encode())
+    message_payloads = [
+        json.dumps(message_create(rng, seq)["d"]).encode() for seq in range(messages)
+    ]
+
+    flags = MemberCacheFlags.all()
+    build_member = lambda data: Member(data, None)
+    measure("members", MemberCache(flags), member_payloads, build_member)
+    # Members are built one at a time and only the columns are kept.
+    measure("columnar", ColumnarMemberStore("1", flags), member_payloads, build_member)
+    measure(
+        "messages",
+        Cache(),
+        message_payloads,
+        lambda data: Message(data, None),  # type: ignore[arg-type]
+    )
+
+
+if __name__ == "__main__":
+    main()
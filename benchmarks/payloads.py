@@ -0,0 +1,145 @@
+"""Representative Gateway payloads shared by the benchmark scripts.
+
+Payloads can also be loaded from a file containing one JSON encoded Gateway
+message per line, such as a capture taken from a production shard.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+
+def _snowflake(rng: random.Random) -> str:
+    return str(rng.randrange(10**17, 10**19))
+
+
+def _user(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": _snowflake(rng),
+        "username": f"user{rng.randrange(100000)}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": "a_" + "%032x" % rng.getrandbits(128),
+        "bot": False,
+    }
+
+
+def member(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "user": _user(rng),
+        "nick": None,
+        "roles": [_snowflake(rng) for _ in range(rng.randrange(0, 6))],
+        "joined_at": "2024-01-01T00:00:00.000000+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def guild_create(rng: random.Random, members: int = 1000) -> Dict[str, Any]:
+    guild_id = _snowflake(rng)
+    return {
+        "op": 0,
+        "s": 2,
+        "t": "GUILD_CREATE",
+        "d": {
+            "id": guild_id,
+            "name": "Benchmark Guild",
+            "owner_id": _snowflake(rng),
+            "member_count": members,
+            "afk_timeout": 300,
+            "verification_level": 1,
+            "default_message_notifications": 1,
+            "explicit_content_filter": 2,
+            "emojis": [],
+            "features": ["COMMUNITY"],
+            "mfa_level": 0,
+            "system_channel_flags": 0,
+            "premium_tier": 1,
+            "nsfw_level": 0,
+            "roles": [
+                {
+                    "id": _snowflake(rng),
+                    "name": f"role{i}",
+                    "color": 0,
+                    "hoist": False,
+                    "position": i,
+                    "permissions": "0",
+                    "managed": False,
+                    "mentionable": False,
+                }
+                for i in range(50)
+            ],
+            "channels": [
+                {"id": _snowflake(rng), "type": 0, "name": f"channel-{i}"}
+                for i in range(100)
+            ],
+            "members": [member(rng) for _ in range(members)],
+            "presences": [
+                {"user": {"id": _snowflake(rng)}, "status": "online"}
+                for _ in range(members // 4)
+            ],
+        },
+    }
+
+
+def message_create(rng: random.Random, seq: int) -> Dict[str, Any]:
+    return {
+        "op": 0,
+        "s": seq,
+        "t": "MESSAGE_CREATE",
+        "d": {
+            "id": _snowflake(rng),
+            "channel_id": _snowflake(rng),
+            "guild_id": _snowflake(rng),
+            "author": _user(rng),
+            "member": {"roles": [_snowflake(rng)], "joined_at": "2024-01-01"},
+            "content": "hello world " * rng.randrange(1, 10),
+            "timestamp": "2024-01-01T00:00:00.000000+00:00",
+            "tts": False,
+            "mentions": [],
+            "embeds": [],
+            "attachments": [],
+        },
+    }
+
+
+def presence_update(rng: random.Random, seq: int) -> Dict[str, Any]:
+    return {
+        "t": "PRESENCE_UPDATE",
+        "s": seq,
+        "op": 0,
+        "d": {
+            "user": {"id": _snowflake(rng)},
+            "guild_id": _snowflake(rng),
+            "status": rng.choice(["online", "idle", "dnd", "offline"]),
+            "activities": [],
+            "client_status": {"desktop": "online"},
+        },
+    }
+
+
+def event_stream(
+    count: int = 2000, *, guilds: int = 2, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Return a mixed stream of Gateway messages."""
+
+    rng = random.Random(seed)
+    stream: List[Dict[str, Any]] = [guild_create(rng) for _ in range(guilds)]
+    for seq in range(count):
+        if rng.random() < 0.6:
+            stream.append(presence_update(rng, seq + 3))
+        else:
+            stream.append(message_create(rng, seq + 3))
+    return stream
+
+
+def load_payloads(path: Optional[str] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    """Load payloads from ``path`` or synthesize them if no path is given."""
+
+    if path is None:
+        return event_stream(**kwargs)
+    with open(path, "r", encoding="utf-8") as fp:
+        return [json.loads(line) for line in fp if line.strip()]
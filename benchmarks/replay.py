@@ -0,0 +1,72 @@
+"""Replay Gateway traffic through the full client pipeline.
+
+Usage::
+
+    python benchmarks/replay.py [recording] [--paced]
+
+Without a recording, a mixed stream from :func:`payloads.event_stream` is
+compressed into a temporary recording first. Frames are inflated, decoded,
+dispatched and cached by a real :class:`~disagreement.client.Client`, so this
+measures end-to-end dispatch throughput on production captures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import zlib
+
+import aiohttp
+
+from disagreement.client import Client
+from disagreement.json_codec import get_codec
+from disagreement.recording import GatewayRecorder
+from disagreement.replay import replay
+
+from payloads import event_stream
+
+
+def synthesize(path: str) -> None:
+    codec = get_codec("json")
+    compressor = zlib.compressobj()
+    recorder = GatewayRecorder(path, {"encoding": "json", "compress": "zlib-stream"})
+    recorder.mark_connect()
+    for message in event_stream(20000):
+        frame = compressor.compress(codec.dumps_bytes(message))
+        frame += compressor.flush(zlib.Z_SYNC_FLUSH)
+        recorder.record(aiohttp.WSMsgType.BINARY, frame)
+    recorder.close()
+
+
+async def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    paced = "--paced" in sys.argv
+    if args:
+        path = args[0]
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "synthetic.rec")
+        synthesize(path)
+
+    client = Client(token="t")
+
+    @client.on_event("MESSAGE_CREATE")
+    async def on_message(message) -> None:
+        pass
+
+    stats = await replay(path, client, paced=paced)
+    await client.close()
+    print(
+        f"{stats.frames} frames ({stats.bytes / 1e6:.1f} MB compressed), "
+        f"{stats.dispatches} dispatches in {stats.elapsed * 1000:.0f} ms"
+    )
+    print(
+        f"{stats.frames_per_second:,.0f} frames/s, "
+        f"{stats.dispatches_per_second:,.0f} dispatches/s, "
+        f"{len(client.guilds)} guilds cached"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Measure ``MESSAGE_CREATE`` dispatch cost with many open ``wait_for`` calls.
+
+Usage::
+
+    python benchmarks/wait_for_index.py [waiters] [events]
+
+Registers one waiter per channel, either with a ``check`` comparing the
+channel ID (scanned for every event) or with ``channel_id=`` (looked up in
+the waiter index), and dispatches messages to channels nobody waits on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from disagreement.event_dispatcher import EventDispatcher
+
+
+async def run(waiters: int, events: int, keyed: bool) -> float:
+    dispatcher = EventDispatcher(object())
+    loop = asyncio.get_running_loop()
+    for index in range(waiters):
+        channel_id = str(index)
+        if keyed:
+            dispatcher.add_waiter(
+                "BENCH_MESSAGE", loop.create_future(), keys={"channel_id": channel_id}
+            )
+        else:
+            dispatcher.add_waiter(
+                "BENCH_MESSAGE",
+                loop.create_future(),
+                lambda m, c=channel_id: m["channel_id"] == c,
+            )
+
+    payload = {"id": "1", "channel_id": "unwatched"}
+    start = time.perf_counter()
+    for _ in range(events):
+        await dispatcher.dispatch("BENCH_MESSAGE", payload)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    waiters = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    events = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    for keyed in (False, True):
+        elapsed = await run(waiters, events, keyed)
+        label = "channel_id=" if keyed else "check only"
+        print(
+            f"{label:>12}: {waiters} waiters, {events} events: "
+            f"{elapsed * 1000:8.1f} ms  {elapsed / events * 1e6:8.2f} us/event"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
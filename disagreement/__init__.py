@@ -15,6 +15,7 @@ __copyright__ = "Copyright 2025 Slipstream"
 __version__ = "0.8.1"
 
 from .client import Client, AutoShardedClient
+from .cluster import ClusterSupervisor
 from .asset import Asset
 from .models import (
     Message,
@@ -127,6 +128,7 @@ import logging
 __all__ = [
     "Client",
     "AutoShardedClient",
+    "ClusterSupervisor",
     "Asset",
     "Message",
     "User",
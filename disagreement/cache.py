@@ -1,7 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import enum
+import heapq
+import logging
+import sys
 import time
-from typing import TYPE_CHECKING, Callable, Dict, Generic, Optional, TypeVar
+import types
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from collections import OrderedDict
 
 if TYPE_CHECKING:
@@ -10,24 +27,196 @@ if TYPE_CHECKING:
 
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
+# Called with the key, the value and why it left the cache: ``"expired"``,
+# ``"maxlen"`` or ``"memory"``. Explicit :meth:`Cache.invalidate` and
+# :meth:`Cache.clear` calls do not notify.
+EvictionCallback = Callable[[str, T, str], None]
+
+# Attributes that point at shared client state rather than data owned by the
+# object being measured.
+_SKIP_ATTRS = frozenset({"_client", "client", "_state"})
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    enum.Enum,
+)
+_LEAF_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+
+def estimate_size(obj: Any, max_depth: int = 8) -> int:
+    """Approximate the memory owned by ``obj`` in bytes.
+
+    Follows containers and the attributes of plain objects up to
+    ``max_depth`` levels, counting each object once. Client references,
+    nested caches, classes, functions and enum members are shared and not
+    counted.
+    """
+
+    seen: set[int] = set()
+    total = 0
+    stack: List[Tuple[Any, int]] = [(obj, 0)]
+    while stack:
+        item, depth = stack.pop()
+        if id(item) in seen or isinstance(item, (_SHARED_TYPES, Cache)):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, _LEAF_TYPES) or depth >= max_depth:
+            continue
+        depth += 1
+        if isinstance(item, dict):
+            for key, value in item.items():
+                stack.append((key, depth))
+                stack.append((value, depth))
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend((value, depth) for value in item)
+        else:
+            attrs = getattr(item, "__dict__", None)
+            if attrs is not None:
+                total += sys.getsizeof(attrs)
+                stack.extend(
+                    (value, depth)
+                    for name, value in attrs.items()
+                    if name not in _SKIP_ATTRS
+                )
+            for cls in type(item).__mro__:
+                for name in cls.__dict__.get("__slots__", ()):
+                    if name in _SKIP_ATTRS or name in ("__dict__", "__weakref__"):
+                        continue
+                    value = getattr(item, name, None)
+                    if value is not None:
+                        stack.append((value, depth))
+    return total
+
+
+class MemoryBudget:
+    """Byte limit shared by several caches.
+
+    Caches attached with :meth:`Cache.add_budget` report the estimated size of
+    their entries here. When the total goes over ``max_bytes``, the oldest
+    entries of the largest caches are evicted with reason ``"memory"`` until
+    the total fits again.
+    """
+
+    def __init__(self, max_bytes: Optional[int], name: str = "") -> None:
+        self.max_bytes = max_bytes
+        self.name = name
+        # Running total of the attached caches, kept up to date by them.
+        self.used: int = 0
+        self.evictions: int = 0
+        self._caches: "weakref.WeakSet[Cache[Any]]" = weakref.WeakSet()
+
+    def __repr__(self) -> str:
+        return f"<MemoryBudget name={self.name!r} used={self.used} max_bytes={self.max_bytes}>"
+
+    @property
+    def caches(self) -> List["Cache[Any]"]:
+        return list(self._caches)
+
+    def recount(self) -> int:
+        """Recompute :attr:`used` from the caches still alive."""
+
+        self.used = sum(cache.nbytes for cache in self._caches)
+        return self.used
+
+    def _enforce(self) -> None:
+        if self.max_bytes is None or self.used <= self.max_bytes:
+            return
+        while self.used > self.max_bytes:
+            largest = heapq.nlargest(2, self._caches, key=lambda c: c.nbytes)
+            if not largest or not largest[0].nbytes:
+                break
+            cache = largest[0]
+            # Drain the largest cache down to the next one before comparing
+            # again, so each round does not rescan every attached cache.
+            floor = largest[1].nbytes if len(largest) > 1 else 0
+            while self.used > self.max_bytes and cache.nbytes > floor:
+                if not cache._evict_oldest("memory"):
+                    break
+                self.evictions += 1
+
 
 class Cache(Generic[T]):
-    """Simple in-memory cache with optional TTL and max size support."""
+    """Simple in-memory cache with optional TTL and max size support.
+
+    Expiry times are kept in a min-heap, so expired entries can be dropped in
+    order of expiry without scanning the whole cache. :meth:`expire` does
+    this on demand, :meth:`values` calls it before listing, and
+    :meth:`start_sweeper` runs it periodically so dead entries do not stay
+    in memory until the cache is read.
+
+    ``max_bytes`` limits the estimated size of the entries instead of their
+    number. Sizes come from ``sizeof`` (:func:`estimate_size` by default) and
+    are only computed when the cache has a byte limit or a
+    :class:`MemoryBudget`.
+    """
+
+    # Entries removed per sweep before the sweeper yields to the event loop.
+    SWEEP_BATCH = 1000
 
     def __init__(
-        self, ttl: Optional[float] = None, maxlen: Optional[int] = None
+        self,
+        ttl: Optional[float] = None,
+        maxlen: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[T], int]] = None,
     ) -> None:
         self.ttl = ttl
         self.maxlen = maxlen
+        self.max_bytes = max_bytes
+        self.sizeof: Callable[[Any], int] = sizeof or estimate_size
         self._data: "OrderedDict[str, tuple[T, Optional[float]]]" = OrderedDict()
+        # (expiry, key) per set(); entries whose expiry no longer matches
+        # ``_data`` are stale and skipped when popped.
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._eviction_callbacks: List[EvictionCallback[T]] = []
+        # Set by start_sweeper(); a sweep is only scheduled while the heap
+        # holds entries.
+        self._sweep_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sweep_interval: Optional[float] = None
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+        self._budgets: List[MemoryBudget] = []
+        # Estimated size per key, kept only while sizes are tracked.
+        self._sizes: Dict[str, int] = {}
+        self.nbytes: int = 0
+        self.evictions: Dict[str, int] = {}
+
+    def __del__(self) -> None:
+        # A guild's member cache goes away with the guild; stop counting it.
+        for budget in getattr(self, "_budgets", ()):
+            budget.used -= self.nbytes
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self._data)
+
+    @property
+    def tracks_size(self) -> bool:
+        return self.max_bytes is not None or bool(self._budgets)
 
     def set(self, key: str, value: T) -> None:
         expiry = time.monotonic() + self.ttl if self.ttl is not None else None
         if key in self._data:
             self._data.move_to_end(key)
         self._data[key] = (value, expiry)
+        if expiry is not None:
+            heapq.heappush(self._expiry_heap, (expiry, key))
+            if self._sweep_interval is not None and self._sweep_handle is None:
+                self._schedule_sweep(self._sweep_interval)
+            if len(self._expiry_heap) > 2 * len(self._data) + 64:
+                self._compact_heap()
         if self.maxlen is not None and len(self._data) > self.maxlen:
-            self._data.popitem(last=False)
+            self._evict_oldest("maxlen")
+        if self.tracks_size and key in self._data:
+            size = self.sizeof(value)
+            self._account(size - self._sizes.get(key, 0))
+            self._sizes[key] = size
+            self._enforce_memory()
 
     def get(self, key: str) -> Optional[T]:
         item = self._data.get(key)
@@ -35,7 +224,8 @@ class Cache(Generic[T]):
             return None
         value, expiry = item
         if expiry is not None and expiry < time.monotonic():
-            self.invalidate(key)
+            self._remove(key)
+            self._notify(key, value, "expired")
             return None
         self._data.move_to_end(key)
         return value
@@ -49,20 +239,173 @@ class Cache(Generic[T]):
         return value
 
     def invalidate(self, key: str) -> None:
-        self._data.pop(key, None)
+        if key in self._data:
+            self._remove(key)
 
     def clear(self) -> None:
         self._data.clear()
+        self._expiry_heap.clear()
+        self._sizes.clear()
+        self._account(-self.nbytes)
 
     def values(self) -> list[T]:
+        self.expire()
+        return [value for value, _ in self._data.values()]
+
+    def add_eviction_callback(self, callback: EvictionCallback[T]) -> None:
+        """Call ``callback(key, value, reason)`` when an entry expires or is
+        evicted to stay within ``maxlen`` or a memory limit."""
+        self._eviction_callbacks.append(callback)
+
+    def remove_eviction_callback(self, callback: EvictionCallback[T]) -> None:
+        try:
+            self._eviction_callbacks.remove(callback)
+        except ValueError:
+            pass
+
+    def add_budget(self, budget: MemoryBudget) -> None:
+        """Count this cache's entries against ``budget``."""
+
+        if budget in self._budgets:
+            return
+        if not self.tracks_size:
+            self._measure_all()
+        self._budgets.append(budget)
+        budget._caches.add(self)
+        budget.used += self.nbytes
+        budget._enforce()
+
+    def remove_budget(self, budget: MemoryBudget) -> None:
+        if budget not in self._budgets:
+            return
+        self._budgets.remove(budget)
+        budget._caches.discard(self)
+        budget.used -= self.nbytes
+        if not self.tracks_size:
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def memory_usage(self) -> int:
+        """Estimated bytes held by the entries.
+
+        Uses the tracked total when sizes are tracked and measures every
+        entry otherwise.
+        """
+
+        if self.tracks_size:
+            return self.nbytes
+        self.expire()
+        return sum(self.sizeof(value) for value, _ in self._data.values())
+
+    def expire(self, limit: Optional[int] = None) -> int:
+        """Drop entries whose TTL has passed and return how many were dropped.
+
+        Only expired entries and stale heap records are visited. ``limit``
+        caps the number of entries dropped in one call.
+        """
+        heap = self._expiry_heap
+        if not heap:
+            return 0
         now = time.monotonic()
-        items = []
-        for key, (value, expiry) in list(self._data.items()):
-            if expiry is not None and expiry < now:
-                self.invalidate(key)
-            else:
-                items.append(value)
-        return items
+        removed = 0
+        while heap and heap[0][0] < now:
+            if limit is not None and removed >= limit:
+                break
+            expiry, key = heapq.heappop(heap)
+            item = self._data.get(key)
+            if item is None or item[1] != expiry:
+                continue
+            self._remove(key)
+            removed += 1
+            self._notify(key, item[0], "expired")
+        return removed
+
+    def _remove(self, key: str) -> None:
+        del self._data[key]
+        size = self._sizes.pop(key, 0)
+        if size:
+            self._account(-size)
+
+    def _evict_oldest(self, reason: str) -> bool:
+        if not self._data:
+            return False
+        key = next(iter(self._data))
+        value = self._data[key][0]
+        self._remove(key)
+        self._notify(key, value, reason)
+        return True
+
+    def _measure_all(self) -> None:
+        self._sizes = {key: self.sizeof(value) for key, (value, _) in self._data.items()}
+        self.nbytes = sum(self._sizes.values())
+
+    def _account(self, delta: int) -> None:
+        self.nbytes += delta
+        for budget in self._budgets:
+            budget.used += delta
+
+    def _enforce_memory(self) -> None:
+        if self.max_bytes is not None:
+            while self.nbytes > self.max_bytes and self._evict_oldest("memory"):
+                pass
+        for budget in self._budgets:
+            budget._enforce()
+
+    def _compact_heap(self) -> None:
+        self._expiry_heap = [
+            (expiry, key)
+            for key, (_, expiry) in self._data.items()
+            if expiry is not None
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _notify(self, key: str, value: T, reason: str) -> None:
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+        for callback in self._eviction_callbacks:
+            try:
+                callback(key, value, reason)
+            except Exception:
+                logger.exception("Cache eviction callback %r failed.", callback)
+
+    def start_sweeper(self, interval: Optional[float] = None) -> None:
+        """Expire entries every ``interval`` seconds on the running loop.
+
+        ``interval`` defaults to the TTL, capped at 60 seconds. Sweeps are
+        scheduled with :meth:`asyncio.loop.call_later` and only while the
+        cache holds entries that can expire, so an idle cache costs nothing.
+        Does nothing when the cache has no TTL.
+        """
+        if self.ttl is None:
+            return
+        if interval is None:
+            interval = min(self.ttl, 60.0)
+        self._sweep_loop = asyncio.get_running_loop()
+        self._sweep_interval = interval
+        if self._expiry_heap:
+            self._schedule_sweep(interval)
+
+    def stop_sweeper(self) -> None:
+        if self._sweep_handle is not None:
+            self._sweep_handle.cancel()
+            self._sweep_handle = None
+        self._sweep_interval = None
+        self._sweep_loop = None
+
+    def _schedule_sweep(self, delay: float) -> None:
+        loop = self._sweep_loop
+        if loop is None or loop.is_closed():
+            return
+        self._sweep_handle = loop.call_later(delay, self._sweep)
+
+    def _sweep(self) -> None:
+        self._sweep_handle = None
+        if self._sweep_interval is None:
+            return
+        if self.expire(self.SWEEP_BATCH) >= self.SWEEP_BATCH:
+            # More may be due; continue on the next loop iteration.
+            self._schedule_sweep(0)
+        elif self._expiry_heap:
+            self._schedule_sweep(self._sweep_interval)
 
 
 class GuildCache(Cache["Guild"]):
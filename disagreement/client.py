@@ -4,9 +4,9 @@ The main Client class for interacting with the Discord API.
 
 import asyncio
 import signal
-import json
 import os
 import importlib
+import uuid
 from typing import (
     Optional,
     Callable,
@@ -14,6 +14,7 @@ from typing import (
     TYPE_CHECKING,
     Awaitable,
     AsyncIterator,
+    Iterable,
     Union,
     List,
     Dict,
@@ -22,18 +23,31 @@ from typing import (
 from types import ModuleType
 
 PERSISTENT_VIEWS_FILE = "persistent_views.json"
+# Caches that accept a limit in ``cache_memory_limits``.
+CACHE_NAMES = ("guilds", "channels", "users", "messages", "members")
 
 from datetime import datetime, timedelta
 
 from .http import HTTPClient
-from .gateway import GatewayClient
+from .gateway import GatewayClient, GATEWAY_ENCODINGS
+from .compression import MAX_DECOMPRESSION_SIZE, COMPRESSION_METHODS
+from .decode_pool import DecodePool
+from .dispatch_queue import OVERFLOW_POLICIES
+from .rate_limiter import GATEWAY_SEND_LIMIT
+from .session_store import FileSessionStore, SessionStore
+from .recording import GatewayRecorder
+from .member_chunks import DEFAULT_CHUNK_TIMEOUT, MemberChunkStream
+from .latency import EventLatencyTracker
+from .intents import IntentReport, derive_intents
 from .shard_manager import ShardManager
-from .event_dispatcher import EventDispatcher
+from .event_dispatcher import EventDispatcher, OrderingKey
 from .enums import GatewayIntent, InteractionType, GatewayOpcode, VoiceRegion
 from .errors import DisagreementException, AuthenticationError
 from .typing import Typing
 from .caching import MemberCacheFlags
-from .cache import Cache, GuildCache, ChannelCache, MemberCache
+from .cache import Cache, GuildCache, ChannelCache, MemberCache, MemoryBudget
+from .member_store import ColumnarMemberStore
+from .json_codec import JSONCodec, get_codec
 from .ext.commands.core import Command, CommandHandler, Group
 from .ext.commands.cog import Cog
 from .ext.app_commands.handler import AppCommandHandler
@@ -46,6 +60,9 @@ from .models import Activity
 from .utils import utcnow
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .cluster import ClusterWorker
     from .models import (
         Message,
         Embed,
@@ -110,6 +127,90 @@ class Client:
         sync_commands_on_ready (bool): If ``True``, automatically call
             :meth:`Client.sync_application_commands` after the ``READY`` event
             when :attr:`Client.application_id` is available.
+        json_codec (Union[str, JSONCodec]): JSON backend used for Gateway
+            payloads, REST bodies and the files the client persists. Either
+            ``"json"``, ``"orjson"``, ``"msgspec"`` or ``"auto"`` (the default),
+            which picks the fastest installed backend and falls back to the
+            standard library.
+        gateway_encoding (str): Payload encoding requested from the Gateway,
+            either ``"json"`` (the default) or ``"etf"``. ETF frames are smaller
+            for snowflake-heavy events such as ``GUILD_CREATE``.
+        gateway_max_decompression_size (int): Largest size in bytes a single
+            Gateway payload may inflate to before the connection is dropped.
+        gateway_compression (str): Transport compression for the Gateway,
+            ``"zlib-stream"`` (the default) or ``"zstd-stream"``. Falls back to
+            zlib when no zstd implementation is installed.
+        gateway_lazy_dispatch (bool): Skip decoding JSON dispatch events that no
+            listener, waiter or cache needs. Their sequence numbers are still
+            tracked. Defaults to ``True``.
+        gateway_decode_offload_threshold (Optional[int]): Compressed frame size
+            in bytes from which Gateway frames are inflated and decoded outside
+            the event loop. ``None`` (the default) keeps all decoding inline.
+        gateway_decode_executor (Union[str, Executor]): ``"thread"``,
+            ``"process"`` or a thread-based executor used for offloaded frames.
+        gateway_dispatch_queue_size (Optional[int]): Size of the per-shard queue
+            between the receive loop and event listeners. ``None`` (the default)
+            runs listeners inline from the receive loop.
+        gateway_dispatch_overflow (str): What to do when the dispatch queue is
+            full: ``"block"``, ``"drop_oldest"`` or ``"spill"``.
+        gateway_dispatch_priorities (Optional[Dict[str, int]]): Per-event
+            priority overrides for the dispatch queue; lower runs first.
+        dispatch_max_concurrency (Optional[int]): Run event listeners
+            concurrently, with at most this many listener calls in flight.
+            ``None`` (the default) runs listeners one after another.
+        dispatch_event_concurrency (Optional[Dict[str, int]]): Per-event limits
+            on concurrently running listener calls. Also enables concurrent
+            listeners.
+        dispatch_ordering_keys (Optional[Dict[str, Callable[[Any], Any]]]):
+            Per-event functions returning an ordering key for the parsed event,
+            e.g. ``{"MESSAGE_CREATE": lambda m: m.channel_id}``. Events with the
+            same key reach each listener in order when running concurrently.
+        gateway_send_limit (Optional[int]): Commands each shard may send per
+            60 seconds. Defaults to Discord's limit of 120; ``None`` disables
+            outbound rate limiting.
+        gateway_session_store (Optional[Union[str, os.PathLike, SessionStore]]):
+            Where shards save their resume state when the client closes, so a
+            restarted process can RESUME instead of IDENTIFY. A path uses a
+            :class:`FileSessionStore`, which writes one file per shard.
+            ``None`` (the default) disables this.
+        shard_ids (Optional[List[int]]): Subset of ``range(shard_count)`` this
+            client runs. Used by :class:`~disagreement.cluster.ClusterSupervisor`
+            to spread shards across processes; defaults to all shards.
+        gateway_record_path (Optional[str]): Record every frame received from
+            the Gateway to this file for offline replay with
+            :func:`disagreement.replay.replay`. ``{shard_id}`` is replaced by
+            the shard ID, which sharded clients need to get one file per shard.
+        chunk_guilds_at_startup (bool): Request the members of every guild
+            whose ``GUILD_CREATE`` did not include all of them. Needs the
+            ``GUILD_MEMBERS`` intent. Defaults to ``False``.
+        chunk_concurrency (int): Member requests each shard keeps in flight
+            while chunking guilds at startup.
+        chunk_batch_size (int): Guilds covered by one startup member request.
+        track_event_latency (bool): Time every dispatched event from frame
+            arrival through decoding, parsing and each listener. Results are
+            available from :attr:`Client.event_latency`. Defaults to ``False``.
+        cache_memory_limits (Optional[Dict[str, int]]): Estimated byte limits
+            per cache, keyed by ``"guilds"``, ``"channels"``, ``"users"``,
+            ``"messages"`` or ``"members"``. The member limit is shared by the
+            member caches of all guilds. Caches over their limit evict their
+            oldest entries; see :meth:`memory_report`.
+        cache_memory_budget (Optional[int]): Estimated byte limit for all of
+            the caches above together. When exceeded, the largest caches
+            evict their oldest entries first.
+        member_store_threshold (Optional[int]): Keep the members of guilds
+            with at least this many members in a
+            :class:`~disagreement.member_store.ColumnarMemberStore`, which
+            stores them as compact columns and hands out views on access.
+            Members of such guilds are not added to the user cache.
+            ``None`` (the default) uses a regular member cache everywhere.
+        auto_intents (bool): Compute the smallest set of intents needed by the
+            registered listeners, commands and cache settings when connecting
+            and identify with it. ``intents``, if given, is then the most the
+            client subscribes to. See :meth:`intent_report`. Defaults to
+            ``False``.
+        extra_intents (int): Intents added to the derived set with
+            ``auto_intents``, e.g. for events only awaited with
+            :meth:`wait_for`. Defaults to ``0``.
     """
 
     def __init__(
@@ -132,16 +233,69 @@ class Client:
         http_options: Optional[Dict[str, Any]] = None,
         owner_ids: Optional[List[Union[str, int]]] = None,
         sync_commands_on_ready: bool = True,
+        json_codec: Union[str, JSONCodec] = "auto",
+        gateway_encoding: str = "json",
+        gateway_max_decompression_size: int = MAX_DECOMPRESSION_SIZE,
+        gateway_compression: str = "zlib-stream",
+        gateway_lazy_dispatch: bool = True,
+        gateway_decode_offload_threshold: Optional[int] = None,
+        gateway_decode_executor: Union[str, "Executor"] = "thread",
+        gateway_dispatch_queue_size: Optional[int] = None,
+        gateway_dispatch_overflow: str = "block",
+        gateway_dispatch_priorities: Optional[Dict[str, int]] = None,
+        dispatch_max_concurrency: Optional[int] = None,
+        dispatch_event_concurrency: Optional[Dict[str, int]] = None,
+        dispatch_ordering_keys: Optional[Dict[str, OrderingKey]] = None,
+        gateway_send_limit: Optional[int] = GATEWAY_SEND_LIMIT,
+        gateway_session_store: Optional[
+            Union[str, "os.PathLike[str]", SessionStore]
+        ] = None,
+        shard_ids: Optional[List[int]] = None,
+        gateway_record_path: Optional[str] = None,
+        chunk_guilds_at_startup: bool = False,
+        chunk_concurrency: int = 2,
+        chunk_batch_size: int = 5,
+        track_event_latency: bool = False,
+        cache_memory_limits: Optional[Dict[str, int]] = None,
+        cache_memory_budget: Optional[int] = None,
+        member_store_threshold: Optional[int] = None,
+        auto_intents: bool = False,
+        extra_intents: int = 0,
     ):
 
         if not token:
             raise ValueError("A bot token must be provided.")
+        if gateway_encoding not in GATEWAY_ENCODINGS:
+            raise ValueError(
+                f"Unsupported gateway encoding {gateway_encoding!r}. Expected 'json' or 'etf'."
+            )
+        if gateway_compression not in COMPRESSION_METHODS:
+            raise ValueError(
+                f"Unsupported gateway compression {gateway_compression!r}. "
+                "Expected 'zlib-stream' or 'zstd-stream'."
+            )
+        if gateway_dispatch_overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unsupported dispatch overflow policy {gateway_dispatch_overflow!r}. "
+                "Expected 'block', 'drop_oldest' or 'spill'."
+            )
+        for name in cache_memory_limits or {}:
+            if name not in CACHE_NAMES:
+                raise ValueError(
+                    f"Unknown cache {name!r} in cache_memory_limits. "
+                    f"Expected one of {', '.join(CACHE_NAMES)}."
+                )
 
         self.token: str = token
         self.member_cache_flags: MemberCacheFlags = (
             member_cache_flags if member_cache_flags is not None else MemberCacheFlags()
         )
         self.message_cache_maxlen: Optional[int] = message_cache_maxlen
+        self.member_store_threshold: Optional[int] = member_store_threshold
+        self.auto_intents: bool = auto_intents
+        self.extra_intents: int = extra_intents
+        # With auto_intents, explicit intents bound the derived ones.
+        self._intent_limit: Optional[int] = intents
         self.intents: int = intents if intents is not None else GatewayIntent.default()
         if loop:
             self.loop: asyncio.AbstractEventLoop = loop
@@ -157,19 +311,59 @@ class Client:
         setup_global_error_handler(self.loop)
 
         self.verbose: bool = verbose
+        self.json_codec: JSONCodec = get_codec(json_codec)
         self._http: HTTPClient = HTTPClient(
             token=self.token,
             verbose=verbose,
+            json_codec=self.json_codec,
             **(http_options or {}),
         )
-        self._event_dispatcher: EventDispatcher = EventDispatcher(client_instance=self)
+        self._event_dispatcher: EventDispatcher = EventDispatcher(
+            client_instance=self,
+            max_concurrency=dispatch_max_concurrency,
+            event_concurrency=dispatch_event_concurrency,
+            ordering_keys=dispatch_ordering_keys,
+        )
         self._gateway: Optional[GatewayClient] = (
             None  # Initialized in start() or connect()
         )
         self.shard_count: Optional[int] = shard_count
         self.gateway_max_retries: int = gateway_max_retries
         self.gateway_max_backoff: float = gateway_max_backoff
+        self.gateway_encoding: str = gateway_encoding
+        self.gateway_max_decompression_size: int = gateway_max_decompression_size
+        self.gateway_compression: str = gateway_compression
+        self.gateway_lazy_dispatch: bool = gateway_lazy_dispatch
+        self._decode_pool: Optional[DecodePool] = (
+            DecodePool(gateway_decode_offload_threshold, gateway_decode_executor)
+            if gateway_decode_offload_threshold is not None
+            else None
+        )
+        self.gateway_dispatch_queue_size: Optional[int] = gateway_dispatch_queue_size
+        self.gateway_dispatch_overflow: str = gateway_dispatch_overflow
+        self.gateway_dispatch_priorities: Optional[Dict[str, int]] = (
+            gateway_dispatch_priorities
+        )
+        self.gateway_send_limit: Optional[int] = gateway_send_limit
+        self.gateway_session_store: Optional[SessionStore] = (
+            gateway_session_store
+            if gateway_session_store is None
+            or isinstance(gateway_session_store, SessionStore)
+            else FileSessionStore(gateway_session_store, json_codec=self.json_codec)
+        )
         self._shard_manager: Optional[ShardManager] = None
+        self.shard_ids: Optional[List[int]] = shard_ids
+        # Set by ClusterWorker when this client runs inside a cluster process.
+        self.cluster: Optional["ClusterWorker"] = None
+        self.gateway_record_path: Optional[str] = gateway_record_path
+        self._recorders: Dict[int, GatewayRecorder] = {}
+        self.chunk_guilds_at_startup: bool = chunk_guilds_at_startup
+        self.chunk_concurrency: int = chunk_concurrency
+        self.chunk_batch_size: int = chunk_batch_size
+        # Per-event latency histograms, shared by all shards.
+        self.event_latency: Optional[EventLatencyTracker] = (
+            EventLatencyTracker() if track_event_latency else None
+        )
         self.owner_ids: List[str] = [str(o) for o in owner_ids] if owner_ids else []
 
         # Initialize CommandHandler
@@ -191,10 +385,23 @@ class Client:
         self.start_time: Optional[datetime] = None
 
         # Internal Caches
+        self._memory_budgets: Dict[str, MemoryBudget] = {
+            name: MemoryBudget(limit, name)
+            for name, limit in (cache_memory_limits or {}).items()
+        }
+        self._total_memory_budget: Optional[MemoryBudget] = (
+            MemoryBudget(cache_memory_budget, "total")
+            if cache_memory_budget is not None
+            else None
+        )
         self._guilds: GuildCache = GuildCache()
         self._channels: ChannelCache = ChannelCache()
         self._users: Cache["User"] = Cache()
         self._messages: Cache["Message"] = Cache(ttl=3600, maxlen=message_cache_maxlen)
+        self._attach_cache_budget(self._guilds, "guilds")
+        self._attach_cache_budget(self._channels, "channels")
+        self._attach_cache_budget(self._users, "users")
+        self._attach_cache_budget(self._messages, "messages")
         self._views: Dict[Snowflake, "View"] = {}
         self._persistent_views: Dict[str, "View"] = {}
         self._voice_clients: Dict[Snowflake, VoiceClient] = {}
@@ -226,13 +433,69 @@ class Client:
                 "Graceful shutdown via signals might not work as expected on this platform."
             )
 
+    def _attach_cache_budget(self, cache: Cache[Any], name: str) -> None:
+        """Count ``cache`` against the memory budgets configured for ``name``."""
+
+        budget = self._memory_budgets.get(name)
+        if budget is not None:
+            cache.add_budget(budget)
+        if self._total_memory_budget is not None:
+            cache.add_budget(self._total_memory_budget)
+
+    def memory_report(self) -> Dict[str, Dict[str, Any]]:
+        """Entries, estimated bytes and evictions per cache.
+
+        ``"members"`` sums the member caches of all guilds. Evictions are
+        counted per reason (``"expired"``, ``"maxlen"`` or ``"memory"``).
+        Caches without a memory limit are measured entry by entry, which
+        can take a while for large caches. The ``"total"`` row adds up all
+        caches.
+        """
+
+        groups: Dict[str, List[Cache[Any]]] = {
+            "guilds": [self._guilds],
+            "channels": [self._channels],
+            "users": [self._users],
+            "messages": [self._messages],
+            "members": [guild._members for guild in self._guilds.values()],
+        }
+        report: Dict[str, Dict[str, Any]] = {}
+        total_entries = total_bytes = 0
+        for name, caches in groups.items():
+            evictions: Dict[str, int] = {}
+            entries = nbytes = 0
+            for cache in caches:
+                entries += len(cache)
+                nbytes += cache.memory_usage()
+                for reason, count in cache.evictions.items():
+                    evictions[reason] = evictions.get(reason, 0) + count
+            budget = self._memory_budgets.get(name)
+            report[name] = {
+                "entries": entries,
+                "bytes": nbytes,
+                "evictions": evictions,
+                "limit": budget.max_bytes if budget is not None else None,
+            }
+            total_entries += entries
+            total_bytes += nbytes
+        report["total"] = {
+            "entries": total_entries,
+            "bytes": total_bytes,
+            "limit": (
+                self._total_memory_budget.max_bytes
+                if self._total_memory_budget is not None
+                else None
+            ),
+        }
+        return report
+
     def _load_persistent_views(self) -> None:
         """Load registered persistent views from disk."""
         if not os.path.isfile(PERSISTENT_VIEWS_FILE):
             return
         try:
-            with open(PERSISTENT_VIEWS_FILE, "r") as fp:
-                mapping = json.load(fp)
+            with open(PERSISTENT_VIEWS_FILE, "rb") as fp:
+                mapping = self.json_codec.loads(fp.read())
         except Exception as e:  # pragma: no cover - best effort load
             print(f"Failed to load persistent views: {e}")
             return
@@ -254,10 +517,23 @@ class Client:
             cls = view.__class__
             data[custom_id] = f"{cls.__module__}.{cls.__name__}"
         try:
-            with open(PERSISTENT_VIEWS_FILE, "w") as fp:
-                json.dump(data, fp)
+            with open(PERSISTENT_VIEWS_FILE, "wb") as fp:
+                fp.write(self.json_codec.dumps_bytes(data))
         except Exception as e:  # pragma: no cover - best effort save
             print(f"Failed to save persistent views: {e}")
+
+    def _get_recorder(self, shard_id: Optional[int]) -> Optional[GatewayRecorder]:
+        """Returns the recorder for ``shard_id`` if recording is enabled."""
+        if self.gateway_record_path is None:
+            return None
+        key = shard_id or 0
+        recorder = self._recorders.get(key)
+        if recorder is None:
+            recorder = self._recorders[key] = GatewayRecorder(
+                self.gateway_record_path.format(shard_id=key),
+                json_codec=self.json_codec,
+            )
+        return recorder
 
     async def _initialize_gateway(self):
         """Initializes the GatewayClient if it doesn't exist."""
@@ -271,6 +547,22 @@ class Client:
                 verbose=self.verbose,
                 max_retries=self.gateway_max_retries,
                 max_backoff=self.gateway_max_backoff,
+                json_codec=self.json_codec,
+                encoding=self.gateway_encoding,
+                max_decompression_size=self.gateway_max_decompression_size,
+                compress=self.gateway_compression,
+                lazy_dispatch=self.gateway_lazy_dispatch,
+                decode_pool=self._decode_pool,
+                dispatch_queue_size=self.gateway_dispatch_queue_size,
+                dispatch_overflow=self.gateway_dispatch_overflow,
+                dispatch_priorities=self.gateway_dispatch_priorities,
+                send_limit=self.gateway_send_limit,
+                session_store=self.gateway_session_store,
+                recorder=self._get_recorder(None),
+                chunk_guilds=self.chunk_guilds_at_startup,
+                chunk_concurrency=self.chunk_concurrency,
+                chunk_batch_size=self.chunk_batch_size,
+                latency_tracker=self.event_latency,
             )
 
     async def _initialize_shard_manager(self) -> None:
@@ -294,6 +586,12 @@ class Client:
         """
         if self._closed:
             raise DisagreementException("Client is closed and cannot connect.")
+        if self.auto_intents and self._gateway is None and self._shard_manager is None:
+            report = self.intent_report()
+            report.log()
+            self.intents = report.intents
+        # Drop expired messages in the background instead of on access.
+        self._messages.start_sweeper()
         if self.shard_count and self.shard_count > 1:
             await self._initialize_shard_manager()
             assert self._shard_manager is not None
@@ -425,6 +723,7 @@ class Client:
 
         self._closed = True
         print("Closing client...")
+        self._messages.stop_sweeper()
 
         if self._shard_manager:
             await self._shard_manager.close()
@@ -432,9 +731,18 @@ class Client:
         if self._gateway:
             await self._gateway.close()
 
+        # Hand buffered events to batch listeners while HTTP still works.
+        await self._event_dispatcher.flush_batches()
+
         if self._http:  # HTTPClient has its own session to close
             await self._http.close()
 
+        if self._decode_pool:
+            self._decode_pool.close()
+
+        for recorder in self._recorders.values():
+            recorder.close()
+
         self._ready_event.set()  # Ensure any waiters for ready are unblocked
         self.start_time = None
         print("Client closed.")
@@ -493,6 +801,14 @@ class Client:
         latency = getattr(self._gateway, "latency_ms", None)
         return round(latency, 2) if latency is not None else None
 
+    @property
+    def zombie_disconnects(self) -> int:
+        """Returns how often a gateway connection was closed for missing heartbeat ACKs."""
+        gateways = [self._gateway] if self._gateway else []
+        if self._shard_manager:
+            gateways.extend(shard.gateway for shard in self._shard_manager.shards)
+        return sum(getattr(g, "zombie_disconnects", 0) for g in gateways)
+
     @property
     def guilds(self) -> List["Guild"]:
         """Returns all guilds from the internal cache."""
@@ -516,10 +832,19 @@ class Client:
         event_name: str,
         check: Optional[Callable[[Any], bool]] = None,
         timeout: Optional[float] = None,
+        *,
+        channel_id: Optional[Snowflake] = None,
+        author_id: Optional[Snowflake] = None,
+        message_id: Optional[Snowflake] = None,
+        custom_id: Optional[str] = None,
     ) -> Any:
         """|coro|
         Waits for a specific event to occur that satisfies the ``check``.
 
+        The keyword filters are matched through a hash index before ``check``
+        runs, so many concurrent waits for busy events like ``MESSAGE_CREATE``
+        stay cheap. Events lacking a filtered field never match.
+
         Parameters
         ----------
         event_name: str
@@ -528,10 +853,29 @@ class Client:
             A function that determines whether the received event should resolve the wait.
         timeout: Optional[float]
             How long to wait for the event before raising :class:`asyncio.TimeoutError`.
+        channel_id: Optional[Snowflake]
+            Only match events in this channel.
+        author_id: Optional[Snowflake]
+            Only match events from this user (message author, interaction or
+            reaction user).
+        message_id: Optional[Snowflake]
+            Only match events about this message.
+        custom_id: Optional[str]
+            Only match component interactions with this ``custom_id``.
         """
 
         future: asyncio.Future = self.loop.create_future()
-        self._event_dispatcher.add_waiter(event_name, future, check)
+        self._event_dispatcher.add_waiter(
+            event_name,
+            future,
+            check,
+            keys={
+                "channel_id": channel_id,
+                "author_id": author_id,
+                "message_id": message_id,
+                "custom_id": custom_id,
+            },
+        )
         try:
             return await asyncio.wait_for(future, timeout=timeout)
         finally:
@@ -556,8 +900,11 @@ class Client:
         if self._closed:
             raise DisagreementException("Client is closed.")
 
-        if self._gateway:
-            await self._gateway.update_presence(
+        gateways = [self._gateway] if self._gateway else []
+        if self._shard_manager:
+            gateways.extend(shard.gateway for shard in self._shard_manager.shards)
+        for gateway in gateways:
+            await gateway.update_presence(
                 status=status,
                 activity=activity,
                 since=since,
@@ -642,6 +989,64 @@ class Client:
 
         self._event_dispatcher.unregister(event_name, coro)
 
+    def on_batch(
+        self, event_name: str, *, max_size: int = 100, max_delay: float = 1.0
+    ) -> Callable[[Callable[..., Awaitable[None]]], Callable[..., Awaitable[None]]]:
+        """A decorator that registers a listener receiving lists of events.
+
+        The listener is called with up to ``max_size`` parsed events at once,
+        at the latest ``max_delay`` seconds after the first of them arrived.
+        Suited to high-volume events such as ``PRESENCE_UPDATE`` or
+        ``TYPING_START`` when every event does not need its own call.
+        Example:
+            @client.on_batch('PRESENCE_UPDATE', max_size=500, max_delay=5)
+            async def record_presences(presences: list):
+                print(f"{len(presences)} presence updates")
+        """
+
+        def decorator(
+            coro: Callable[..., Awaitable[None]],
+        ) -> Callable[..., Awaitable[None]]:
+            self.add_batch_listener(
+                event_name, coro, max_size=max_size, max_delay=max_delay
+            )
+            return coro
+
+        return decorator
+
+    def add_batch_listener(
+        self,
+        event_name: str,
+        coro: Callable[..., Awaitable[None]],
+        *,
+        max_size: int = 100,
+        max_delay: float = 1.0,
+    ) -> None:
+        """Register ``coro`` to receive ``event_name`` events in lists."""
+
+        self._event_dispatcher.register_batch(
+            event_name, coro, max_size=max_size, max_delay=max_delay
+        )
+
+    def remove_batch_listener(
+        self, event_name: str, coro: Callable[..., Awaitable[None]]
+    ) -> None:
+        """Remove a batch listener added with :meth:`add_batch_listener`."""
+
+        self._event_dispatcher.unregister_batch(event_name, coro)
+
+    def intent_report(self) -> IntentReport:
+        """Derive the intents needed by what is currently registered.
+
+        The report lists which listener, command or cache setting needs each
+        intent. Compare it with :attr:`intents` to find subscriptions nothing
+        uses: ``client.intent_report().unused(client.intents)``.
+        """
+
+        if not self.auto_intents:
+            return derive_intents(self)
+        return derive_intents(self, self.extra_intents, self._intent_limit)
+
     async def _process_message_for_commands(self, message: "Message") -> None:
         """Internal listener to process messages for commands."""
         # Make sure message object is valid and not from a bot (optional, common check)
@@ -993,6 +1398,10 @@ class Client:
         if just_joined and hasattr(member, "_just_joined"):
             delattr(member, "_just_joined")
 
+        if guild and isinstance(guild._members, ColumnarMemberStore):
+            # A full copy in the user cache would undo the compact storage.
+            return guild._members.get(member.id) or member
+
         self._users.set(member.id, member)
         return member
 
@@ -1016,6 +1425,75 @@ class Client:
             print(f"Failed to fetch member {member_id} from guild {guild_id}: {e}")
             return None
 
+    def _gateway_for_guild(self, guild_id: Snowflake) -> Optional[GatewayClient]:
+        """Returns the gateway connection of the shard ``guild_id`` is on."""
+        if self._shard_manager and self._shard_manager.shards:
+            shard_id = (int(guild_id) >> 22) % self._shard_manager.shard_count
+            for shard in self._shard_manager.shards:
+                if shard.id == shard_id:
+                    return shard.gateway
+            return None
+        return self._gateway
+
+    async def request_members(
+        self,
+        guild_ids: Union[Snowflake, Iterable[Snowflake]],
+        *,
+        query: str = "",
+        limit: int = 0,
+        presences: bool = False,
+        user_ids: Optional[List[Snowflake]] = None,
+        timeout: float = DEFAULT_CHUNK_TIMEOUT,
+        cache: bool = True,
+    ) -> MemberChunkStream:
+        """|coro|
+        Requests guild members over the Gateway and streams them as they arrive.
+
+        The returned :class:`~disagreement.member_chunks.MemberChunkStream`
+        yields a list of parsed members per ``GUILD_MEMBERS_CHUNK`` and ends
+        once every guild has been delivered. Guilds on different shards are
+        requested from their own shard under one nonce.
+
+        Args:
+            guild_ids (Union[Snowflake, Iterable[Snowflake]]): Guild or guilds
+                to request members for.
+            query (str): Only return members whose username starts with this.
+            limit (int): Maximum members per guild; ``0`` for all.
+            presences (bool): Also request the members' presences.
+            user_ids (Optional[List[Snowflake]]): Only return these members.
+            timeout (float): Seconds to wait for each chunk.
+            cache (bool): Whether received members are added to the member cache.
+
+        Raises:
+            DisagreementException: A guild's shard is not connected.
+        """
+        if isinstance(guild_ids, (str, int)):
+            guild_ids = [guild_ids]
+        ids = list(dict.fromkeys(str(g) for g in guild_ids))
+        if not ids:
+            raise ValueError("At least one guild ID is required.")
+
+        groups: Dict[GatewayClient, List[str]] = {}
+        for guild_id in ids:
+            gateway = self._gateway_for_guild(guild_id)
+            if gateway is None:
+                raise DisagreementException(
+                    f"No Gateway connection available for guild {guild_id}."
+                )
+            groups.setdefault(gateway, []).append(guild_id)
+
+        stream = MemberChunkStream(uuid.uuid4().hex, ids, timeout=timeout, cache=cache)
+        for gateway, group in groups.items():
+            await gateway.send_member_request(
+                stream,
+                group,
+                query=query,
+                limit=limit,
+                presences=presences,
+                user_ids=[str(u) for u in user_ids] if user_ids else None,
+            )
+        return stream
+
     def parse_role(self, data: Dict[str, Any], guild_id: Snowflake) -> "Role":
         """Parses role data and returns a Role object, updating guild's role cache."""
         from .models import Role  # Ensure Role model is available
@@ -0,0 +1,584 @@
+"""Run shards in several worker processes.
+
+A single :class:`~disagreement.client.Client` runs all of its shards on one
+event loop, so a large bot is limited to one CPU core. A
+:class:`ClusterSupervisor` splits the shards into contiguous ranges and runs
+each range in its own process, called a cluster. Every cluster builds its own
+client with a user supplied factory, so caches only hold the guilds of that
+cluster's shards.
+
+The supervisor restarts clusters whose process dies and talks to them over a
+pipe. :meth:`ClusterSupervisor.broadcast` sends a command to every cluster and
+gathers the replies; :meth:`ClusterSupervisor.request` targets one cluster,
+for example the one that owns a guild.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+)
+
+from .errors import ClusterError
+
+if TYPE_CHECKING:  # pragma: no cover - for type checking only
+    from multiprocessing.process import BaseProcess
+
+    from .client import Client
+    from .models import Activity
+
+logger = logging.getLogger(__name__)
+
+ClientFactory = Callable[[], "Client"]
+CommandHandler = Callable[[Any], Awaitable[Any]]
+
+
+def shard_ranges(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """Split ``range(shard_count)`` into ``cluster_count`` contiguous ranges.
+
+    Earlier ranges get one extra shard when the shards do not divide evenly.
+    """
+
+    if shard_count < 1:
+        raise ValueError("shard_count must be at least 1.")
+    cluster_count = max(1, min(cluster_count, shard_count))
+    size, extra = divmod(shard_count, cluster_count)
+    ranges = []
+    start = 0
+    for index in range(cluster_count):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def shard_for_guild(guild_id: Union[int, str], shard_count: int) -> int:
+    """Return the shard Discord routes ``guild_id`` to."""
+
+    return (int(guild_id) >> 22) % shard_count
+
+
+class ClusterWorker:
+    """Runs a client for one shard range and answers supervisor commands.
+
+    Built-in commands are ``"stats"``, ``"presence"``, ``"reload"`` and
+    ``"guild"``. More can be added with :meth:`add_command`, e.g. from an
+    ``on_ready`` listener through ``client.cluster``.
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        cluster_id: int,
+        shard_ids: Sequence[int],
+        shard_count: int,
+        conn: Connection,
+    ) -> None:
+        self.client: "Client" = client
+        self.cluster_id: int = cluster_id
+        self.shard_ids: List[int] = list(shard_ids)
+        self.shard_count: int = shard_count
+        self._conn: Connection = conn
+        self._stopped: asyncio.Event = asyncio.Event()
+        # Commands being handled, kept so their tasks are not collected early.
+        self._tasks: Set[asyncio.Task] = set()
+        self._commands: Dict[str, CommandHandler] = {
+            "stats": self._stats,
+            "presence": self._presence,
+            "reload": self._reload,
+            "guild": self._guild,
+            "shutdown": self._shutdown,
+        }
+
+        client.shard_count = shard_count
+        client.shard_ids = self.shard_ids
+        client.cluster = self
+
+    def add_command(self, name: str, handler: CommandHandler) -> None:
+        """Register a coroutine that answers the control command ``name``."""
+
+        self._commands[name] = handler
+
+    def owns_guild(self, guild_id: Union[int, str]) -> bool:
+        """Whether ``guild_id`` belongs to one of this cluster's shards."""
+
+        return shard_for_guild(guild_id, self.shard_count) in self.shard_ids
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        try:
+            self._conn.send(message)
+        except (BrokenPipeError, EOFError, OSError):
+            logger.warning("Cluster %s lost its supervisor.", self.cluster_id)
+            self._stopped.set()
+
+    async def run(self) -> None:
+        """Connect the client, report ready and serve commands until shutdown."""
+
+        loop = asyncio.get_running_loop()
+        reader = loop.create_task(self._read_commands())
+        try:
+            await self.client.connect()
+            self._send({"op": "ready", "cluster_id": self.cluster_id})
+            await self._stopped.wait()
+        finally:
+            reader.cancel()
+            await self.client.close()
+
+    async def _read_commands(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stopped.is_set():
+            try:
+                message = await loop.run_in_executor(None, self._conn.recv)
+            except (EOFError, OSError):
+                # The supervisor went away; shut down instead of running orphaned.
+                self._stopped.set()
+                return
+            task = loop.create_task(self._handle(message))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, message: Dict[str, Any]) -> None:
+        op = message.get("op")
+        reply: Dict[str, Any] = {"op": "reply", "nonce": message.get("nonce")}
+        handler = self._commands.get(op)
+        if handler is None:
+            reply["error"] = f"Unknown cluster command {op!r}."
+        else:
+            try:
+                reply["data"] = await handler(message.get("data"))
+            except Exception as e:  # noqa: BLE001
+                logger.exception("Cluster command %r failed.", op)
+                reply["error"] = f"{type(e).__name__}: {e}"
+        self._send(reply)
+
+    async def _stats(self, _: Any) -> Dict[str, Any]:
+        manager = getattr(self.client, "_shard_manager", None)
+        if manager is not None:
+            latencies = {shard.id: shard.gateway.latency for shard in manager.shards}
+        else:
+            latencies = {self.shard_ids[0]: self.client.latency}
+        return {
+            "cluster_id": self.cluster_id,
+            "pid": os.getpid(),
+            "shard_ids": self.shard_ids,
+            "guilds": len(self.client.guilds),
+            "latencies": latencies,
+            "ready": self.client.is_ready(),
+        }
+
+    async def _presence(self, data: Dict[str, Any]) -> None:
+        await self.client.change_presence(**data)
+
+    async def _reload(self, name: str) -> None:
+        self.client.reload_extension(name)
+
+    async def _guild(self, guild_id: Union[int, str]) -> Optional[Dict[str, Any]]:
+        guild = self.client.get_guild(str(guild_id))
+        if guild is None:
+            return None
+        return {
+            "id": guild.id,
+            "name": guild.name,
+            "approximate_member_count": guild.approximate_member_count,
+            "shard_id": guild.shard_id,
+        }
+
+    async def _shutdown(self, _: Any) -> None:
+        asyncio.get_running_loop().call_soon(self._stopped.set)
+
+
+def _run_worker(
+    factory: ClientFactory,
+    cluster_id: int,
+    shard_ids: List[int],
+    shard_count: int,
+    conn: Connection,
+) -> None:
+    """Entry point of a cluster process."""
+
+    async def main() -> None:
+        worker = ClusterWorker(factory(), cluster_id, shard_ids, shard_count, conn)
+        await worker.run()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:  # pragma: no cover - supervisor handles signals
+        pass
+    finally:
+        conn.close()
+
+
+@dataclass
+class Cluster:
+    """Supervisor-side state of one worker process."""
+
+    id: int
+    shard_ids: List[int]
+    process: Optional["BaseProcess"] = None
+    conn: Optional[Connection] = None
+    restarts: int = 0
+    started_at: float = 0.0
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    reader: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class ClusterSupervisor:
+    """Spreads shards across worker processes and keeps them running.
+
+    Parameters
+    ----------
+    client_factory:
+        Picklable, module-level callable returning a new
+        :class:`~disagreement.client.Client`. It is called once in every
+        cluster process; ``shard_count`` and ``shard_ids`` are set for it.
+    shard_count:
+        Total number of shards. When omitted, the recommended count is
+        fetched from ``GET /gateway/bot`` using ``token``.
+    cluster_count:
+        Number of worker processes. Defaults to the number of CPUs.
+    token:
+        Bot token, only needed when ``shard_count`` is omitted.
+    ready_timeout:
+        Seconds to wait for a cluster to become ready before launching the
+        next one. Clusters are launched one at a time so that their
+        IDENTIFYs stay within the session start limit.
+    restart_delay:
+        Seconds to wait before restarting a cluster whose process died.
+    max_restarts:
+        Give up on a cluster after this many restarts. ``None`` retries
+        forever.
+    check_interval:
+        Seconds between checks for dead cluster processes.
+    start_method:
+        :mod:`multiprocessing` start method used for cluster processes.
+    """
+
+    def __init__(
+        self,
+        client_factory: ClientFactory,
+        *,
+        shard_count: Optional[int] = None,
+        cluster_count: Optional[int] = None,
+        token: Optional[str] = None,
+        ready_timeout: float = 120.0,
+        restart_delay: float = 5.0,
+        max_restarts: Optional[int] = None,
+        check_interval: float = 1.0,
+        start_method: str = "spawn",
+    ) -> None:
+        if shard_count is None and token is None:
+            raise ValueError("Either shard_count or token must be provided.")
+        self.client_factory: ClientFactory = client_factory
+        self.shard_count: Optional[int] = shard_count
+        self.cluster_count: int = cluster_count or os.cpu_count() or 1
+        self.ready_timeout: float = ready_timeout
+        self.restart_delay: float = restart_delay
+        self.max_restarts: Optional[int] = max_restarts
+        self.check_interval: float = check_interval
+        self.clusters: List[Cluster] = []
+        self._token: Optional[str] = token
+        self._context = multiprocessing.get_context(start_method)
+        self._nonces = itertools.count()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._closing: bool = False
+        # Blocking pipe reads and process joins; one reader thread per cluster.
+        self._io: Optional[ThreadPoolExecutor] = None
+
+    async def _fetch_shard_count(self) -> int:
+        from .http import HTTPClient
+
+        assert self._token is not None
+        http = HTTPClient(self._token)
+        try:
+            data = await http.get_gateway_bot()
+        finally:
+            await http.close()
+        return int(data.get("shards", 1))
+
+    async def start(self) -> None:
+        """Launch every cluster, one after another, then supervise them."""
+
+        if self.shard_count is None:
+            self.shard_count = await self._fetch_shard_count()
+        self.clusters = [
+            Cluster(cluster_id, ids)
+            for cluster_id, ids in enumerate(
+                shard_ranges(self.shard_count, self.cluster_count)
+            )
+        ]
+        self._io = ThreadPoolExecutor(
+            max_workers=2 * len(self.clusters),
+            thread_name_prefix="disagreement-cluster",
+        )
+        logger.info(
+            "Launching %s shards in %s clusters.", self.shard_count, len(self.clusters)
+        )
+        for cluster in self.clusters:
+            self._spawn(cluster)
+            await self._wait_ready(cluster)
+        self._monitor_task = asyncio.get_running_loop().create_task(self._monitor())
+
+    def _spawn(self, cluster: Cluster) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_run_worker,
+            args=(
+                self.client_factory,
+                cluster.id,
+                cluster.shard_ids,
+                self.shard_count,
+                child_conn,
+            ),
+            name=f"disagreement-cluster-{cluster.id}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        cluster.process = process
+        cluster.conn = parent_conn
+        cluster.ready.clear()
+        cluster.started_at = time.monotonic()
+        cluster.reader = asyncio.get_running_loop().create_task(
+            self._read_replies(cluster, parent_conn)
+        )
+        logger.info(
+            "Started cluster %s (pid %s) for shards %s-%s.",
+            cluster.id,
+            process.pid,
+            cluster.shard_ids[0],
+            cluster.shard_ids[-1],
+        )
+
+    async def _wait_ready(self, cluster: Cluster) -> None:
+        deadline = time.monotonic() + self.ready_timeout
+        while not cluster.ready.is_set():
+            if not cluster.alive:
+                # The monitor restarts it; do not hold up the other clusters.
+                logger.warning("Cluster %s exited before becoming ready.", cluster.id)
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(
+                    "Cluster %s was not ready within %.0f seconds; continuing.",
+                    cluster.id,
+                    self.ready_timeout,
+                )
+                return
+            try:
+                await asyncio.wait_for(
+                    cluster.ready.wait(), min(remaining, self.check_interval)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _read_replies(self, cluster: Cluster, conn: Connection) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                message = await loop.run_in_executor(self._io, conn.recv)
+            except (EOFError, OSError):
+                return
+            if message.get("op") == "ready":
+                cluster.ready.set()
+                continue
+            future = self._pending.pop(message.get("nonce"), None)
+            if future is None or future.done():
+                continue
+            if "error" in message:
+                future.set_exception(
+                    ClusterError(f"Cluster {cluster.id}: {message['error']}")
+                )
+            else:
+                future.set_result(message.get("data"))
+
+    async def _monitor(self) -> None:
+        while not self._closing:
+            await asyncio.sleep(self.check_interval)
+            for cluster in self.clusters:
+                if self._closing or cluster.alive or cluster.process is None:
+                    continue
+                await self._restart(cluster)
+
+    async def _restart(self, cluster: Cluster) -> None:
+        exitcode = cluster.process.exitcode if cluster.process else None
+        self._discard(cluster)
+        if self.max_restarts is not None and cluster.restarts >= self.max_restarts:
+            logger.error(
+                "Cluster %s exited with code %s and reached the restart limit.",
+                cluster.id,
+                exitcode,
+            )
+            return
+        cluster.restarts += 1
+        logger.warning(
+            "Cluster %s exited with code %s; restarting in %.0f seconds.",
+            cluster.id,
+            exitcode,
+            self.restart_delay,
+        )
+        await asyncio.sleep(self.restart_delay)
+        if self._closing:
+            return
+        self._spawn(cluster)
+        await self._wait_ready(cluster)
+
+    def _discard(self, cluster: Cluster) -> None:
+        if cluster.reader is not None:
+            cluster.reader.cancel()
+            cluster.reader = None
+        if cluster.conn is not None:
+            cluster.conn.close()
+            cluster.conn = None
+        cluster.process = None
+
+    def cluster_for_shard(self, shard_id: int) -> Cluster:
+        for cluster in self.clusters:
+            if shard_id in cluster.shard_ids:
+                return cluster
+        raise ValueError(f"No cluster runs shard {shard_id}.")
+
+    def cluster_for_guild(self, guild_id: Union[int, str]) -> Cluster:
+        """Return the cluster whose shards receive events for ``guild_id``."""
+
+        if self.shard_count is None:
+            raise ClusterError("Clusters have not been started.")
+        return self.cluster_for_shard(shard_for_guild(guild_id, self.shard_count))
+
+    async def request(
+        self, cluster_id: int, op: str, data: Any = None, *, timeout: float = 10.0
+    ) -> Any:
+        """Send a command to one cluster and return its reply."""
+
+        cluster = self.clusters[cluster_id]
+        if cluster.conn is None or not cluster.alive:
+            raise ClusterError(f"Cluster {cluster_id} is not running.")
+        nonce = next(self._nonces)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[nonce] = future
+        try:
+            cluster.conn.send({"op": op, "nonce": nonce, "data": data})
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise ClusterError(
+                f"Cluster {cluster_id} did not answer {op!r} within {timeout} seconds."
+            ) from None
+        except (BrokenPipeError, OSError) as e:
+            raise ClusterError(f"Cluster {cluster_id} is not reachable: {e}") from e
+        finally:
+            self._pending.pop(nonce, None)
+
+    async def broadcast(
+        self, op: str, data: Any = None, *, timeout: float = 10.0
+    ) -> Dict[int, Any]:
+        """Send a command to every cluster.
+
+        Returns a mapping of cluster ID to reply. Clusters that failed or did
+        not answer map to the :class:`~disagreement.errors.ClusterError`.
+        """
+
+        results = await asyncio.gather(
+            *(
+                self.request(cluster.id, op, data, timeout=timeout)
+                for cluster in self.clusters
+            ),
+            return_exceptions=True,
+        )
+        return {cluster.id: result for cluster, result in zip(self.clusters, results)}
+
+    async def stats(self) -> Dict[int, Any]:
+        """Gather guild counts, latency and readiness from every cluster."""
+
+        return await self.broadcast("stats")
+
+    async def change_presence(
+        self, status: str, activity: Optional["Activity"] = None
+    ) -> Dict[int, Any]:
+        """Change the presence of every shard in every cluster."""
+
+        return await self.broadcast(
+            "presence", {"status": status, "activity": activity}
+        )
+
+    async def reload_extension(self, name: str) -> Dict[int, Any]:
+        """Reload an extension in every cluster."""
+
+        return await self.broadcast("reload", name)
+
+    async def fetch_guild_summary(
+        self, guild_id: Union[int, str]
+    ) -> Optional[Dict[str, Any]]:
+        """Ask the cluster owning ``guild_id`` for its cached view of the guild."""
+
+        cluster = self.cluster_for_guild(guild_id)
+        return await self.request(cluster.id, "guild", str(guild_id))
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Ask every cluster to shut down and wait for the processes to exit."""
+
+        self._closing = True
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        await self.broadcast("shutdown", timeout=timeout)
+        loop = asyncio.get_running_loop()
+        for cluster in self.clusters:
+            process = cluster.process
+            if process is None:
+                continue
+            # Closing our end lets the worker's command reader see EOF.
+            if cluster.conn is not None:
+                cluster.conn.close()
+                cluster.conn = None
+            await loop.run_in_executor(self._io, process.join, timeout)
+            if process.is_alive():
+                logger.warning("Cluster %s did not exit; terminating.", cluster.id)
+                process.terminate()
+                await loop.run_in_executor(self._io, process.join, timeout)
+            self._discard(cluster)
+        if self._io is not None:
+            self._io.shutdown(wait=False)
+            self._io = None
+
+    async def run_forever(self) -> None:
+        """Start the clusters and supervise them until cancelled."""
+
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.close()
+
+    def run(self) -> None:
+        """Synchronously run the supervisor with :func:`asyncio.run`."""
+
+        try:
+            asyncio.run(self.run_forever())
+        except KeyboardInterrupt:
+            pass
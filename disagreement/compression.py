@@ -0,0 +1,206 @@
+"""Streaming decompression for Gateway transport compression."""
+
+from __future__ import annotations
+
+import logging
+import zlib
+from typing import Optional, Tuple, Union
+
+from .errors import DecompressionLimitExceeded
+
+try:  # Python 3.14+
+    from compression import zstd as _stdlib_zstd
+except ImportError:  # pragma: no cover - depends on the Python version
+    _stdlib_zstd = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ZLIB_SUFFIX = b"\x00\x00\xff\xff"
+MAX_DECOMPRESSION_SIZE = 10 * 1024 * 1024  # 10 MiB
+# Most output one byte of zstd input can produce: a 4 byte RLE block
+# inflates to at most 128 KiB.
+_ZSTD_MAX_RATIO = 128 * 1024 // 4
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+COMPRESSION_METHODS = ("zlib-stream", "zstd-stream")
+ZSTD_AVAILABLE = _stdlib_zstd is not None or zstandard is not None
+
+logger = logging.getLogger(__name__)
+
+
+class ZlibStreamInflater:
+    """Inflates a ``zlib-stream`` Gateway connection one frame at a time.
+
+    A single zlib context lives for the whole connection. Complete frames are
+    inflated straight from the WebSocket message without copying them into an
+    intermediate buffer; only fragmented messages are accumulated, and the
+    fragment buffer is reused between messages. The inflated bytes are returned
+    as-is so codecs can decode them without a UTF-8 ``str`` round trip.
+
+    Parameters
+    ----------
+    max_size:
+        Maximum size of a single inflated payload in bytes. Exceeding it raises
+        :class:`~disagreement.errors.DecompressionLimitExceeded`; the stream is
+        unusable afterwards and the connection must be re-established.
+    """
+
+    def __init__(self, max_size: int = MAX_DECOMPRESSION_SIZE) -> None:
+        self.max_size: int = max_size
+        self._inflator = zlib.decompressobj()
+        self._fragments = bytearray()
+
+    def reset(self) -> None:
+        """Discards buffered fragments and starts a fresh zlib context."""
+        self._inflator = zlib.decompressobj()
+        self._fragments.clear()
+
+    def feed(self, data: BytesLike) -> Optional[bytes]:
+        """Feeds one WebSocket message and returns the inflated payload.
+
+        Returns ``None`` when ``data`` does not end a frame yet.
+
+        Raises
+        ------
+        zlib.error
+            If the stream is corrupt.
+        DecompressionLimitExceeded
+            If the inflated payload is larger than :attr:`max_size`.
+        """
+
+        view = memoryview(data)
+        if len(view) < 4 or view[-4:] != ZLIB_SUFFIX:
+            self._fragments += view
+            return None
+
+        if self._fragments:
+            self._fragments += view
+            view = memoryview(self._fragments)
+
+        try:
+            # Ask for one byte more than allowed so an oversized payload is
+            # detected without inflating all of it.
+            inflated = self._inflator.decompress(view, self.max_size + 1)
+        finally:
+            view.release()
+            if self._fragments:
+                self._fragments.clear()
+
+        if len(inflated) > self.max_size or self._inflator.unconsumed_tail:
+            raise DecompressionLimitExceeded(self.max_size)
+        return inflated
+
+
+class ZstdStreamInflater:
+    """Decompresses a ``zstd-stream`` Gateway connection.
+
+    The Gateway sends one zstd frame per connection and flushes it after every
+    message, so a single decompression context is kept until :meth:`reset` is
+    called on reconnect. Uses :mod:`compression.zstd` on Python 3.14+ and the
+    ``zstandard`` package otherwise.
+
+    Parameters
+    ----------
+    max_size:
+        Maximum size of a single decompressed payload in bytes.
+    """
+
+    def __init__(self, max_size: int = MAX_DECOMPRESSION_SIZE) -> None:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(
+                "zstd-stream compression requires Python 3.14+ or the 'zstandard' package."
+            )
+        self.max_size: int = max_size
+        self._decompressor = self._new_decompressor()
+
+    @staticmethod
+    def _new_decompressor():
+        if _stdlib_zstd is not None:
+            return _stdlib_zstd.ZstdDecompressor()
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    def reset(self) -> None:
+        """Starts a fresh decompression context."""
+        self._decompressor = self._new_decompressor()
+
+    def feed(self, data: BytesLike) -> Optional[bytes]:
+        """Feeds one WebSocket message and returns the decompressed payload.
+
+        Returns ``None`` if ``data`` did not produce any output yet.
+
+        Raises
+        ------
+        ValueError
+            If the stream is corrupt.
+        DecompressionLimitExceeded
+            If the decompressed payload is larger than :attr:`max_size`.
+        """
+
+        try:
+            if _stdlib_zstd is not None:
+                output = self._decompressor.decompress(data, self.max_size + 1)
+            else:
+                output = self._decompress_bounded(data)
+            if len(output) > self.max_size:
+                raise DecompressionLimitExceeded(self.max_size)
+        except DecompressionLimitExceeded:
+            raise
+        except Exception as e:  # zstd backends raise their own error types
+            raise ValueError(f"zstd decompression failed: {e}") from e
+        return output or None
+
+    def _decompress_bounded(self, data: BytesLike) -> bytes:
+        """Inflates ``data`` with ``zstandard``, stopping past :attr:`max_size`.
+
+        ``zstandard``'s ``decompress`` has no output limit, so the input is fed
+        in slices small enough that no slice can inflate to more than the
+        remaining budget. Output stays below twice :attr:`max_size`.
+        """
+
+        view = memoryview(data)
+        output = bytearray()
+        offset = 0
+        while offset < len(view):
+            remaining = self.max_size + 1 - len(output)
+            if remaining <= 0:
+                break
+            step = max(64, remaining // _ZSTD_MAX_RATIO)
+            output += self._decompressor.decompress(view[offset : offset + step])
+            offset += step
+        return bytes(output)
+
+
+Inflater = Union[ZlibStreamInflater, ZstdStreamInflater]
+
+
+def create_inflater(
+    method: str, max_size: int = MAX_DECOMPRESSION_SIZE
+) -> Tuple[str, Inflater]:
+    """Creates the inflater for a Gateway ``compress`` method.
+
+    Falls back to ``zlib-stream`` with a warning when ``zstd-stream`` is
+    requested but no zstd implementation is installed.
+
+    Returns
+    -------
+    Tuple[str, Inflater]
+        The compression method actually in use and its inflater.
+    """
+
+    if method not in COMPRESSION_METHODS:
+        raise ValueError(
+            f"Unsupported gateway compression {method!r}. "
+            f"Expected one of: {', '.join(COMPRESSION_METHODS)}."
+        )
+    if method == "zstd-stream":
+        if ZSTD_AVAILABLE:
+            return method, ZstdStreamInflater(max_size)
+        logger.warning(
+            "zstd-stream compression requested but no zstd implementation is "
+            "installed; falling back to zlib-stream. Install 'zstandard' to enable it."
+        )
+    return "zlib-stream", ZlibStreamInflater(max_size)
@@ -0,0 +1,198 @@
+"""Off-loop inflation and decoding of large Gateway frames.
+
+A ``GUILD_CREATE`` for a very large guild can take hundreds of milliseconds to
+inflate and decode. Done on the event loop, that delays heartbeats and every
+other task. :class:`DecodePool` moves frames above a size threshold to an
+executor while the shard's receive loop awaits the result, so frames are still
+processed strictly in order per shard.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from .etf import ETFCodec
+from .json_codec import get_codec
+
+T = TypeVar("T")
+
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024
+
+DECODE_EXECUTORS = ("thread", "process")
+
+
+def _decode_in_worker(codec_name: str, payload: bytes) -> Any:
+    """Decode ``payload`` inside a worker process."""
+
+    codec = ETFCodec() if codec_name == "etf" else get_codec(codec_name)
+    return codec.loads(payload)
+
+
+@dataclass
+class DecodeStats:
+    """Time spent inflating and decoding Gateway frames.
+
+    ``loop_time`` is time the event loop was blocked by inflation and decoding;
+    ``offload_time`` is time frames spent in the pool while the loop kept
+    running. All times are in seconds.
+    """
+
+    frames: int = 0
+    offloaded: int = 0
+    loop_time: float = 0.0
+    max_loop_time: float = 0.0
+    offload_time: float = 0.0
+
+    def record(self, elapsed: float, *, offloaded: bool) -> None:
+        self.frames += 1
+        if offloaded:
+            self.offloaded += 1
+            self.offload_time += elapsed
+        else:
+            self.loop_time += elapsed
+            if elapsed > self.max_loop_time:
+                self.max_loop_time = elapsed
+
+
+class DecodePool:
+    """Runs inflation and decoding of large frames outside the event loop.
+
+    Parameters
+    ----------
+    threshold:
+        Compressed frame size, in bytes, from which frames are offloaded.
+    executor:
+        ``"thread"`` inflates and decodes in a thread pool. zlib and zstd
+        release the GIL while inflating, but JSON decoding does not, so the
+        loop still pauses while a thread decodes. ``"process"`` inflates in
+        a thread and decodes in a process pool, which keeps the loop free at
+        the cost of pickling the result back. An existing thread-based
+        :class:`~concurrent.futures.Executor` may also be passed and is used
+        for both steps; it is not shut down by :meth:`close`.
+    max_workers:
+        Size of the pools created for ``"thread"`` and ``"process"``.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+        executor: Union[str, Executor] = "thread",
+        *,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        if isinstance(executor, str) and executor not in DECODE_EXECUTORS:
+            raise ValueError(
+                f"Unsupported decode executor {executor!r}. Expected 'thread' or 'process'."
+            )
+        self.threshold: int = threshold
+        self._max_workers: int = max_workers or min(4, os.cpu_count() or 1)
+        self._kind: str = executor if isinstance(executor, str) else "custom"
+        self._owns_executors: bool = isinstance(executor, str)
+        self._thread_executor: Optional[Executor] = (
+            None if isinstance(executor, str) else executor
+        )
+        self._process_executor: Optional[Executor] = None
+
+    @property
+    def uses_processes(self) -> bool:
+        return self._kind == "process"
+
+    def should_offload(self, size: int) -> bool:
+        return size >= self.threshold
+
+    def _threads(self) -> Executor:
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="disagreement-decode",
+            )
+        return self._thread_executor
+
+    def _processes(self) -> Executor:
+        if self._process_executor is None:
+            self._process_executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._process_executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` in the thread (or custom) executor."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads(), func, *args)
+
+    async def decode(
+        self, codec_name: str, payload: bytes, fallback: Callable[[bytes], T]
+    ) -> T:
+        """Decode ``payload`` off the loop.
+
+        In process mode the payload is decoded by the built-in codec named
+        ``codec_name``; otherwise ``fallback`` runs in the thread executor.
+        """
+
+        if not self.uses_processes:
+            return await self.run(fallback, payload)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._processes(), _decode_in_worker, codec_name, bytes(payload)
+        )
+
+    def close(self) -> None:
+        """Shut down executors created by this pool."""
+
+        if self._owns_executors and self._thread_executor is not None:
+            self._thread_executor.shutdown(wait=False)
+            self._thread_executor = None
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=False)
+            self._process_executor = None
+
+
+class LoopStallMonitor:
+    """Measures how late the event loop runs a periodic probe.
+
+    Every ``interval`` seconds the monitor schedules a wake-up and records how
+    much later than requested it actually ran. Any lag above ``threshold`` is
+    counted as a stall, which makes it easy to compare loop responsiveness with
+    and without a :class:`DecodePool`.
+    """
+
+    def __init__(self, interval: float = 0.01, threshold: float = 0.02) -> None:
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self._task: Optional[asyncio.Task] = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.samples: int = 0
+        self.stalls: int = 0
+        self.total_stall: float = 0.0
+        self.max_stall: float = 0.0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._probe())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - expected
+            self.samples += 1
+            if lag > self.threshold:
+                self.stalls += 1
+                self.total_stall += lag
+                if lag > self.max_stall:
+                    self.max_stall = lag
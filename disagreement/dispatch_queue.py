@@ -0,0 +1,173 @@
+"""Bounded, prioritised queue between a shard's receive loop and its listeners.
+
+Without a queue the receive loop awaits every listener before reading the next
+frame, so one slow handler stops the shard from reading its socket. With a
+:class:`DispatchQueue` the receive loop only decodes frames and tracks
+sequence numbers; a separate task delivers queued events to listeners.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Mapping, Optional, Tuple
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+DEFAULT_PRIORITY = 1
+
+# Lower values are delivered first. Events in the same lane keep their order.
+DEFAULT_PRIORITIES: Dict[str, int] = {
+    "READY": 0,
+    "RESUMED": 0,
+    "SHARD_READY": 0,
+    "SHARD_RESUME": 0,
+    "INTERACTION_CREATE": 0,
+    "PRESENCE_UPDATE": 2,
+    "TYPING_START": 2,
+}
+
+QueuedEvent = Tuple[str, Any]
+
+
+class DispatchQueue:
+    """Queue of ``(event_name, data)`` pairs split into priority lanes.
+
+    Parameters
+    ----------
+    maxsize:
+        Maximum number of queued events across all lanes.
+    overflow:
+        What :meth:`put` does when the queue is full. ``"block"`` waits for
+        space, which pauses the receive loop. ``"drop_oldest"`` discards the
+        oldest queued event of the same type, or the oldest event of a lower
+        priority lane, and drops the new event if neither exists.
+        ``"spill"`` returns ``False`` so the caller dispatches the event
+        itself.
+    priorities:
+        Overrides for :data:`DEFAULT_PRIORITIES`. Events not listed use
+        :data:`DEFAULT_PRIORITY`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        overflow: str = "block",
+        priorities: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unsupported overflow policy {overflow!r}. "
+                "Expected 'block', 'drop_oldest' or 'spill'."
+            )
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize: int = maxsize
+        self.overflow: str = overflow
+        self.priorities: Dict[str, int] = dict(DEFAULT_PRIORITIES)
+        if priorities:
+            self.priorities.update({k.upper(): v for k, v in priorities.items()})
+        self._lanes: Dict[int, Deque[QueuedEvent]] = {}
+        self._order: list[int] = []
+        self._size: int = 0
+        self._not_empty: asyncio.Event = asyncio.Event()
+        self._not_full: asyncio.Event = asyncio.Event()
+        self._not_full.set()
+
+        self.dropped: Counter[str] = Counter()
+        self.spilled: int = 0
+        self.high_water: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def full(self) -> bool:
+        return self._size >= self.maxsize
+
+    def priority_of(self, event_name: str) -> int:
+        return self.priorities.get(event_name, DEFAULT_PRIORITY)
+
+    def _lane(self, priority: int) -> Deque[QueuedEvent]:
+        lane = self._lanes.get(priority)
+        if lane is None:
+            lane = self._lanes[priority] = deque()
+            self._order = sorted(self._lanes)
+        return lane
+
+    def _append(self, event_name: str, data: Any) -> None:
+        self._lane(self.priority_of(event_name)).append((event_name, data))
+        self._size += 1
+        if self._size > self.high_water:
+            self.high_water = self._size
+        if self._size >= self.maxsize:
+            self._not_full.clear()
+        self._not_empty.set()
+
+    def _evict_for(self, event_name: str) -> bool:
+        """Drops one queued event to make room for ``event_name``."""
+
+        priority = self.priority_of(event_name)
+        lane = self._lanes.get(priority)
+        if lane:
+            for index, (queued_name, _) in enumerate(lane):
+                if queued_name == event_name:
+                    del lane[index]
+                    self._size -= 1
+                    self.dropped[event_name] += 1
+                    return True
+        for lower in reversed(self._order):
+            if lower <= priority:
+                break
+            lane = self._lanes[lower]
+            if lane:
+                dropped_name, _ = lane.popleft()
+                self._size -= 1
+                self.dropped[dropped_name] += 1
+                return True
+        return False
+
+    async def put(self, event_name: str, data: Any) -> bool:
+        """Queue an event.
+
+        Returns ``False`` if the event was not queued and should be
+        dispatched by the caller (``"spill"`` policy). Events discarded by
+        ``"drop_oldest"`` are counted in :attr:`dropped`.
+        """
+
+        if self.full():
+            if self.overflow == "spill":
+                self.spilled += 1
+                return False
+            if self.overflow == "drop_oldest":
+                if not self._evict_for(event_name):
+                    self.dropped[event_name] += 1
+                    return True
+            else:
+                while self.full():
+                    await self._not_full.wait()
+        self._append(event_name, data)
+        return True
+
+    async def get(self) -> QueuedEvent:
+        """Remove and return the next event, waiting while the queue is empty."""
+
+        while not self._size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        for priority in self._order:
+            lane = self._lanes[priority]
+            if lane:
+                item = lane.popleft()
+                break
+        self._size -= 1
+        if self._size < self.maxsize:
+            self._not_full.set()
+        return item
+
+    def clear(self) -> None:
+        """Discard all queued events."""
+
+        for lane in self._lanes.values():
+            lane.clear()
+        self._size = 0
+        self._not_full.set()
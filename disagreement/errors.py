@@ -48,12 +48,30 @@ class GatewayException(DisagreementException):
     pass
 
 
+class DecompressionLimitExceeded(GatewayException):
+    """Raised when a Gateway payload inflates beyond the configured size limit.
+
+    Attributes:
+        limit (int): The maximum decompressed size in bytes.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"Decompressed Gateway payload exceeds {limit} bytes.")
+
+
 class AuthenticationError(DisagreementException):
     """Exception raised for authentication failures (e.g., invalid token)."""
 
     pass
 
 
+class ClusterError(DisagreementException):
+    """Raised when a cluster worker fails to answer a control command."""
+
+    pass
+
+
 class RateLimitError(HTTPException):
     """
     Exception raised when a rate limit is encountered.
@@ -0,0 +1,288 @@
+"""Erlang External Term Format (ETF) support for the Gateway.
+
+Discord can send Gateway payloads encoded as ETF instead of JSON. The decoder in
+this module produces the same dictionaries the JSON decoder would: binaries and
+atoms become :class:`str`, ``nil``/``true``/``false`` become ``None`` and
+booleans, and snowflakes (which ETF transmits as integers) are converted to
+strings, as values and as map keys, so models and caches see the same keys
+regardless of encoding.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Any, Dict, FrozenSet, List, Tuple, Union
+
+ETFInput = Union[bytes, bytearray, memoryview]
+
+FORMAT_VERSION = 131
+
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+MAP_EXT = 116
+SMALL_ATOM_EXT = 115
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+# Snowflakes do not fit in INTEGER_EXT, so ``id``/``*_id`` integers above this
+# value are converted to strings. Smaller ``id`` fields (such as component IDs)
+# are plain integers in JSON as well.
+_MAX_INT32 = 2**31 - 1
+
+# Keys holding lists of snowflakes, which are strings in JSON payloads.
+SNOWFLAKE_LIST_KEYS: FrozenSet[str] = frozenset(
+    {"roles", "mention_roles", "user_ids", "applied_tags", "guild_ids"}
+)
+
+_ATOMS = {"nil": None, "null": None, "true": True, "false": False}
+
+_unpack_u16 = struct.Struct(">H").unpack_from
+_unpack_u32 = struct.Struct(">I").unpack_from
+_unpack_i32 = struct.Struct(">i").unpack_from
+_unpack_f64 = struct.Struct(">d").unpack_from
+_pack_i32 = struct.Struct(">i").pack
+_pack_u32 = struct.Struct(">I").pack
+_pack_f64 = struct.Struct(">d").pack
+
+# Map keys are atoms on the wire and repeat in every payload, so decoded atoms
+# are memoized by their raw bytes.
+_ATOM_CACHE_SIZE = 4096
+_atom_cache: Dict[bytes, Any] = {}
+
+
+def _atom(raw: bytes) -> Any:
+    try:
+        return _atom_cache[raw]
+    except KeyError:
+        pass
+    name = raw.decode("utf-8")
+    value = _ATOMS.get(name, name)
+    if len(_atom_cache) < _ATOM_CACHE_SIZE:
+        _atom_cache[raw] = value
+    return value
+
+
+def _decode_map(data: bytes, offset: int) -> Tuple[Dict[Any, Any], int]:
+    (arity,) = _unpack_u32(data, offset)
+    offset += 4
+    result: Dict[Any, Any] = {}
+    for _ in range(arity):
+        if data[offset] == SMALL_ATOM_UTF8_EXT:
+            size = data[offset + 1]
+            start = offset + 2
+            offset = start + size
+            key = _atom(data[start:offset])
+        else:
+            key, offset = _decode(data, offset)
+            # Maps keyed by snowflakes, e.g. an interaction's ``resolved``
+            # users, use string keys in JSON.
+            if type(key) is int and key > _MAX_INT32:
+                key = str(key)
+        value, offset = _decode(data, offset)
+        if type(value) is int:
+            if value > _MAX_INT32 and (key == "id" or str(key).endswith("_id")):
+                value = str(value)
+        elif type(value) is list and key in SNOWFLAKE_LIST_KEYS:
+            value = [str(v) if type(v) is int else v for v in value]
+        result[key] = value
+    return result, offset
+
+
+def _decode(data: bytes, offset: int) -> Tuple[Any, int]:
+    tag = data[offset]
+    offset += 1
+
+    if tag == BINARY_EXT:
+        (size,) = _unpack_u32(data, offset)
+        start = offset + 4
+        end = start + size
+        return data[start:end].decode("utf-8"), end
+    if tag == MAP_EXT:
+        return _decode_map(data, offset)
+    if tag == SMALL_INTEGER_EXT:
+        return data[offset], offset + 1
+    if tag == SMALL_BIG_EXT or tag == LARGE_BIG_EXT:
+        if tag == SMALL_BIG_EXT:
+            size = data[offset]
+            offset += 1
+        else:
+            (size,) = _unpack_u32(data, offset)
+            offset += 4
+        sign = data[offset]
+        start = offset + 1
+        end = start + size
+        value = int.from_bytes(data[start:end], "little")
+        return (-value if sign else value), end
+    if tag == SMALL_ATOM_UTF8_EXT or tag == SMALL_ATOM_EXT:
+        size = data[offset]
+        start = offset + 1
+        end = start + size
+        return _atom(data[start:end]), end
+    if tag == LIST_EXT:
+        (length,) = _unpack_u32(data, offset)
+        offset += 4
+        items = []
+        append = items.append
+        for _ in range(length):
+            item, offset = _decode(data, offset)
+            append(item)
+        tail, offset = _decode(data, offset)
+        if tail != []:
+            append(tail)
+        return items, offset
+    if tag == NIL_EXT:
+        return [], offset
+    if tag == INTEGER_EXT:
+        return _unpack_i32(data, offset)[0], offset + 4
+    if tag == NEW_FLOAT_EXT:
+        return _unpack_f64(data, offset)[0], offset + 8
+    if tag == ATOM_EXT or tag == ATOM_UTF8_EXT:
+        (size,) = _unpack_u16(data, offset)
+        start = offset + 2
+        end = start + size
+        return _atom(data[start:end]), end
+    if tag == STRING_EXT:
+        (size,) = _unpack_u16(data, offset)
+        start = offset + 2
+        end = start + size
+        return list(data[start:end]), end
+    if tag == FLOAT_EXT:
+        end = offset + 31
+        return float(data[offset:end].rstrip(b"\x00")), end
+    if tag == SMALL_TUPLE_EXT or tag == LARGE_TUPLE_EXT:
+        if tag == SMALL_TUPLE_EXT:
+            arity = data[offset]
+            offset += 1
+        else:
+            (arity,) = _unpack_u32(data, offset)
+            offset += 4
+        items = []
+        for _ in range(arity):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return items, offset
+    raise ValueError(f"Unsupported ETF tag {tag} at offset {offset - 1}.")
+
+
+def loads(data: ETFInput) -> Any:
+    """Decode an ETF encoded term.
+
+    Raises
+    ------
+    ValueError
+        If ``data`` is not a valid ETF term or uses unsupported types.
+    """
+
+    data = bytes(data)
+    if not data or data[0] != FORMAT_VERSION:
+        raise ValueError("Data is not ETF encoded (missing version byte).")
+    offset = 1
+    if len(data) > 1 and data[1] == COMPRESSED:
+        try:
+            data = zlib.decompress(data[6:])
+        except zlib.error as e:
+            raise ValueError(f"Invalid compressed ETF term: {e}") from e
+        offset = 0
+    try:
+        result, offset = _decode(data, offset)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed ETF data: {e}") from e
+    if offset > len(data):
+        raise ValueError("Malformed ETF data: unexpected end of data.")
+    return result
+
+
+def _encode_str(value: str, out: List[bytes]) -> None:
+    encoded = value.encode("utf-8")
+    out.append(b"m" + _pack_u32(len(encoded)))
+    out.append(encoded)
+
+
+def _encode_int(value: int, out: List[bytes]) -> None:
+    if 0 <= value <= 255:
+        out.append(bytes((SMALL_INTEGER_EXT, value)))
+    elif -(2**31) <= value < 2**31:
+        out.append(b"b" + _pack_i32(value))
+    else:
+        sign = 1 if value < 0 else 0
+        magnitude = -value if sign else value
+        size = (magnitude.bit_length() + 7) // 8
+        if size > 255:
+            raise ValueError("Integer is too large to encode as ETF.")
+        out.append(bytes((SMALL_BIG_EXT, size, sign)))
+        out.append(magnitude.to_bytes(size, "little"))
+
+
+def _encode(value: Any, out: List[bytes], atom_keys: bool) -> None:
+    if isinstance(value, str):
+        _encode_str(value, out)
+    elif value is None:
+        out.append(b"w\x03nil")
+    elif value is True:
+        out.append(b"w\x04true")
+    elif value is False:
+        out.append(b"w\x05false")
+    elif isinstance(value, int):
+        _encode_int(int(value), out)
+    elif isinstance(value, float):
+        out.append(b"F" + _pack_f64(value))
+    elif isinstance(value, dict):
+        out.append(b"t" + _pack_u32(len(value)))
+        for key, item in value.items():
+            if atom_keys and isinstance(key, str):
+                encoded = key.encode("utf-8")
+                out.append(bytes((SMALL_ATOM_UTF8_EXT, len(encoded))) + encoded)
+            else:
+                _encode(key, out, atom_keys)
+            _encode(item, out, atom_keys)
+    elif isinstance(value, (list, tuple)):
+        if value:
+            out.append(b"l" + _pack_u32(len(value)))
+            for item in value:
+                _encode(item, out, atom_keys)
+        out.append(b"j")
+    else:
+        raise TypeError(f"Object of type {type(value).__name__} is not ETF encodable")
+
+
+def dumps(value: Any, *, atom_keys: bool = False) -> bytes:
+    """Encode ``value`` as an ETF term.
+
+    Strings are sent as binaries, ``None`` as the ``nil`` atom and lists and
+    dictionaries as Erlang lists and maps, matching what the Gateway expects.
+    ``atom_keys`` encodes map keys as atoms the way Discord does when sending,
+    which is useful for producing test and benchmark frames.
+    """
+
+    out: List[bytes] = [bytes((FORMAT_VERSION,))]
+    _encode(value, out, atom_keys)
+    return b"".join(out)
+
+
+class ETFCodec:
+    """Exposes :func:`loads` and :func:`dumps` through the same interface as
+    :class:`~disagreement.json_codec.JSONCodec`."""
+
+    name = "etf"
+
+    def loads(self, data: ETFInput) -> Any:
+        return loads(data)
+
+    def dumps_bytes(self, obj: Any, *, indent: bool = False) -> bytes:
+        return dumps(obj)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r}>"
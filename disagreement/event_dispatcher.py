@@ -4,14 +4,19 @@ Event dispatcher for handling Discord Gateway events.
 
 import asyncio
 import inspect
+import time
 from collections import defaultdict
 from typing import (
     Callable,
     Coroutine,
     Any,
     Dict,
+    FrozenSet,
+    Hashable,
     List,
+    Mapping,
     Set,
+    Tuple,
     TYPE_CHECKING,
     Awaitable,
     Optional,
@@ -19,6 +24,7 @@ from typing import (
 
 from .models import Message, User  # Assuming User might be part of other events
 from .errors import DisagreementException
+from .latency import current_timing
 
 if TYPE_CHECKING:
     from .client import Client  # For type hinting to avoid circular imports
@@ -27,18 +33,192 @@ if TYPE_CHECKING:
 # Type alias for an event listener
 EventListener = Callable[..., Awaitable[None]]
 
+# Returns the ordering key (e.g. a channel ID) for an event's parsed data.
+OrderingKey = Callable[[Any], Optional[Hashable]]
+
+# Calls a listener with the event data, adapted to the listener's arity.
+ListenerInvoker = Callable[[Any], Awaitable[None]]
+Invocation = Tuple[EventListener, ListenerInvoker]
+
+# Keys a waiter can be indexed by; see :meth:`EventDispatcher.add_waiter`.
+WAITER_KEYS = ("channel_id", "author_id", "message_id", "custom_id")
+
+
+def _field(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _author_id(event_name: str, data: Any) -> Any:
+    for name in ("author", "user", "member"):
+        author = _field(data, name)
+        if author is not None:
+            author_id = _field(author, "id")
+            if author_id is None:
+                author_id = _field(_field(author, "user"), "id")
+            if author_id is not None:
+                return author_id
+    return _field(data, "user_id")
+
+
+def _message_id(event_name: str, data: Any) -> Any:
+    message_id = _field(data, "message_id")
+    if message_id is None:
+        message_id = _field(_field(data, "message"), "id")
+    if message_id is None and event_name.startswith("MESSAGE_"):
+        message_id = _field(data, "id")  # MESSAGE_CREATE/UPDATE/DELETE
+    return message_id
+
+
+def _custom_id(event_name: str, data: Any) -> Any:
+    custom_id = _field(data, "custom_id")
+    if custom_id is None:
+        custom_id = _field(_field(data, "data"), "custom_id")
+    return custom_id
+
+
+_KEY_EXTRACTORS: Dict[str, Callable[[str, Any], Any]] = {
+    "channel_id": lambda event_name, data: _field(data, "channel_id"),
+    "author_id": _author_id,
+    "message_id": _message_id,
+    "custom_id": _custom_id,
+}
+
+
+class _Waiter:
+    __slots__ = ("future", "check", "names", "values")
+
+    def __init__(
+        self,
+        future: asyncio.Future,
+        check: Optional[Callable[[Any], bool]],
+        names: Tuple[str, ...],
+        values: Tuple[str, ...],
+    ) -> None:
+        self.future = future
+        self.check = check
+        self.names = names
+        self.values = values
+
+
+class _BatchListener:
+    """Buffers parsed events for a listener that receives them as lists."""
+
+    __slots__ = ("listener", "max_size", "max_delay", "items", "timer", "tail")
+
+    def __init__(self, listener: EventListener, max_size: int, max_delay: float):
+        self.listener = listener
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.items: List[Any] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        # Last delivery task; the next one waits for it to keep batches in order.
+        self.tail: Optional[asyncio.Task] = None
+
+    def take(self) -> List[Any]:
+        items = self.items
+        self.items = []
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        return items
+
+
+def _make_invoker(event_name: str, listener: EventListener) -> ListenerInvoker:
+    """Resolve how ``listener`` is called once, instead of on every event."""
+
+    num_params = len(inspect.signature(listener).parameters)
+    if num_params == 0:
+
+        def invoke(_data: Any) -> Awaitable[None]:
+            return listener()
+
+        return invoke
+    if num_params > 1:
+        print(
+            f"Warning: Listener {listener.__name__} for {event_name} has an unhandled number of parameters ({num_params}). Skipping or attempting with one arg."
+        )
+    return listener
+
 
 class EventDispatcher:
     """
     Manages registration and dispatching of event listeners.
+
+    By default the listeners for an event run one after another and
+    :meth:`dispatch` returns once all of them finished. Passing
+    ``max_concurrency`` or ``event_concurrency`` runs each listener in its own
+    task instead, limited by a global and per-event number of listeners
+    running at once; :meth:`dispatch` then only waits for a free slot.
+
+    Args:
+        client_instance (Client): The client the dispatcher belongs to.
+        max_concurrency (Optional[int]): Maximum number of listener calls
+            running at once across all events.
+        event_concurrency (Optional[Mapping[str, int]]): Per-event limits on
+            concurrently running listener calls.
+        ordering_keys (Optional[Mapping[str, OrderingKey]]): Per-event
+            functions returning a key for the parsed event data, such as the
+            channel ID. Events with the same key reach each listener in order.
     """
 
-    def __init__(self, client_instance: "Client"):
+    # Events whose parsers keep the client's caches up to date. They are parsed
+    # even when no listener or waiter is registered for them.
+    CACHE_EVENTS: FrozenSet[str] = frozenset(
+        {
+            "MESSAGE_CREATE",
+            "MESSAGE_UPDATE",
+            "MESSAGE_DELETE",
+            "GUILD_CREATE",
+            "CHANNEL_CREATE",
+            "CHANNEL_UPDATE",
+            "GUILD_MEMBER_ADD",
+            "THREAD_CREATE",
+            "THREAD_UPDATE",
+            "THREAD_DELETE",
+            "INVITE_CREATE",
+        }
+    )
+
+    def __init__(
+        self,
+        client_instance: "Client",
+        *,
+        max_concurrency: Optional[int] = None,
+        event_concurrency: Optional[Mapping[str, int]] = None,
+        ordering_keys: Optional[Mapping[str, OrderingKey]] = None,
+    ):
         self._client: "Client" = client_instance
         self._listeners: Dict[str, List[EventListener]] = defaultdict(list)
-        self._waiters: Dict[
-            str, List[tuple[asyncio.Future, Optional[Callable[[Any], bool]]]]
-        ] = defaultdict(list)
+        # Per-event invocation tables, rebuilt when listeners change.
+        self._invocations: Dict[str, Tuple[Invocation, ...]] = {}
+        self._invokers: Dict[Tuple[str, EventListener], ListenerInvoker] = {}
+        # Waiters by event, plus an index of keyed waiters by key names and
+        # values. Waiters without keys are checked against every event.
+        self._waiters: Dict[str, Dict[asyncio.Future, _Waiter]] = {}
+        self._unkeyed_waiters: Dict[str, Dict[asyncio.Future, _Waiter]] = {}
+        self._waiter_index: Dict[
+            str,
+            Dict[Tuple[str, ...], Dict[Tuple[str, ...], Dict[asyncio.Future, _Waiter]]],
+        ] = {}
+        self._batches: Dict[str, List[_BatchListener]] = {}
+        self._interest: Optional[FrozenSet[str]] = None
+
+        self.concurrent: bool = max_concurrency is not None or bool(event_concurrency)
+        self._global_limit: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        )
+        self._event_limits: Dict[str, asyncio.Semaphore] = {
+            name.upper(): asyncio.Semaphore(limit)
+            for name, limit in (event_concurrency or {}).items()
+        }
+        self._ordering_keys: Dict[str, OrderingKey] = {
+            name.upper(): key for name, key in (ordering_keys or {}).items()
+        }
+        # Last task per (listener, key), which the next call for that key awaits.
+        self._key_tails: Dict[Tuple[EventListener, Hashable], asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
         self.on_dispatch_error: Optional[
             Callable[[str, Exception, EventListener], Awaitable[None]]
         ] = None
@@ -231,7 +411,12 @@ class EventDispatcher:
         # Normalize event name, e.g., 'on_message' -> 'MESSAGE_CREATE'
         # For now, we assume event_name is already the Discord event type string.
         # If using decorators like @client.on_message, the decorator would handle this mapping.
-        self._listeners[event_name.upper()].append(coro)
+        event_name_upper = event_name.upper()
+        key = (event_name_upper, coro)
+        if key not in self._invokers:
+            self._invokers[key] = _make_invoker(event_name_upper, coro)
+        self._listeners[event_name_upper].append(coro)
+        self._rebuild_invocations(event_name_upper)
 
     def unregister(self, event_name: str, coro: EventListener):
         """
@@ -247,86 +432,393 @@ class EventDispatcher:
                 self._listeners[event_name_upper].remove(coro)
             except ValueError:
                 pass
+            if coro not in self._listeners[event_name_upper]:
+                self._invokers.pop((event_name_upper, coro), None)
+            if not self._listeners[event_name_upper]:
+                del self._listeners[event_name_upper]
+            self._rebuild_invocations(event_name_upper)
+
+    def register_batch(
+        self,
+        event_name: str,
+        coro: EventListener,
+        *,
+        max_size: int = 100,
+        max_delay: float = 1.0,
+    ) -> None:
+        """Register ``coro`` to receive ``event_name`` events in lists.
+
+        Parsed events are buffered and ``coro`` is called with a list of them
+        once ``max_size`` events are buffered or ``max_delay`` seconds after
+        the first buffered event, whichever comes first. Batches reach
+        ``coro`` one at a time and in order.
+
+        Raises:
+            TypeError: If the provided callback is not a coroutine function.
+            ValueError: If ``max_size`` or ``max_delay`` is not positive.
+        """
+        if not inspect.iscoroutinefunction(coro):
+            raise TypeError(
+                f"Batch listener for '{event_name}' must be a coroutine function (async def)."
+            )
+        if max_size < 1 or max_delay <= 0:
+            raise ValueError("max_size and max_delay must be positive.")
+        event_name_upper = event_name.upper()
+        self._batches.setdefault(event_name_upper, []).append(
+            _BatchListener(coro, max_size, max_delay)
+        )
+        self._interest = None
+
+    def unregister_batch(self, event_name: str, coro: EventListener) -> None:
+        """Unregister a batch listener. Events it has buffered are still
+        delivered."""
+
+        event_name_upper = event_name.upper()
+        batches = self._batches.get(event_name_upper)
+        if not batches:
+            return
+        for batch in batches:
+            if batch.listener == coro:
+                batches.remove(batch)
+                if batch.items:
+                    self._flush_batch(event_name_upper, batch)
+                break
+        if not batches:
+            del self._batches[event_name_upper]
+        self._interest = None
+
+    def _flush_batch(
+        self, event_name: str, batch: _BatchListener
+    ) -> Optional[asyncio.Task]:
+        items = batch.take()
+        if not items:
+            return None
+        task = asyncio.create_task(
+            self._deliver_batch(event_name, batch, items, batch.tail)
+        )
+        batch.tail = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _deliver_batch(
+        self,
+        event_name: str,
+        batch: _BatchListener,
+        items: List[Any],
+        previous: Optional[asyncio.Task],
+    ) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait((previous,))
+            await self._invoke_listener(
+                event_name, batch.listener, batch.listener, items
+            )
+        finally:
+            if batch.tail is asyncio.current_task():
+                batch.tail = None
+
+    async def _feed_batches(
+        self, event_name: str, batches: List[_BatchListener], data: Any
+    ) -> None:
+        for batch in batches:
+            batch.items.append(data)
+            if len(batch.items) >= batch.max_size:
+                task = self._flush_batch(event_name, batch)
+                # Sequential dispatch waits for full batches, which slows the
+                # Gateway down instead of letting batches pile up.
+                if task is not None and not self.concurrent:
+                    await asyncio.wait((task,))
+            elif batch.timer is None:
+                batch.timer = asyncio.get_running_loop().call_later(
+                    batch.max_delay, self._flush_batch, event_name, batch
+                )
+
+    async def flush_batches(self) -> None:
+        """Deliver the buffered events of every batch listener now and wait
+        until the listeners returned."""
+
+        tasks = []
+        for event_name, batches in self._batches.items():
+            for batch in batches:
+                task = self._flush_batch(event_name, batch)
+                if task is not None:
+                    tasks.append(task)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def _rebuild_invocations(self, event_name: str) -> None:
+        listeners = self._listeners.get(event_name)
+        if listeners:
+            self._invocations[event_name] = tuple(
+                (listener, self._invokers[(event_name, listener)])
+                for listener in listeners
+            )
+        else:
+            self._invocations.pop(event_name, None)
+        self._interest = None
 
     def add_waiter(
         self,
         event_name: str,
         future: asyncio.Future,
         check: Optional[Callable[[Any], bool]] = None,
+        keys: Optional[Mapping[str, Any]] = None,
     ) -> None:
-        self._waiters[event_name.upper()].append((future, check))
+        """Resolve ``future`` with the next matching ``event_name`` event.
+
+        ``keys`` maps names from :data:`WAITER_KEYS` to the values the event
+        must have. Keyed waiters are looked up in a hash index, so only
+        waiters whose keys match run their ``check``. Waiters are removed when
+        they resolve; callers remove cancelled or timed out ones with
+        :meth:`remove_waiter`, which takes constant time.
+        """
+        event_name = event_name.upper()
+        items = sorted((k, v) for k, v in (keys or {}).items() if v is not None)
+        for name, _ in items:
+            if name not in _KEY_EXTRACTORS:
+                raise ValueError(
+                    f"Unsupported waiter key {name!r}. Expected one of {WAITER_KEYS}."
+                )
+        names = tuple(name for name, _ in items)
+        values = tuple(str(value) for _, value in items)
+        waiter = _Waiter(future, check, names, values)
+
+        self._waiters.setdefault(event_name, {})[future] = waiter
+        if names:
+            index = self._waiter_index.setdefault(event_name, {})
+            index.setdefault(names, {}).setdefault(values, {})[future] = waiter
+        else:
+            self._unkeyed_waiters.setdefault(event_name, {})[future] = waiter
+        self._interest = None
 
     def remove_waiter(self, event_name: str, future: asyncio.Future) -> None:
-        waiters = self._waiters.get(event_name.upper())
+        event_name = event_name.upper()
+        waiters = self._waiters.get(event_name)
         if not waiters:
             return
-        self._waiters[event_name.upper()] = [
-            (f, c) for f, c in waiters if f is not future
-        ]
-        if not self._waiters[event_name.upper()]:
-            self._waiters.pop(event_name.upper(), None)
+        waiter = waiters.pop(future, None)
+        if waiter is None:
+            return
+        if waiter.names:
+            buckets = self._waiter_index[event_name][waiter.names]
+            bucket = buckets[waiter.values]
+            del bucket[future]
+            if not bucket:
+                del buckets[waiter.values]
+                if not buckets:
+                    del self._waiter_index[event_name][waiter.names]
+                    if not self._waiter_index[event_name]:
+                        del self._waiter_index[event_name]
+        else:
+            unkeyed = self._unkeyed_waiters[event_name]
+            del unkeyed[future]
+            if not unkeyed:
+                del self._unkeyed_waiters[event_name]
+        if not waiters:
+            del self._waiters[event_name]
+            self._interest = None
+
+    def consumers(self) -> List[Tuple[str, str, Optional[EventListener]]]:
+        """``(event, kind, callback)`` for every registered consumer.
+
+        ``kind`` is ``"listener"``, ``"batch listener"`` or ``"wait_for"``;
+        waiters have no callback.
+        """
+
+        consumers: List[Tuple[str, str, Optional[EventListener]]] = []
+        for event_name, listeners in self._listeners.items():
+            consumers.extend((event_name, "listener", c) for c in listeners)
+        for event_name, batches in self._batches.items():
+            consumers.extend(
+                (event_name, "batch listener", b.listener) for b in batches
+            )
+        for event_name, waiters in self._waiters.items():
+            if waiters:
+                consumers.append((event_name, "wait_for", None))
+        return consumers
+
+    @property
+    def interest_set(self) -> FrozenSet[str]:
+        """Gateway event names whose payloads are needed by a listener, a
+        waiter or the cache.
+
+        ``RAW_`` listeners count towards the underlying event. The set is
+        recomputed lazily after listeners or waiters change.
+        """
+
+        interest = self._interest
+        if interest is None:
+            names = set(self.CACHE_EVENTS)
+            for event_name in (*self._listeners, *self._waiters, *self._batches):
+                if self._has_consumers(event_name):
+                    names.add(event_name[4:] if event_name.startswith("RAW_") else event_name)
+            interest = self._interest = frozenset(names)
+        return interest
+
+    def wants(self, event_name: str) -> bool:
+        """Return whether a Gateway event has to be decoded and dispatched."""
+
+        return event_name.upper() in self.interest_set
+
+    def _has_consumers(self, event_name: str) -> bool:
+        return bool(
+            self._listeners.get(event_name)
+            or self._waiters.get(event_name)
+            or self._batches.get(event_name)
+        )
 
     def _resolve_waiters(self, event_name: str, data: Any) -> None:
-        waiters = self._waiters.get(event_name)
-        if not waiters:
+        if event_name not in self._waiters:
             return
-        to_remove: List[tuple[asyncio.Future, Optional[Callable[[Any], bool]]]] = []
-        for future, check in waiters:
-            if future.cancelled():
-                to_remove.append((future, check))
+        unkeyed = self._unkeyed_waiters.get(event_name)
+        candidates: List[_Waiter] = list(unkeyed.values()) if unkeyed else []
+        index = self._waiter_index.get(event_name)
+        if index:
+            extracted: Dict[str, Optional[str]] = {}
+            for names, buckets in index.items():
+                values = []
+                for name in names:
+                    if name not in extracted:
+                        value = _KEY_EXTRACTORS[name](event_name, data)
+                        extracted[name] = None if value is None else str(value)
+                    values.append(extracted[name])
+                bucket = buckets.get(tuple(values))
+                if bucket:
+                    candidates.extend(bucket.values())
+
+        for waiter in candidates:
+            future = waiter.future
+            if future.done():
+                self.remove_waiter(event_name, future)
                 continue
             try:
-                if check is None or check(data):
+                if waiter.check is None or waiter.check(data):
                     future.set_result(data)
-                    to_remove.append((future, check))
+                    self.remove_waiter(event_name, future)
             except Exception as exc:
                 future.set_exception(exc)
-                to_remove.append((future, check))
-        for item in to_remove:
-            if item in waiters:
-                waiters.remove(item)
-        if not waiters:
-            self._waiters.pop(event_name, None)
+                self.remove_waiter(event_name, future)
 
-    async def _dispatch_to_listeners(self, event_name: str, data: Any) -> None:
-        listeners = self._listeners.get(event_name)
-        if not listeners:
-            return
+    async def _invoke_listener(
+        self,
+        event_name: str,
+        listener: EventListener,
+        invoke: ListenerInvoker,
+        data: Any,
+    ) -> None:
+        timing = current_timing.get()
+        start = time.perf_counter() if timing is not None else 0.0
+        try:
+            await invoke(data)
+        except Exception as e:
+            callback = self.on_dispatch_error
+            if callback is not None:
+                try:
+                    await callback(event_name, e, listener)
+                except Exception as hook_error:
+                    print(f"Error in on_dispatch_error hook itself: {hook_error}")
+            else:
+                print(
+                    f"Error in event listener {listener.__name__} for {event_name}: {e}"
+                )
+                if hasattr(self._client, "on_error"):
+                    try:
+                        await self._client.on_error(event_name, e, listener)
+                    except Exception as client_err_e:
+                        print(f"Error in client.on_error itself: {client_err_e}")
+        finally:
+            if timing is not None:
+                timing.tracker.record_listener(
+                    event_name, listener, time.perf_counter() - start
+                )
+
+    async def _run_concurrent(
+        self,
+        event_name: str,
+        listener: EventListener,
+        invoke: ListenerInvoker,
+        data: Any,
+        event_limit: Optional[asyncio.Semaphore],
+        previous: Optional[asyncio.Task],
+    ) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait((previous,))
+            await self._invoke_listener(event_name, listener, invoke, data)
+        finally:
+            if event_limit is not None:
+                event_limit.release()
+            if self._global_limit is not None:
+                self._global_limit.release()
+
+    async def _spawn_listeners(
+        self, event_name: str, invocations: Tuple[Invocation, ...], data: Any
+    ) -> None:
+        key = None
+        key_func = self._ordering_keys.get(event_name)
+        if key_func is not None:
+            try:
+                key = key_func(data)
+            except Exception as e:
+                print(f"Error computing ordering key for {event_name}: {e}")
+
+        event_limit = self._event_limits.get(event_name)
+        for listener, invoke in invocations:
+            # Slots are taken before the task starts, so a task waiting on its
+            # predecessor never blocks that predecessor from running.
+            if event_limit is not None:
+                await event_limit.acquire()
+            if self._global_limit is not None:
+                try:
+                    await self._global_limit.acquire()
+                except BaseException:
+                    if event_limit is not None:
+                        event_limit.release()
+                    raise
+
+            previous = None
+            if key is not None:
+                tail_key = (listener, key)
+                previous = self._key_tails.get(tail_key)
+            task = asyncio.create_task(
+                self._run_concurrent(
+                    event_name, listener, invoke, data, event_limit, previous
+                )
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if key is not None:
+                self._key_tails[tail_key] = task
+                task.add_done_callback(
+                    lambda t, k=tail_key: self._key_tails.pop(k, None)
+                    if self._key_tails.get(k) is t
+                    else None
+                )
+
+    async def join(self) -> None:
+        """Wait until all listener tasks started in concurrent mode finished."""
+
+        while self._tasks:
+            await asyncio.wait(set(self._tasks))
 
+    async def _dispatch_to_listeners(self, event_name: str, data: Any) -> None:
         self._resolve_waiters(event_name, data)
 
-        for listener in listeners:
-            try:
-                sig = inspect.signature(listener)
-                num_params = len(sig.parameters)
-
-                if num_params == 0:
-                    await listener()
-                elif num_params == 1:
-                    await listener(data)
-                else:
-                    print(
-                        f"Warning: Listener {listener.__name__} for {event_name} has an unhandled number of parameters ({num_params}). Skipping or attempting with one arg."
-                    )
-                    if num_params > 0:
-                        await listener(data)
+        batches = self._batches.get(event_name)
+        if batches:
+            await self._feed_batches(event_name, batches, data)
 
-            except Exception as e:
-                callback = self.on_dispatch_error
-                if callback is not None:
-                    try:
-                        await callback(event_name, e, listener)
-                    except Exception as hook_error:
-                        print(f"Error in on_dispatch_error hook itself: {hook_error}")
-                else:
-                    print(
-                        f"Error in event listener {listener.__name__} for {event_name}: {e}"
-                    )
-                    if hasattr(self._client, "on_error"):
-                        try:
-                            await self._client.on_error(event_name, e, listener)
-                        except Exception as client_err_e:
-                            print(f"Error in client.on_error itself: {client_err_e}")
+        invocations = self._invocations.get(event_name)
+        if not invocations:
+            return
+
+        if self.concurrent:
+            await self._spawn_listeners(event_name, invocations, data)
+            return
+
+        for listener, invoke in invocations:
+            await self._invoke_listener(event_name, listener, invoke, data)
 
     async def dispatch(self, event_name: str, raw_data: Dict[str, Any]):
         """Dispatch an event and its raw counterpart to all listeners."""
@@ -334,15 +826,29 @@ class EventDispatcher:
         event_name_upper = event_name.upper()
         raw_event_name = f"RAW_{event_name_upper}"
 
-        await self._dispatch_to_listeners(raw_event_name, raw_data)
+        if self._has_consumers(raw_event_name):
+            await self._dispatch_to_listeners(raw_event_name, raw_data)
+
+        # Skip model construction when nothing would observe the result.
+        if (
+            event_name_upper not in self.CACHE_EVENTS
+            and not self._has_consumers(event_name_upper)
+        ):
+            return
 
         parsed_data: Any = raw_data
         if event_name_upper in self._event_parsers:
+            timing = current_timing.get()
+            start = time.perf_counter() if timing is not None else 0.0
             try:
                 parser = self._event_parsers[event_name_upper]
                 parsed_data = parser(raw_data)
             except Exception as e:
                 print(f"Error parsing event data for {event_name_upper}: {e}")
                 return
+            if timing is not None:
+                timing.tracker.record(
+                    event_name_upper, "parse", time.perf_counter() - start
+                )
 
         await self._dispatch_to_listeners(event_name_upper, parsed_data)
@@ -1,5 +1,4 @@
 import inspect
-import json
 import logging
 import os
 from typing import (
@@ -19,6 +18,7 @@ if TYPE_CHECKING:
     from disagreement.client import Client
     from disagreement.interactions import Interaction, ResolvedData, Snowflake
 
+from disagreement.json_codec import JSONCodec, get_codec
 from disagreement.enums import (
     ApplicationCommandType,
     ApplicationCommandOptionType,
@@ -58,20 +58,24 @@ class AppCommandHandler:
         self._app_command_groups: Dict[str, AppCommandGroup] = {}
         self._converter_registry: Dict[type, type] = {}
 
+    @property
+    def _json(self) -> JSONCodec:
+        return get_codec(getattr(self.client, "json_codec", None))
+
     def _load_cached_ids(self) -> Dict[str, Dict[str, str]]:
         try:
-            with open(COMMANDS_CACHE_FILE, "r", encoding="utf-8") as fp:
-                return json.load(fp)
+            with open(COMMANDS_CACHE_FILE, "rb") as fp:
+                return self._json.loads(fp.read())
         except FileNotFoundError:
             return {}
-        except json.JSONDecodeError:
+        except ValueError:
             logger.warning("Invalid command cache file. Ignoring.")
             return {}
 
     def _save_cached_ids(self, data: Dict[str, Dict[str, str]]) -> None:
         try:
-            with open(COMMANDS_CACHE_FILE, "w", encoding="utf-8") as fp:
-                json.dump(data, fp, indent=2)
+            with open(COMMANDS_CACHE_FILE, "wb") as fp:
+                fp.write(self._json.dumps_bytes(data, indent=True))
         except Exception as e:  # pragma: no cover - logging only
             logger.error("Failed to write command cache: %s", e)
 
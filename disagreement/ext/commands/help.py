@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import List, Optional
+from typing import Optional
 
 from ...utils import Paginator
 from .core import Command, CommandContext, CommandHandler, Group
@@ -19,16 +19,6 @@ class HelpCommand(Command):
                     return
                 if isinstance(cmd, Group):
                     await self.send_group_help(ctx, cmd)
-                elif cmd:
-                    description = cmd.description or cmd.brief or "No description provided."
-                    await ctx.send(f"**{ctx.prefix}{cmd.name}**\n{description}")
-                else:
-                    lines: List[str] = []
-                    for registered in handler.walk_commands():
-                        brief = registered.brief or registered.description or ""
-                        lines.append(f"{ctx.prefix}{registered.name} - {brief}".strip())
-                    if lines:
-                        await ctx.send("\n".join(lines))
                 else:
                     await self.send_command_help(ctx, cmd)
             else:
@@ -51,8 +41,7 @@ class HelpCommand(Command):
         for cog_name, cmds in groups.items():
             paginator.add_line(f"**{cog_name}**")
             for cmd in cmds:
-                brief = cmd.brief or cmd.description or ""
-                paginator.add_line(f"{ctx.prefix}{cmd.name} - {brief}".strip())
+                self._add_command_lines(paginator, ctx.prefix, cmd)
             paginator.add_line("")
 
         pages = paginator.pages
@@ -62,6 +51,16 @@ class HelpCommand(Command):
         for page in pages:
             await ctx.send(page)
 
+    def _add_command_lines(
+        self, paginator: Paginator, prefix: str, cmd: Command
+    ) -> None:
+        """Adds ``cmd`` and, for groups, every subcommand under it."""
+        brief = cmd.brief or cmd.description or ""
+        paginator.add_line(f"{prefix}{cmd.name} - {brief}".strip())
+        if isinstance(cmd, Group):
+            for sub in dict.fromkeys(cmd.commands.values()):
+                self._add_command_lines(paginator, f"{prefix}{cmd.name} ", sub)
+
     async def send_command_help(self, ctx: CommandContext, command: Command) -> None:
         description = command.description or command.brief or "No description provided."
         await ctx.send(f"**{ctx.prefix}{command.name}**\n{description}")
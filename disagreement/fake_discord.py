@@ -0,0 +1,659 @@
+"""In-process stand-in for the Discord Gateway and REST API.
+
+:class:`FakeDiscord` runs an :mod:`aiohttp.web` server on localhost. It speaks
+enough of the Gateway protocol (HELLO, IDENTIFY, RESUME, heartbeats, member
+requests) for :class:`~disagreement.client.Client` and
+:class:`~disagreement.shard_manager.ShardManager` to connect. It also answers
+REST calls with Discord-style ``X-RateLimit-*`` headers and 429 responses.
+Guild sizes and event rates are configurable, and RECONNECT, INVALID_SESSION
+or dropped connections can be injected. Load, soak and reconnection-storm
+tests can therefore run without network access::
+
+    async with FakeDiscord(guilds=50, shards=4, event_rate=200) as fake:
+        client = Client(token=fake.token, http_options={"base_url": fake.api_url})
+        await client.connect()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+
+from .enums import GatewayOpcode
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v10"
+
+
+@dataclass
+class FakeDiscordStats:
+    """Counters of what clients did against a :class:`FakeDiscord`."""
+
+    connections: int = 0
+    identifies: int = 0
+    resumes: int = 0
+    failed_resumes: int = 0
+    heartbeats: int = 0
+    dispatches: int = 0
+    commands: Dict[int, int] = field(default_factory=dict)
+    rest_requests: int = 0
+    rate_limited: int = 0
+
+
+class _Session:
+    def __init__(self, session_id: str, shard: Tuple[int, int]) -> None:
+        self.session_id: str = session_id
+        self.shard: Tuple[int, int] = shard
+        self.sequence: int = 0
+        # Sent dispatches kept for RESUME.
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=5000)
+
+
+class _Connection:
+    def __init__(self, ws: web.WebSocketResponse, compress: Optional[str]) -> None:
+        self.ws: web.WebSocketResponse = ws
+        self.session: Optional[_Session] = None
+        self.event_task: Optional[asyncio.Task] = None
+        self._compressor: Any = None
+        self._flush_mode: Any = None
+        if compress == "zlib-stream":
+            self._compressor = zlib.compressobj()
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+        elif compress == "zstd-stream":
+            import zstandard
+
+            self._compressor = zstandard.ZstdCompressor().compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    async def send(self, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload, separators=(",", ":"))
+        if self._compressor is None:
+            await self.ws.send_str(data)
+            return
+        frame = self._compressor.compress(data.encode("utf-8"))
+        frame += self._compressor.flush(self._flush_mode)
+        await self.ws.send_bytes(frame)
+
+
+class FakeDiscord:
+    """Local fake of the Discord Gateway and REST API.
+
+    Parameters
+    ----------
+    token:
+        Token clients must send. Wrong tokens get 401 from REST and close
+        code 4004 from the Gateway.
+    guilds, members_per_guild, channels_per_guild:
+        Size of the synthesized guilds, sent as ``GUILD_CREATE`` after READY
+        to the shard each guild belongs to.
+    shards:
+        Shard count recommended by ``GET /gateway/bot``.
+    max_concurrency:
+        ``session_start_limit.max_concurrency`` reported to clients.
+    heartbeat_interval:
+        Interval in milliseconds sent in HELLO.
+    event_rate:
+        ``MESSAGE_CREATE``, ``PRESENCE_UPDATE`` and ``TYPING_START`` events
+        per second sent on every ready connection. ``0`` sends none.
+    rest_rate_limit, rest_rate_window:
+        Requests allowed per route per window before the server answers 429.
+    global_rate_limit:
+        Requests allowed per second across all routes; ``None`` disables the
+        global limit.
+    seed:
+        Seed for the generated IDs and names.
+    """
+
+    def __init__(
+        self,
+        *,
+        token: str = "fake-token",
+        guilds: int = 1,
+        members_per_guild: int = 50,
+        channels_per_guild: int = 5,
+        shards: int = 1,
+        max_concurrency: int = 1,
+        heartbeat_interval: int = 41250,
+        event_rate: float = 0.0,
+        rest_rate_limit: int = 5,
+        rest_rate_window: float = 1.0,
+        global_rate_limit: Optional[int] = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.token: str = token
+        self.shards: int = shards
+        self.max_concurrency: int = max_concurrency
+        self.heartbeat_interval: int = heartbeat_interval
+        self.event_rate: float = event_rate
+        self.rest_rate_limit: int = rest_rate_limit
+        self.rest_rate_window: float = rest_rate_window
+        self.global_rate_limit: Optional[int] = global_rate_limit
+        self.stats: FakeDiscordStats = FakeDiscordStats()
+        self.host: str = host
+        self.port: int = port
+
+        self._rng = random.Random(seed)
+        self._snowflakes: Set[int] = set()
+        self.application_id: str = self._snowflake()
+        self.user: Dict[str, Any] = {
+            "id": self.application_id,
+            "username": "fake-bot",
+            "discriminator": "0",
+            "global_name": None,
+            "avatar": None,
+            "bot": True,
+        }
+        self.guilds: List[Dict[str, Any]] = [
+            self._guild(index, members_per_guild, channels_per_guild)
+            for index in range(guilds)
+        ]
+        self._sessions: Dict[str, _Session] = {}
+        self._connections: Set[_Connection] = set()
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    # --- data generation -------------------------------------------------
+
+    def _snowflake(self) -> str:
+        while True:
+            value = self._rng.randrange(1 << 40, 1 << 62)
+            if value not in self._snowflakes:
+                self._snowflakes.add(value)
+                return str(value)
+
+    def _user(self) -> Dict[str, Any]:
+        return {
+            "id": self._snowflake(),
+            "username": f"user{self._rng.randrange(1_000_000)}",
+            "discriminator": "0",
+            "global_name": None,
+            "avatar": None,
+            "bot": False,
+        }
+
+    def _guild(self, index: int, members: int, channels: int) -> Dict[str, Any]:
+        guild_id = self._snowflake()
+        return {
+            "id": guild_id,
+            "name": f"Fake Guild {index}",
+            "owner_id": self.application_id,
+            "member_count": members,
+            "afk_timeout": 300,
+            "verification_level": 0,
+            "default_message_notifications": 0,
+            "explicit_content_filter": 0,
+            "emojis": [],
+            "features": [],
+            "mfa_level": 0,
+            "system_channel_flags": 0,
+            "premium_tier": 0,
+            "nsfw_level": 0,
+            "roles": [
+                {
+                    "id": guild_id,
+                    "name": "@everyone",
+                    "color": 0,
+                    "hoist": False,
+                    "position": 0,
+                    "permissions": "0",
+                    "managed": False,
+                    "mentionable": False,
+                }
+            ],
+            "channels": [
+                {
+                    "id": self._snowflake(),
+                    "type": 0,
+                    "name": f"channel-{i}",
+                    "guild_id": guild_id,
+                    "position": i,
+                }
+                for i in range(channels)
+            ],
+            "members": [
+                {
+                    "user": self._user(),
+                    "nick": None,
+                    "roles": [],
+                    "joined_at": "2024-01-01T00:00:00.000000+00:00",
+                    "deaf": False,
+                    "mute": False,
+                    "flags": 0,
+                }
+                for _ in range(members)
+            ],
+        }
+
+    def guilds_for_shard(self, shard_id: int) -> List[Dict[str, Any]]:
+        return [g for g in self.guilds if (int(g["id"]) >> 22) % self.shards == shard_id]
+
+    def _random_event(self, shard_id: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        guilds = self.guilds_for_shard(shard_id)
+        if not guilds:
+            return None
+        guild = self._rng.choice(guilds)
+        channel_id = guild["channels"][0]["id"] if guild["channels"] else guild["id"]
+        member = self._rng.choice(guild["members"]) if guild["members"] else None
+        user = member["user"] if member else self.user
+        roll = self._rng.random()
+        if roll < 0.5:
+            return "MESSAGE_CREATE", {
+                "id": self._snowflake(),
+                "channel_id": channel_id,
+                "guild_id": guild["id"],
+                "author": user,
+                "content": "hello from the fake gateway",
+                "timestamp": "2024-01-01T00:00:00.000000+00:00",
+                "tts": False,
+                "mention_everyone": False,
+                "mentions": [],
+                "mention_roles": [],
+                "attachments": [],
+                "embeds": [],
+                "pinned": False,
+                "type": 0,
+            }
+        if roll < 0.9:
+            return "PRESENCE_UPDATE", {
+                "user": {"id": user["id"]},
+                "guild_id": guild["id"],
+                "status": self._rng.choice(("online", "idle", "dnd")),
+                "activities": [],
+                "client_status": {"desktop": "online"},
+            }
+        return "TYPING_START", {
+            "channel_id": channel_id,
+            "guild_id": guild["id"],
+            "user_id": user["id"],
+            "timestamp": int(time.time()),
+        }
+
+    # --- server lifecycle ------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def api_url(self) -> str:
+        """Base URL to pass as ``HTTPClient(base_url=...)``."""
+        return f"{self.url}{API_PREFIX}"
+
+    @property
+    def gateway_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/gateway"
+
+    async def start(self) -> "FakeDiscord":
+        app = web.Application()
+        app.router.add_get("/gateway", self._handle_gateway)
+        app.router.add_route("*", API_PREFIX + "/{path:.*}", self._handle_rest)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        logger.info("Fake Discord listening on %s", self.url)
+        return self
+
+    async def close(self) -> None:
+        for connection in list(self._connections):
+            await self._disconnect(connection, 1001)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeDiscord":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    # --- fault injection -------------------------------------------------
+
+    def _targets(self, shard_id: Optional[int]) -> List[_Connection]:
+        return [
+            c
+            for c in self._connections
+            if shard_id is None or (c.session and c.session.shard[0] == shard_id)
+        ]
+
+    async def inject_reconnect(self, shard_id: Optional[int] = None) -> int:
+        """Send RECONNECT to matching connections; returns how many."""
+
+        targets = self._targets(shard_id)
+        for connection in targets:
+            await connection.send({"op": GatewayOpcode.RECONNECT, "d": None})
+        return len(targets)
+
+    async def inject_invalid_session(
+        self, resumable: bool = False, shard_id: Optional[int] = None
+    ) -> int:
+        """Send INVALID_SESSION; non-resumable sessions are forgotten."""
+
+        targets = self._targets(shard_id)
+        for connection in targets:
+            if not resumable and connection.session is not None:
+                self._sessions.pop(connection.session.session_id, None)
+            await connection.send({"op": GatewayOpcode.INVALID_SESSION, "d": resumable})
+        return len(targets)
+
+    async def drop_connections(
+        self, shard_id: Optional[int] = None, code: int = 4000
+    ) -> int:
+        """Close matching connections with ``code``, as a network blip would."""
+
+        targets = self._targets(shard_id)
+        for connection in targets:
+            await self._disconnect(connection, code)
+        return len(targets)
+
+    async def dispatch(
+        self, event_name: str, data: Dict[str, Any], shard_id: Optional[int] = None
+    ) -> None:
+        """Send a custom dispatch to ready connections."""
+
+        for connection in self._targets(shard_id):
+            if connection.session is not None:
+                await self._send_dispatch(connection, event_name, data)
+
+    # --- gateway ---------------------------------------------------------
+
+    async def _disconnect(self, connection: _Connection, code: int) -> None:
+        if connection.event_task is not None:
+            connection.event_task.cancel()
+        self._connections.discard(connection)
+        await connection.ws.close(code=code)
+
+    async def _send_dispatch(
+        self, connection: _Connection, event_name: str, data: Dict[str, Any]
+    ) -> None:
+        session = connection.session
+        assert session is not None
+        session.sequence += 1
+        payload = {"t": event_name, "s": session.sequence, "op": 0, "d": data}
+        session.buffer.append(payload)
+        self.stats.dispatches += 1
+        await connection.send(payload)
+
+    async def _handle_gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        compress = request.query.get("compress")
+        if request.query.get("encoding", "json") != "json":
+            await ws.close(code=4002)  # Decode error: only JSON is supported
+            return ws
+        connection = _Connection(ws, compress)
+        self._connections.add(connection)
+        self.stats.connections += 1
+        await connection.send(
+            {"op": GatewayOpcode.HELLO, "d": {"heartbeat_interval": self.heartbeat_interval}}
+        )
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                await self._handle_command(connection, json.loads(msg.data))
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            if connection.event_task is not None:
+                connection.event_task.cancel()
+            self._connections.discard(connection)
+        return ws
+
+    async def _handle_command(
+        self, connection: _Connection, payload: Dict[str, Any]
+    ) -> None:
+        op = payload.get("op")
+        data = payload.get("d")
+        self.stats.commands[op] = self.stats.commands.get(op, 0) + 1
+        if op == GatewayOpcode.HEARTBEAT:
+            self.stats.heartbeats += 1
+            await connection.send({"op": GatewayOpcode.HEARTBEAT_ACK})
+        elif op == GatewayOpcode.IDENTIFY:
+            await self._identify(connection, data or {})
+        elif op == GatewayOpcode.RESUME:
+            await self._resume(connection, data or {})
+        elif op == GatewayOpcode.REQUEST_GUILD_MEMBERS:
+            await self._request_members(connection, data or {})
+
+    async def _identify(self, connection: _Connection, data: Dict[str, Any]) -> None:
+        if data.get("token") != self.token:
+            await self._disconnect(connection, 4004)  # Authentication failed
+            return
+        shard_id, shard_count = data.get("shard") or (0, 1)
+        if shard_count != self.shards and not (shard_count == 1 and self.shards == 1):
+            await self._disconnect(connection, 4010)  # Invalid shard
+            return
+        self.stats.identifies += 1
+        session = _Session(uuid.uuid4().hex, (shard_id, shard_count))
+        self._sessions[session.session_id] = session
+        connection.session = session
+        guilds = self.guilds_for_shard(shard_id)
+        await self._send_dispatch(
+            connection,
+            "READY",
+            {
+                "v": 10,
+                "user": self.user,
+                "guilds": [{"id": g["id"], "unavailable": True} for g in guilds],
+                "session_id": session.session_id,
+                "resume_gateway_url": self.gateway_url,
+                "shard": [shard_id, shard_count],
+                "application": {"id": self.application_id, "flags": 0},
+            },
+        )
+        # Like Discord, large guilds arrive without their full member list.
+        large_threshold = min(int(data.get("large_threshold") or 50), 250)
+        for guild in guilds:
+            if guild["member_count"] > large_threshold:
+                guild = dict(
+                    guild, large=True, members=guild["members"][:large_threshold]
+                )
+            await self._send_dispatch(connection, "GUILD_CREATE", guild)
+        self._start_events(connection)
+
+    async def _resume(self, connection: _Connection, data: Dict[str, Any]) -> None:
+        session = self._sessions.get(data.get("session_id", ""))
+        if session is None or data.get("token") != self.token:
+            self.stats.failed_resumes += 1
+            await connection.send({"op": GatewayOpcode.INVALID_SESSION, "d": False})
+            return
+        self.stats.resumes += 1
+        connection.session = session
+        last_seen = data.get("seq") or 0
+        for payload in list(session.buffer):
+            if payload["s"] > last_seen:
+                await connection.send(payload)
+        await self._send_dispatch(connection, "RESUMED", {})
+        self._start_events(connection)
+
+    async def _request_members(
+        self, connection: _Connection, data: Dict[str, Any]
+    ) -> None:
+        guild = next((g for g in self.guilds if g["id"] == data.get("guild_id")), None)
+        members = guild["members"] if guild else []
+        user_ids = data.get("user_ids")
+        if user_ids:
+            members = [m for m in members if m["user"]["id"] in user_ids]
+        query = data.get("query") or ""
+        if query:
+            members = [m for m in members if m["user"]["username"].startswith(query)]
+        limit = data.get("limit") or 0
+        if limit:
+            members = members[:limit]
+        chunks = [members[i : i + 1000] for i in range(0, len(members), 1000)] or [[]]
+        for index, chunk in enumerate(chunks):
+            payload: Dict[str, Any] = {
+                "guild_id": data.get("guild_id"),
+                "members": chunk,
+                "chunk_index": index,
+                "chunk_count": len(chunks),
+            }
+            if data.get("nonce"):
+                payload["nonce"] = data["nonce"]
+            await self._send_dispatch(connection, "GUILD_MEMBERS_CHUNK", payload)
+
+    def _start_events(self, connection: _Connection) -> None:
+        if self.event_rate <= 0 or connection.event_task is not None:
+            return
+        connection.event_task = asyncio.get_running_loop().create_task(
+            self._generate_events(connection)
+        )
+
+    async def _generate_events(self, connection: _Connection) -> None:
+        assert connection.session is not None
+        interval = 1.0 / self.event_rate
+        next_at = time.monotonic()
+        while not connection.ws.closed:
+            event = self._random_event(connection.session.shard[0])
+            if event is None:
+                return
+            await self._send_dispatch(connection, *event)
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -1.0:
+                next_at = time.monotonic()  # Fell behind; do not burst to catch up
+
+    # --- REST ------------------------------------------------------------
+
+    def _take(self, key: str, limit: int, window: float) -> Tuple[int, float]:
+        """Consume one request from a fixed-window bucket.
+
+        Returns the remaining requests (``-1`` when exhausted) and the seconds
+        until the window resets.
+        """
+
+        now = time.monotonic()
+        used, reset_at = self._buckets.get(key, (0, now + window))
+        if now >= reset_at:
+            used, reset_at = 0, now + window
+        if used >= limit:
+            return -1, reset_at - now
+        self._buckets[key] = (used + 1, reset_at)
+        return limit - used - 1, reset_at - now
+
+    def _route_key(self, method: str, path: str) -> str:
+        # Major parameters (channel, guild, webhook) keep their IDs, as on Discord.
+        parts = path.strip("/").split("/")
+        key = []
+        for index, part in enumerate(parts):
+            major = index > 0 and parts[index - 1] in ("channels", "guilds", "webhooks")
+            key.append(part if major or not part.isdigit() else ":id")
+        return f"{method}:/{'/'.join(key)}"
+
+    async def _handle_rest(self, request: web.Request) -> web.Response:
+        self.stats.rest_requests += 1
+        if request.headers.get("Authorization") != f"Bot {self.token}":
+            return web.json_response({"message": "401: Unauthorized", "code": 0}, status=401)
+
+        if self.global_rate_limit is not None:
+            remaining, reset_after = self._take("global", self.global_rate_limit, 1.0)
+            if remaining < 0:
+                self.stats.rate_limited += 1
+                return self._rate_limited(reset_after, is_global=True)
+
+        path = "/" + request.match_info["path"]
+        route = self._route_key(request.method, path)
+        remaining, reset_after = self._take(
+            route, self.rest_rate_limit, self.rest_rate_window
+        )
+        headers = {
+            "X-RateLimit-Limit": str(self.rest_rate_limit),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": uuid.uuid5(uuid.NAMESPACE_URL, route).hex,
+        }
+        if remaining < 0:
+            self.stats.rate_limited += 1
+            return self._rate_limited(reset_after, headers=headers)
+
+        status, body = await self._rest_response(request, path)
+        if status == 204:
+            return web.Response(status=204, headers=headers)
+        return web.json_response(body, status=status, headers=headers)
+
+    def _rate_limited(
+        self,
+        retry_after: float,
+        *,
+        is_global: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> web.Response:
+        headers = dict(headers or {})
+        headers["Retry-After"] = f"{retry_after:.3f}"
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        headers["X-RateLimit-Scope"] = "global" if is_global else "user"
+        return web.json_response(
+            {
+                "message": "You are being rate limited.",
+                "retry_after": retry_after,
+                "global": is_global,
+            },
+            status=429,
+            headers=headers,
+        )
+
+    async def _rest_response(
+        self, request: web.Request, path: str
+    ) -> Tuple[int, Any]:
+        method = request.method
+        parts = path.strip("/").split("/")
+        if path in ("/gateway/bot", "/gateway"):
+            body: Dict[str, Any] = {"url": self.gateway_url}
+            if path == "/gateway/bot":
+                body["shards"] = self.shards
+                body["session_start_limit"] = {
+                    "total": 1000,
+                    "remaining": 1000 - self.stats.identifies,
+                    "reset_after": 86_400_000,
+                    "max_concurrency": self.max_concurrency,
+                }
+            return 200, body
+        if path == "/users/@me":
+            return 200, self.user
+        if method == "DELETE":
+            return 204, None
+        if parts[0] == "channels" and len(parts) == 3 and parts[2] == "messages":
+            if method == "POST":
+                payload = await request.json() if request.can_read_body else {}
+                return 200, {
+                    "id": self._snowflake(),
+                    "channel_id": parts[1],
+                    "author": self.user,
+                    "content": payload.get("content", ""),
+                    "timestamp": "2024-01-01T00:00:00.000000+00:00",
+                    "embeds": payload.get("embeds", []),
+                    "attachments": [],
+                    "mentions": [],
+                    "mention_roles": [],
+                    "pinned": False,
+                    "tts": False,
+                    "type": 0,
+                }
+            return 200, []
+        if parts[0] == "guilds" and len(parts) == 2:
+            guild = next((g for g in self.guilds if g["id"] == parts[1]), None)
+            if guild is None:
+                return 404, {"message": "Unknown Guild", "code": 10004}
+            return 200, {k: v for k, v in guild.items() if k not in ("members", "channels")}
+        if method in ("PUT", "PATCH", "POST"):
+            return 200, (await request.json()) if request.can_read_body else {}
+        return 200, {}
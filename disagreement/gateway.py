@@ -4,18 +4,53 @@ Manages the WebSocket connection to the Discord Gateway.
 
 import asyncio
 import logging
+import re
 import traceback
 import aiohttp
-import json
 import zlib
 import time
 import random
-from typing import Optional, TYPE_CHECKING, Any, Dict
+import uuid
+from typing import (
+    Optional,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Tuple,
+    Union,
+)
 
 from .models import Activity
+from .json_codec import JSONCodec, get_codec
+from .etf import ETFCodec
+from .decode_pool import DecodePool, DecodeStats
+from .dispatch_queue import DispatchQueue
+from .rate_limiter import GATEWAY_SEND_LIMIT, GatewaySendLimiter, IdentifyLimiter
+from .session_store import SessionState, SessionStore
+from .recording import GatewayRecorder
+from .latency import EventLatencyTracker, TimedEvent, current_timing
+from .member_chunks import (
+    DEFAULT_CHUNK_TIMEOUT,
+    GuildChunker,
+    MemberChunkStream,
+    parse_chunk_members,
+)
+from .compression import (
+    create_inflater,
+    ZLIB_SUFFIX,
+    MAX_DECOMPRESSION_SIZE,
+)
 
 from .enums import GatewayOpcode, GatewayIntent
-from .errors import GatewayException, DisagreementException, AuthenticationError
+from .errors import (
+    GatewayException,
+    DisagreementException,
+    AuthenticationError,
+    DecompressionLimitExceeded,
+)
 from .interactions import Interaction
 
 if TYPE_CHECKING:
@@ -24,14 +59,59 @@ if TYPE_CHECKING:
     from .http import HTTPClient
     from .interactions import Interaction  # Added for INTERACTION_CREATE
 
-# ZLIB Decompression constants
-ZLIB_SUFFIX = b"\x00\x00\xff\xff"
-MAX_DECOMPRESSION_SIZE = 10 * 1024 * 1024  # 10 MiB, adjust as needed
+GATEWAY_VERSION = 10
+
+# Close codes after which reconnecting cannot succeed.
+FATAL_CLOSE_CODES = frozenset({4004, 4010, 4011, 4012, 4013, 4014})
+GATEWAY_ENCODINGS = ("json", "etf")
+
+# Dispatch events the gateway itself acts on; never skipped by lazy dispatch.
+GATEWAY_EVENTS = frozenset(
+    {"READY", "RESUMED", "GUILD_MEMBERS_CHUNK", "INTERACTION_CREATE"}
+)
+
+# Discord serialises ``t``, ``s`` and ``op`` ahead of ``d``, so the routing
+# fields of a JSON dispatch can be read from the first few bytes of a frame.
+_PEEK_WINDOW = 128
+_DISPATCH_PREFIX = b'{"t":"'
+_DISPATCH_HEADER = re.compile(
+    rb'\{"t":"([A-Z0-9_]+)","s":(\d+|null),"op":0,"d":'
+)
+_HEADER_FIELD = re.compile(rb'"(t|s|op)"\s*:\s*(?:"([A-Z0-9_]+)"|(-?\d+)|null)')
 
 
 logger = logging.getLogger(__name__)
 
 
+def _peek_dispatch(data: Any) -> Optional[Tuple[str, Optional[int]]]:
+    """Return ``(t, s)`` for a JSON dispatch frame without decoding ``d``.
+
+    Returns ``None`` when the frame is not a dispatch or its header fields do
+    not all precede ``d``, in which case the frame must be decoded normally.
+    """
+
+    if not isinstance(data, (bytes, bytearray)):
+        return None
+    if data.startswith(_DISPATCH_PREFIX):
+        match = _DISPATCH_HEADER.match(data)
+        if match is not None:
+            name, sequence = match.groups()
+            return name.decode("ascii"), (
+                int(sequence) if sequence != b"null" else None
+            )
+    end = data.find(b'"d"', 0, _PEEK_WINDOW)
+    if end == -1:
+        return None
+    fields = {}
+    for match in _HEADER_FIELD.finditer(data, 0, end):
+        key, name, number = match.groups()
+        fields[key] = name.decode("ascii") if name is not None else number
+    if fields.get(b"op") != b"0" or not isinstance(fields.get(b"t"), str):
+        return None
+    sequence = fields.get(b"s")
+    return fields[b"t"], int(sequence) if sequence is not None else None
+
+
 class GatewayClient:
     """
     Handles the Discord Gateway WebSocket connection, heartbeating, and event dispatching.
@@ -50,7 +130,28 @@ class GatewayClient:
         shard_count: Optional[int] = None,
         max_retries: int = 5,
         max_backoff: float = 60.0,
+        json_codec: Optional[Union[str, JSONCodec]] = None,
+        encoding: str = "json",
+        max_decompression_size: int = MAX_DECOMPRESSION_SIZE,
+        compress: str = "zlib-stream",
+        lazy_dispatch: bool = True,
+        decode_pool: Optional[DecodePool] = None,
+        dispatch_queue_size: Optional[int] = None,
+        dispatch_overflow: str = "block",
+        dispatch_priorities: Optional[Mapping[str, int]] = None,
+        identify_limiter: Optional[IdentifyLimiter] = None,
+        send_limit: Optional[int] = GATEWAY_SEND_LIMIT,
+        session_store: Optional[SessionStore] = None,
+        recorder: Optional[GatewayRecorder] = None,
+        chunk_guilds: bool = False,
+        chunk_concurrency: int = 2,
+        chunk_batch_size: int = 5,
+        latency_tracker: Optional[EventLatencyTracker] = None,
     ):
+        if encoding not in GATEWAY_ENCODINGS:
+            raise ValueError(
+                f"Unsupported gateway encoding {encoding!r}. Expected 'json' or 'etf'."
+            )
         self._http: "HTTPClient" = http_client
         self._dispatcher: "EventDispatcher" = event_dispatcher
         self._token: str = token
@@ -61,6 +162,36 @@ class GatewayClient:
         self._shard_count: Optional[int] = shard_count
         self._max_retries: int = max_retries
         self._max_backoff: float = max_backoff
+        self._json: JSONCodec = get_codec(json_codec)
+        self._encoding: str = encoding
+        # Codec used for Gateway payloads; JSON text frames always use _json.
+        self._payload_codec: Union[JSONCodec, ETFCodec] = (
+            ETFCodec() if encoding == "etf" else self._json
+        )
+        # Skip decoding dispatches nothing is interested in (JSON only).
+        self._lazy_dispatch: bool = lazy_dispatch and encoding == "json"
+        self.skipped_dispatches: int = 0
+        # Large frames are inflated and decoded off the loop when a pool is set.
+        self._decode_pool: Optional[DecodePool] = decode_pool
+        self.decode_stats: DecodeStats = DecodeStats()
+        # Listeners run from a separate task when a dispatch queue is used.
+        self.dispatch_queue: Optional[DispatchQueue] = (
+            DispatchQueue(dispatch_queue_size, dispatch_overflow, dispatch_priorities)
+            if dispatch_queue_size is not None
+            else None
+        )
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+        # Shared by all shards of a ShardManager to respect max_concurrency.
+        self._identify_limiter: Optional[IdentifyLimiter] = identify_limiter
+        # Set once IDENTIFY/RESUME was sent and on READY/RESUMED respectively.
+        self.identified_event: asyncio.Event = asyncio.Event()
+        self.ready_event: asyncio.Event = asyncio.Event()
+
+        # Outbound commands per 60 seconds; None disables the limiter.
+        self.send_limiter: Optional[GatewaySendLimiter] = (
+            GatewaySendLimiter(send_limit) if send_limit is not None else None
+        )
 
         self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
         try:
@@ -72,18 +203,57 @@ class GatewayClient:
         self._last_sequence: Optional[int] = None
         self._session_id: Optional[str] = None
         self._resume_gateway_url: Optional[str] = None
+        # Resume state is saved here on a final close and loaded on connect.
+        self._session_store: Optional[SessionStore] = session_store
+        self._session_user: Optional[Dict[str, Any]] = None
+        self.restored_session: bool = False
 
         self._keep_alive_task: Optional[asyncio.Task] = None
         self._receive_task: Optional[asyncio.Task] = None
+        # Reconnects requested from inside the receive loop run separately,
+        # since close() cancels the receive task.
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._identify_task: Optional[asyncio.Task] = None
 
         self._last_heartbeat_sent: Optional[float] = None
         self._last_heartbeat_ack: Optional[float] = None
+        # Zombie detection: a heartbeat sent by _keep_alive that is still
+        # unacknowledged when the next one is due means the connection is dead.
+        self._awaiting_ack: bool = False
+        self._missed_heartbeat_acks: int = 0
+        self._zombie_disconnects: int = 0
 
-        # For zlib decompression
-        self._buffer = bytearray()
-        self._inflator = zlib.decompressobj()
+        # Transport decompression; falls back to zlib if zstd is unavailable.
+        self._compress, self._inflator = create_inflater(
+            compress, max_decompression_size
+        )
 
-        self._member_chunk_requests: Dict[str, asyncio.Future] = {}
+        # Raw received frames are written here for offline replay.
+        self._recorder: Optional[GatewayRecorder] = recorder
+        if recorder is not None:
+            recorder.metadata.update(
+                encoding=self._encoding,
+                compress=self._compress,
+                shard_id=shard_id,
+                shard_count=shard_count,
+            )
+
+        # End-to-end event timing; frame times are only taken when enabled.
+        self.event_latency: Optional[EventLatencyTracker] = latency_tracker
+        self._frame_times: Tuple[float, float] = (0.0, 0.0)
+
+        # Open member requests by nonce; a stream may span several shards.
+        self._member_chunk_requests: Dict[str, MemberChunkStream] = {}
+        self.chunker: Optional[GuildChunker] = None
+        if chunk_guilds:
+            if intents & GatewayIntent.GUILD_MEMBERS:
+                self.chunker = GuildChunker(
+                    self, concurrency=chunk_concurrency, batch_size=chunk_batch_size
+                )
+            else:
+                logger.warning(
+                    "Guild chunking needs the GUILD_MEMBERS intent; it is disabled."
+                )
 
     async def _reconnect(self) -> None:
         """Attempts to reconnect using exponential backoff with jitter."""
@@ -109,36 +279,167 @@ class GatewayClient:
                 await asyncio.sleep(wait_time)
                 delay = min(delay * 2, self._max_backoff)
 
+    def _schedule_reconnect(self, code: int, delay: float = 0.0) -> None:
+        """Closes with ``code`` and reconnects from a task of its own."""
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        self._reconnect_task = self._loop.create_task(
+            self._close_and_reconnect(code, delay)
+        )
+
+    async def _close_and_reconnect(self, code: int, delay: float) -> None:
+        try:
+            await self.close(code=code, reconnect=True)
+            if delay:
+                await asyncio.sleep(delay)
+            await self._reconnect()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            logger.error("Gateway reconnect failed: %s", e)
+
+    def _inflate(self, message_bytes: bytes) -> Optional[bytes]:
+        """Inflates a transport-compressed frame into the raw payload bytes.
+
+        Returns ``None`` for partial frames and corrupt data. Raises
+        :class:`DecompressionLimitExceeded` if the payload inflates past the
+        configured limit, which ends the receive loop.
+        """
+        try:
+            decompressed = self._inflator.feed(message_bytes)
+        except DecompressionLimitExceeded:
+            logger.error(
+                "Gateway payload exceeded %s bytes after decompression.",
+                self._inflator.max_size,
+            )
+            raise
+        except (zlib.error, ValueError) as e:
+            logger.error("%s decompression error: %s", self._compress, e)
+            self._inflator.reset()
+            return None
+
+        # ``None`` means the message is not complete yet.
+        return decompressed
+
     async def _decompress_message(
         self, message_bytes: bytes
     ) -> Optional[Dict[str, Any]]:
-        """Decompresses a zlib-compressed message from the Gateway."""
-        self._buffer.extend(message_bytes)
-
-        if len(message_bytes) < 4 or message_bytes[-4:] != ZLIB_SUFFIX:
-            # Message is not complete or not zlib compressed in the expected way
+        """Decompresses and decodes a transport-compressed Gateway message."""
+        decompressed = self._inflate(message_bytes)
+        if decompressed is None:
             return None
-            # Or handle partial messages if Discord ever sends them fragmented like this,
-            # but typically each binary message is a complete zlib stream.
+        return self._decode_payload(decompressed)
 
+    def _decode_payload(self, decompressed: bytes) -> Optional[Dict[str, Any]]:
         try:
-            decompressed = self._inflator.decompress(self._buffer)
-            self._buffer.clear()  # Reset buffer after successful decompression
-            return json.loads(decompressed.decode("utf-8"))
-        except zlib.error as e:
-            logger.error("Zlib decompression error: %s", e)
-            self._buffer.clear()  # Clear buffer on error
-            self._inflator = zlib.decompressobj()  # Reset inflator
-            return None
-        except json.JSONDecodeError as e:
-            logger.error("JSON decode error after decompression: %s", e)
+            return self._payload_codec.loads(decompressed)
+        except ValueError as e:
+            logger.error(
+                "%s decode error after decompression: %s", self._encoding.upper(), e
+            )
             return None
 
+    async def _read_binary(self, frame: bytes) -> Optional[Dict[str, Any]]:
+        """Inflates and decodes a binary frame.
+
+        Frames at or above the decode pool threshold are processed off the
+        event loop while this coroutine waits, which keeps frames in order.
+        Returns ``None`` for partial, skipped and undecodable frames.
+        """
+        pool = self._decode_pool
+        offload = pool is not None and pool.should_offload(len(frame))
+        start = time.perf_counter()
+        try:
+            if offload:
+                payload = await pool.run(self._inflate, frame)
+            else:
+                payload = self._inflate(frame)
+            if payload is None:
+                return None
+            if self._lazy_dispatch and self._skip_dispatch(payload):
+                return None
+            if not offload:
+                return self._decode_payload(payload)
+            try:
+                return await pool.decode(
+                    self._payload_codec.name, payload, self._decode_payload
+                )
+            except ValueError as e:
+                logger.error(
+                    "%s decode error after decompression: %s",
+                    self._encoding.upper(),
+                    e,
+                )
+                return None
+        finally:
+            self.decode_stats.record(time.perf_counter() - start, offloaded=offload)
+
+    def _skip_dispatch(self, payload: bytes) -> bool:
+        """Tracks the sequence of a dispatch nobody listens to and reports
+        whether decoding it can be skipped."""
+        peeked = _peek_dispatch(payload)
+        if peeked is None:
+            return False
+        event_name, sequence = peeked
+        wants = getattr(self._dispatcher, "wants", None)
+        if event_name in GATEWAY_EVENTS or wants is None or wants(event_name):
+            return False
+        if sequence is not None:
+            self._last_sequence = sequence
+        self.skipped_dispatches += 1
+        return True
+
+    async def _emit(self, event_name: str, data: Any) -> None:
+        """Hands a dispatch event to listeners, via the dispatch queue if enabled."""
+        if self.event_latency is not None:
+            timing = self.event_latency.begin(event_name, *self._frame_times)
+            queue = self.dispatch_queue
+            if queue is None or not await queue.put(
+                event_name, TimedEvent(data, timing)
+            ):
+                await self._dispatch_timed(event_name, data, timing)
+            return
+        queue = self.dispatch_queue
+        if queue is None or not await queue.put(event_name, data):
+            await self._dispatcher.dispatch(event_name, data)
+
+    async def _dispatch_timed(self, event_name: str, data: Any, timing: Any) -> None:
+        token = current_timing.set(timing)
+        try:
+            timing.dispatched()
+            await self._dispatcher.dispatch(event_name, data)
+        finally:
+            current_timing.reset(token)
+            timing.finish()
+
+    async def _dispatch_loop(self) -> None:
+        """Delivers queued events to listeners in priority order."""
+        assert self.dispatch_queue is not None
+        while True:
+            event_name, data = await self.dispatch_queue.get()
+            try:
+                if isinstance(data, TimedEvent):
+                    await self._dispatch_timed(event_name, data.data, data.timing)
+                else:
+                    await self._dispatcher.dispatch(event_name, data)
+            except Exception as e:
+                logger.error("Error dispatching queued %s event: %s", event_name, e)
+
     async def _send_json(self, payload: Dict[str, Any]):
+        """Sends a payload to the Gateway using the negotiated encoding.
+
+        Waits for the send limiter first; heartbeats, IDENTIFY and RESUME use
+        capacity that other commands cannot take.
+        """
+        if self.send_limiter is not None and self._ws and not self._ws.closed:
+            await self.send_limiter.acquire(payload.get("op"))
         if self._ws and not self._ws.closed:
             if self.verbose:
                 logger.debug("GATEWAY SEND: %s", payload)
-            await self._ws.send_json(payload)
+            if self._encoding == "etf":
+                await self._ws.send_bytes(self._payload_codec.dumps_bytes(payload))
+            else:
+                await self._ws.send_str(self._json.dumps(payload))
         else:
             logger.warning(
                 "Gateway send attempted but WebSocket is closed or not available."
@@ -158,12 +459,19 @@ class GatewayClient:
             logger.error("Heartbeat interval not set. Cannot start keep_alive.")
             return
 
+        interval = self._heartbeat_interval / 1000  # Interval is in ms
         try:
+            # The first heartbeat is jittered so shards do not beat in lockstep.
+            await asyncio.sleep(interval * random.random())
             while True:
+                if self._awaiting_ack:
+                    self._missed_heartbeat_acks += 1
+                    self._handle_zombie()
+                    return
+                self._awaiting_ack = True
                 await self._heartbeat()
-                await asyncio.sleep(
-                    self._heartbeat_interval / 1000
-                )  # Interval is in ms
+                self._expire_member_requests()
+                await asyncio.sleep(interval)
         except asyncio.CancelledError:
             logger.debug("Keep_alive task cancelled.")
         except Exception as e:
@@ -171,8 +479,95 @@ class GatewayClient:
             # Potentially trigger a reconnect here or notify client
             await self._client_instance.close_gateway(code=1000)  # Generic close
 
+    def _handle_zombie(self) -> None:
+        """Closes a connection whose heartbeats go unacknowledged and resumes."""
+        self._zombie_disconnects += 1
+        logger.warning(
+            "No HEARTBEAT_ACK received within %sms; closing zombie connection to resume session %s.",
+            self._heartbeat_interval,
+            self._session_id,
+        )
+        # Any close code other than 1000/1001 keeps the session resumable.
+        self._schedule_reconnect(4000)
+
+    async def _restore_session(self) -> None:
+        """Loads resume state saved by a previous process, if any."""
+        assert self._session_store is not None
+        try:
+            state = await self._session_store.load(self._shard_id or 0)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Failed to load stored gateway session: %s", e)
+            return
+        if state is None:
+            return
+        if state.shard_count != self._shard_count:
+            logger.info(
+                "Stored session was created for %s shards; identifying instead.",
+                state.shard_count,
+            )
+            return
+        self._session_id = state.session_id
+        self._last_sequence = state.sequence
+        self._resume_gateway_url = state.resume_gateway_url
+        self._session_user = state.user
+        self.restored_session = True
+        if state.application_id and not getattr(
+            self._client_instance, "application_id", None
+        ):
+            self._client_instance.application_id = state.application_id
+        if state.user and getattr(self._client_instance, "user", None) is None:
+            try:
+                self._client_instance.user = self._client_instance.parse_user(
+                    state.user
+                )
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Failed to restore bot user from session: %s", e)
+        logger.info(
+            "Restored session %s at sequence %s from session store.",
+            self._session_id,
+            self._last_sequence,
+        )
+
+    async def _persist_session(self, code: int) -> int:
+        """Saves or discards resume state on a final close.
+
+        Returns the close code to use: closing with 1000 or 1001 invalidates
+        the session on Discord's side, so a saved session is closed with 4000.
+        """
+        assert self._session_store is not None
+        shard_key = self._shard_id or 0
+        resumable = (
+            code != 4009
+            and self._session_id
+            and self._last_sequence is not None
+            and self._resume_gateway_url
+        )
+        try:
+            if not resumable:
+                await self._session_store.delete(shard_key)
+                return code
+            application_id = getattr(self._client_instance, "application_id", None)
+            await self._session_store.save(
+                shard_key,
+                SessionState(
+                    session_id=self._session_id,
+                    sequence=self._last_sequence,
+                    resume_gateway_url=self._resume_gateway_url,
+                    shard_count=self._shard_count,
+                    application_id=str(application_id) if application_id else None,
+                    user=self._session_user,
+                ),
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Failed to persist gateway session: %s", e)
+            return code
+        logger.info("Saved session %s for resume.", self._session_id)
+        return 4000 if code in (1000, 1001) else code
+
     async def _identify(self):
         """Sends the IDENTIFY payload to the Gateway."""
+        if self._identify_limiter is not None:
+            await self._identify_limiter.acquire(self._shard_id or 0)
         payload = {
             "op": GatewayOpcode.IDENTIFY,
             "d": {
@@ -189,6 +584,7 @@ class GatewayClient:
         if self._shard_id is not None and self._shard_count is not None:
             payload["d"]["shard"] = [self._shard_id, self._shard_count]
         await self._send_json(payload)
+        self.identified_event.set()
         logger.info("Sent IDENTIFY.")
 
     async def _resume(self):
@@ -207,6 +603,7 @@ class GatewayClient:
             },
         }
         await self._send_json(payload)
+        self.identified_event.set()
         logger.info(
             "Sent RESUME for session %s at sequence %s.",
             self._session_id,
@@ -259,6 +656,86 @@ class GatewayClient:
 
         await self._send_json(payload)
 
+    async def request_members(
+        self,
+        guild_ids: Union[str, int, Iterable[Union[str, int]]],
+        *,
+        query: str = "",
+        limit: int = 0,
+        presences: bool = False,
+        user_ids: Optional[List[str]] = None,
+        timeout: float = DEFAULT_CHUNK_TIMEOUT,
+        cache: bool = True,
+    ) -> MemberChunkStream:
+        """Requests the members of one or more guilds on this shard.
+
+        Returns a :class:`MemberChunkStream` yielding parsed members chunk by
+        chunk. Received members are added to the member cache unless
+        ``cache`` is ``False``.
+        """
+        if isinstance(guild_ids, (str, int)):
+            guild_ids = [guild_ids]
+        ids = list(dict.fromkeys(str(g) for g in guild_ids))
+        if not ids:
+            raise ValueError("At least one guild ID is required.")
+        stream = MemberChunkStream(uuid.uuid4().hex, ids, timeout=timeout, cache=cache)
+        await self.send_member_request(
+            stream,
+            ids,
+            query=query,
+            limit=limit,
+            presences=presences,
+            user_ids=user_ids,
+        )
+        return stream
+
+    async def send_member_request(
+        self, stream: MemberChunkStream, guild_ids: List[str], **options: Any
+    ) -> None:
+        """Registers ``stream`` and requests ``guild_ids`` under its nonce.
+
+        REQUEST_GUILD_MEMBERS takes a single guild, so one command is sent per
+        guild; the shared nonce routes every chunk to the same stream.
+        """
+        self._expire_member_requests()
+        self._member_chunk_requests[stream.nonce] = stream
+        try:
+            for guild_id in guild_ids:
+                await self.request_guild_members(guild_id, nonce=stream.nonce, **options)
+        except BaseException:
+            self._member_chunk_requests.pop(stream.nonce, None)
+            raise
+
+    def _handle_member_chunk(self, data: Dict[str, Any]) -> None:
+        stream = self._member_chunk_requests.get(data.get("nonce") or "")
+        if stream is None:
+            # Chunks nobody is waiting for still update the member cache.
+            parse_chunk_members(data, self._client_instance)
+        else:
+            stream.feed(data, self._client_instance)
+            if stream.done:
+                self._member_chunk_requests.pop(stream.nonce, None)
+        self._expire_member_requests()
+
+    def _expire_member_requests(self) -> None:
+        """Drops member requests that stopped receiving chunks."""
+        now = self._loop.time()
+        for nonce, stream in list(self._member_chunk_requests.items()):
+            if stream.done:
+                del self._member_chunk_requests[nonce]
+            elif stream.expired(now):
+                logger.warning("Member request %s timed out; dropping it.", nonce)
+                stream.fail(asyncio.TimeoutError())
+                del self._member_chunk_requests[nonce]
+
+    def _chunk_guild(self, data: Dict[str, Any]) -> None:
+        if self.chunker is None or data.get("unavailable") or "id" not in data:
+            return
+        member_count = data.get("member_count")
+        if member_count is not None and len(data.get("members") or ()) >= member_count:
+            return
+        self.chunker.enqueue(str(data["id"]))
+
     async def _handle_dispatch(self, data: Dict[str, Any]):
         """Handles DISPATCH events (actual Discord events)."""
         event_name = data.get("t")
@@ -280,6 +757,7 @@ class GatewayClient:
                 return
             self._session_id = raw_event_d_payload.get("session_id")
             self._resume_gateway_url = raw_event_d_payload.get("resume_gateway_url")
+            self._session_user = raw_event_d_payload.get("user")
 
             app_id_str = "N/A"
             # Store application_id on the client instance
@@ -340,7 +818,9 @@ class GatewayClient:
 
             if isinstance(raw_event_d_payload, dict) and self._shard_id is not None:
                 raw_event_d_payload["shard_id"] = self._shard_id
-            await self._dispatcher.dispatch(event_name, raw_event_d_payload)
+            self.ready_event.set()
+            await self._emit(event_name, raw_event_d_payload)
+            await self._emit("SHARD_READY", {"shard_id": self._shard_id})
 
             if (
                 getattr(self._client_instance, "sync_commands_on_ready", True)
@@ -349,22 +829,7 @@ class GatewayClient:
                 asyncio.create_task(self._client_instance.sync_application_commands())
         elif event_name == "GUILD_MEMBERS_CHUNK":
             if isinstance(raw_event_d_payload, dict):
-                nonce = raw_event_d_payload.get("nonce")
-                if nonce and nonce in self._member_chunk_requests:
-                    future = self._member_chunk_requests[nonce]
-                    if not future.done():
-                        # Append members to a temporary list stored on the future object
-                        if not hasattr(future, "_members"):
-                            future._members = []  # type: ignore
-                        future._members.extend(raw_event_d_payload.get("members", []))  # type: ignore
-
-                        # If this is the last chunk, resolve the future
-                        if (
-                            raw_event_d_payload.get("chunk_index")
-                            == raw_event_d_payload.get("chunk_count", 1) - 1
-                        ):
-                            future.set_result(future._members)  # type: ignore
-                            del self._member_chunk_requests[nonce]
+                self._handle_member_chunk(raw_event_d_payload)
 
         elif event_name == "INTERACTION_CREATE":
 
@@ -372,7 +837,7 @@ class GatewayClient:
                 interaction = Interaction(
                     data=raw_event_d_payload, client_instance=self._client_instance
                 )
-                await self._dispatcher.dispatch(
+                await self._emit(
                     "INTERACTION_CREATE", raw_event_d_payload
                 )
                 # Dispatch to a new client method that will then call AppCommandHandler
@@ -391,6 +856,12 @@ class GatewayClient:
                 )
         elif event_name == "RESUMED":
             logger.info("Gateway RESUMED successfully.")
+            self.ready_event.set()
+            if self.restored_session:
+                # This process never saw READY for the session it resumed.
+                client_ready = getattr(self._client_instance, "_ready_event", None)
+                if client_ready is not None:
+                    client_ready.set()
             # RESUMED 'd' payload is often an empty object or debug info.
             # Ensure it's a dict for the dispatcher.
             event_data_to_dispatch = (
@@ -398,8 +869,8 @@ class GatewayClient:
             )
             if isinstance(event_data_to_dispatch, dict) and self._shard_id is not None:
                 event_data_to_dispatch["shard_id"] = self._shard_id
-            await self._dispatcher.dispatch(event_name, event_data_to_dispatch)
-            await self._dispatcher.dispatch(
+            await self._emit(event_name, event_data_to_dispatch)
+            await self._emit(
                 "SHARD_RESUME", {"shard_id": self._shard_id}
             )
         elif event_name:
@@ -411,24 +882,26 @@ class GatewayClient:
             if isinstance(event_data_to_dispatch, dict) and self._shard_id is not None:
                 event_data_to_dispatch["shard_id"] = self._shard_id
 
-            await self._dispatcher.dispatch(event_name, event_data_to_dispatch)
+            await self._emit(event_name, event_data_to_dispatch)
+            if event_name == "GUILD_CREATE":
+                self._chunk_guild(event_data_to_dispatch)
         else:
             logger.warning("Received dispatch with no event name: %s", data)
 
     async def _process_message(self, msg: aiohttp.WSMessage):
         """Processes a single message from the WebSocket."""
+        if self._recorder is not None:
+            self._recorder.record(msg.type, msg.data)
+        received = time.perf_counter() if self.event_latency is not None else 0.0
         if msg.type == aiohttp.WSMsgType.TEXT:
             try:
-                data = json.loads(msg.data)
-            except json.JSONDecodeError:
+                data = self._json.loads(msg.data)
+            except ValueError:
                 logger.error("Failed to decode JSON from Gateway: %s", msg.data[:200])
                 return
         elif msg.type == aiohttp.WSMsgType.BINARY:
-            decompressed_data = await self._decompress_message(msg.data)
+            decompressed_data = await self._read_binary(msg.data)
             if decompressed_data is None:
-                logger.error(
-                    "Failed to decompress or decode binary message from Gateway."
-                )
                 return
             data = decompressed_data
         elif msg.type == aiohttp.WSMsgType.ERROR:
@@ -454,6 +927,8 @@ class GatewayClient:
             logger.warning("Received unhandled WebSocket message type: %s", msg.type)
             return
 
+        if self.event_latency is not None:
+            self._frame_times = (received, time.perf_counter())
         if self.verbose:
             logger.debug("GATEWAY RECV: %s", data)
         op = data.get("op")
@@ -467,7 +942,7 @@ class GatewayClient:
             logger.info(
                 "Gateway requested RECONNECT. Closing and will attempt to reconnect."
             )
-            await self.close(code=4000, reconnect=True)
+            self._schedule_reconnect(4000)
         elif op == GatewayOpcode.INVALID_SESSION:
             # The 'd' payload for INVALID_SESSION is a boolean indicating resumability
             can_resume = data.get("d") is True
@@ -478,7 +953,11 @@ class GatewayClient:
                 self._session_id = None  # Clear session_id to force re-identify
                 self._last_sequence = None
             # Close and reconnect. The connect logic will decide to resume or identify.
-            await self.close(code=4000 if can_resume else 4009, reconnect=True)
+            # Discord asks for a short random wait before identifying again.
+            self._schedule_reconnect(
+                4000 if can_resume else 4009,
+                delay=0.0 if can_resume else random.uniform(1, 5),
+            )
         elif op == GatewayOpcode.HELLO:
             hello_d_payload = data.get("d")
             if (
@@ -498,6 +977,7 @@ class GatewayClient:
             # Start heartbeating
             if self._keep_alive_task:
                 self._keep_alive_task.cancel()
+            self._awaiting_ack = False
             self._keep_alive_task = self._loop.create_task(self._keep_alive())
 
             # Identify or Resume
@@ -506,9 +986,15 @@ class GatewayClient:
                 await self._resume()
             else:
                 logger.info("Performing initial IDENTIFY.")
-                await self._identify()
+                if self._identify_limiter is not None:
+                    # Waiting for an identify slot must not stop the receive
+                    # loop from reading HEARTBEAT_ACKs.
+                    self._identify_task = self._loop.create_task(self._identify())
+                else:
+                    await self._identify()
         elif op == GatewayOpcode.HEARTBEAT_ACK:
             self._last_heartbeat_ack = time.monotonic()
+            self._awaiting_ack = False
         else:
             logger.warning(
                 "Received unhandled Gateway Opcode: %s with data: %s", op, data
@@ -522,8 +1008,9 @@ class GatewayClient:
             )
             return
 
+        ws = self._ws
         try:
-            async for msg in self._ws:
+            async for msg in ws:
                 await self._process_message(msg)
         except asyncio.CancelledError:
             logger.debug("Receive_loop task cancelled.")
@@ -531,11 +1018,26 @@ class GatewayClient:
             logger.warning(
                 "ClientConnectionError in receive_loop: %s. Attempting reconnect.", e
             )
-            await self.close(code=1006, reconnect=True)  # Abnormal closure
+            self._schedule_reconnect(1006)  # Abnormal closure
+        except DecompressionLimitExceeded as e:
+            logger.error("%s Closing the Gateway connection.", e)
+            self._loop.create_task(self.close(code=1009))
         except Exception as e:
             logger.error("Unexpected error in receive_loop: %s", e)
             traceback.print_exc()
-            await self.close(code=1011, reconnect=True)
+            self._schedule_reconnect(1011)
+        else:
+            # The server closed the socket without a RECONNECT.
+            if ws.close_code in FATAL_CLOSE_CODES:
+                logger.error(
+                    "Gateway closed the connection with fatal code %s.", ws.close_code
+                )
+            elif self._ws is ws:
+                logger.warning(
+                    "Gateway closed the connection (code %s). Attempting reconnect.",
+                    ws.close_code,
+                )
+                self._schedule_reconnect(4000)
         finally:
             logger.info("Receive_loop ended.")
             # If the loop ends unexpectedly (not due to explicit close),
@@ -547,11 +1049,17 @@ class GatewayClient:
             logger.warning("Gateway already connected or connecting.")
             return
 
+        if self._session_store is not None and not self._session_id:
+            await self._restore_session()
+
         gateway_url = (
             self._resume_gateway_url or (await self._http.get_gateway_bot())["url"]
         )
-        if not gateway_url.endswith("?v=10&encoding=json&compress=zlib-stream"):
-            gateway_url += "?v=10&encoding=json&compress=zlib-stream"
+        query = (
+            f"?v={GATEWAY_VERSION}&encoding={self._encoding}&compress={self._compress}"
+        )
+        if not gateway_url.endswith(query):
+            gateway_url += query
 
         logger.info("Connecting to Gateway: %s", gateway_url)
         try:
@@ -560,11 +1068,21 @@ class GatewayClient:
                 self._http._session is not None
             ), "HTTPClient session not initialized after ensure_session"
             self._ws = await self._http._session.ws_connect(gateway_url, max_msg_size=0)
+            # Every connection starts a new compression stream and send budget.
+            self._inflator.reset()
+            if self.send_limiter is not None:
+                self.send_limiter.reset()
+            if self._recorder is not None:
+                self._recorder.mark_connect()
             logger.info("Gateway WebSocket connection established.")
 
             if self._receive_task:
                 self._receive_task.cancel()
             self._receive_task = self._loop.create_task(self._receive_loop())
+            if self.dispatch_queue is not None and (
+                self._dispatch_task is None or self._dispatch_task.done()
+            ):
+                self._dispatch_task = self._loop.create_task(self._dispatch_loop())
 
             await self._dispatcher.dispatch(
                 "SHARD_CONNECT", {"shard_id": self._shard_id}
@@ -590,16 +1108,28 @@ class GatewayClient:
 
     async def close(self, code: int = 1000, *, reconnect: bool = False):
         """Closes the Gateway connection."""
+        if not reconnect and self._session_store is not None:
+            code = await self._persist_session(code)
         logger.info("Closing Gateway connection with code %s...", code)
+        current = asyncio.current_task(loop=self._loop)
+        if self._identify_task and not self._identify_task.done():
+            self._identify_task.cancel()
+        if (
+            not reconnect
+            and self._reconnect_task is not None
+            and self._reconnect_task is not current
+            and not self._reconnect_task.done()
+        ):
+            self._reconnect_task.cancel()
         if self._keep_alive_task and not self._keep_alive_task.done():
             self._keep_alive_task.cancel()
-            try:
-                await self._keep_alive_task
-            except asyncio.CancelledError:
-                pass
+            if self._keep_alive_task is not asyncio.current_task(loop=self._loop):
+                try:
+                    await self._keep_alive_task
+                except asyncio.CancelledError:
+                    pass
 
         if self._receive_task and not self._receive_task.done():
-            current = asyncio.current_task(loop=self._loop)
             self._receive_task.cancel()
             if self._receive_task is not current:
                 try:
@@ -612,6 +1142,27 @@ class GatewayClient:
             logger.info("Gateway WebSocket closed.")
 
         self._ws = None
+        if self._recorder is not None:
+            self._recorder.flush()
+        self.identified_event.clear()
+        self.ready_event.clear()
+
+        # Keep delivering queued events across reconnects; stop on a final close.
+        if not reconnect and self._dispatch_task and not self._dispatch_task.done():
+            self._dispatch_task.cancel()
+            try:
+                await self._dispatch_task
+            except asyncio.CancelledError:
+                pass
+            self._dispatch_task = None
+            if self.dispatch_queue is not None:
+                self.dispatch_queue.clear()
+        if not reconnect:
+            if self.chunker is not None:
+                await self.chunker.close()
+            for stream in self._member_chunk_requests.values():
+                stream.fail(GatewayException("Gateway connection closed."))
+            self._member_chunk_requests.clear()
         # Do not reset session_id, last_sequence, or resume_gateway_url here
         # if the close code indicates a resumable disconnect (e.g. 4000-4009, or server-initiated RECONNECT)
         # The connect logic will decide whether to resume or re-identify.
@@ -641,6 +1192,16 @@ class GatewayClient:
             return None
         return (self._last_heartbeat_ack - self._last_heartbeat_sent) * 1000
 
+    @property
+    def missed_heartbeat_acks(self) -> int:
+        """Number of heartbeats that were not acknowledged before the next one was due."""
+        return self._missed_heartbeat_acks
+
+    @property
+    def zombie_disconnects(self) -> int:
+        """Number of times the connection was closed as a zombie and resumed."""
+        return self._zombie_disconnects
+
     @property
     def last_heartbeat_sent(self) -> Optional[float]:
         return self._last_heartbeat_sent
@@ -5,13 +5,13 @@ HTTP client for interacting with the Discord REST API.
 import asyncio
 import logging
 import aiohttp  # pylint: disable=import-error
-import json
 from urllib.parse import quote
 from typing import Optional, Dict, Any, Union, TYPE_CHECKING, List
 
 from .errors import *  # Import all custom exceptions
 from . import __version__  # For User-Agent
 from .rate_limiter import RateLimiter
+from .json_codec import JSONCodec, get_codec
 from .interactions import InteractionResponsePayload
 
 if TYPE_CHECKING:
@@ -259,6 +259,8 @@ class HTTPClient:
         token: str,
         client_session: Optional[aiohttp.ClientSession] = None,
         verbose: bool = False,
+        json_codec: Optional[Union[str, JSONCodec]] = None,
+        base_url: str = API_BASE_URL,
         **session_kwargs: Any,
     ):
         """Create a new HTTP client.
@@ -271,17 +273,26 @@ class HTTPClient:
             Optional existing :class:`aiohttp.ClientSession`.
         verbose:
             If ``True``, log HTTP requests and responses.
+        json_codec:
+            JSON backend used to encode request bodies and decode responses.
+            Accepts a :class:`~disagreement.json_codec.JSONCodec` or a backend
+            name; defaults to the fastest installed backend.
+        base_url:
+            Root URL of the REST API, e.g. a
+            :class:`~disagreement.fake_discord.FakeDiscord` server in tests.
         **session_kwargs:
             Additional options forwarded to :class:`aiohttp.ClientSession`, such
             as ``proxy`` or ``connector``.
         """
 
         self.token = token
+        self.base_url: str = base_url.rstrip("/")
         self._session: Optional[aiohttp.ClientSession] = client_session
         self._session_kwargs: Dict[str, Any] = session_kwargs
         self.user_agent = f"DiscordBot (https://github.com/Slipstreamm/disagreement, {__version__})"  # Customize URL
 
         self.verbose = verbose
+        self._json: JSONCodec = get_codec(json_codec)
 
         self._rate_limiter = RateLimiter()
 
@@ -309,14 +320,14 @@ class HTTPClient:
         """Makes an HTTP request to the Discord API."""
         await self._ensure_session()
 
-        url = f"{API_BASE_URL}{endpoint}"
+        url = f"{self.base_url}{endpoint}"
         final_headers: Dict[str, str] = {  # Renamed to final_headers
             "User-Agent": self.user_agent,
         }
         if use_auth_header:
             final_headers["Authorization"] = f"Bot {self.token}"
 
-        if is_json and payload:
+        if is_json and payload is not None:
             final_headers["Content-Type"] = "application/json"
 
         if custom_headers:  # Merge custom headers
@@ -333,14 +344,17 @@ class HTTPClient:
 
         route = f"{method.upper()}:{endpoint}"
 
+        body: Any = payload
+        if is_json and payload is not None:
+            body = self._json.dumps_bytes(payload)
+
         for attempt in range(5):  # Max 5 retries for rate limits
             await self._rate_limiter.acquire(route)
             assert self._session is not None, "ClientSession not initialized"
             async with self._session.request(
                 method,
                 url,
-                json=payload if is_json else None,
-                data=payload if not is_json else None,
+                data=body,
                 headers=final_headers,
                 params=params,
             ) as response:
@@ -350,13 +364,13 @@ class HTTPClient:
                     if response.headers.get("Content-Type", "").startswith(
                         "application/json"
                     ):
-                        data = await response.json()
+                        data = await response.json(loads=self._json.loads)
                     else:
                         # For non-JSON responses, like fetching images or other files
                         # We might return the raw response or handle it differently
                         # For now, let's assume most API calls expect JSON
                         data = await response.text()
-                except (aiohttp.ContentTypeError, json.JSONDecodeError):
+                except (aiohttp.ContentTypeError, ValueError):
                     data = (
                         await response.text()
                     )  # Fallback to text if JSON parsing fails
@@ -526,7 +540,9 @@ class HTTPClient:
         if all_files:
             form = aiohttp.FormData()
             form.add_field(
-                "payload_json", json.dumps(payload), content_type="application/json"
+                "payload_json",
+                self._json.dumps(payload),
+                content_type="application/json",
             )
             for idx, f in enumerate(all_files):
                 form.add_field(
@@ -888,7 +904,9 @@ class HTTPClient:
         if all_files:
             form = aiohttp.FormData()
             form.add_field(
-                "payload_json", json.dumps(payload), content_type="application/json"
+                "payload_json",
+                self._json.dumps(payload),
+                content_type="application/json",
             )
             for idx, f in enumerate(all_files):
                 form.add_field(
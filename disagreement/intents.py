@@ -0,0 +1,273 @@
+"""Deriving the smallest set of Gateway intents a client needs.
+
+Every intent a bot subscribes to makes Discord send the matching events,
+whether or not anything handles them. With ``Client(auto_intents=True)`` the
+intents sent in IDENTIFY are computed when the client connects from:
+
+- registered event listeners, batch listeners and open ``wait_for`` calls,
+  including those of loaded cogs,
+- prefix commands, which need message events and their content,
+- :class:`~disagreement.caching.MemberCacheFlags` that only keep some members,
+  a bounded message cache and chunking guilds at startup.
+
+Application commands, components and modals arrive as ``INTERACTION_CREATE``,
+which needs no intent. :class:`IntentReport` records which feature needs
+which intent so the choice can be logged and checked.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .enums import GatewayIntent
+
+if TYPE_CHECKING:
+    from .client import Client
+
+logger = logging.getLogger(__name__)
+
+_MESSAGES = GatewayIntent.GUILD_MESSAGES | GatewayIntent.DIRECT_MESSAGES
+_REACTIONS = (
+    GatewayIntent.GUILD_MESSAGE_REACTIONS | GatewayIntent.DIRECT_MESSAGE_REACTIONS
+)
+
+# Intents under which Discord sends each Gateway event. Events that are sent
+# for guilds and DMs need both intents to be received everywhere. Events not
+# listed here, such as READY or INTERACTION_CREATE, are always sent.
+EVENT_INTENTS: Dict[str, int] = {
+    **dict.fromkeys(
+        (
+            "GUILD_CREATE",
+            "GUILD_UPDATE",
+            "GUILD_DELETE",
+            "GUILD_ROLE_CREATE",
+            "GUILD_ROLE_UPDATE",
+            "GUILD_ROLE_DELETE",
+            "CHANNEL_CREATE",
+            "CHANNEL_UPDATE",
+            "CHANNEL_DELETE",
+            "THREAD_CREATE",
+            "THREAD_UPDATE",
+            "THREAD_DELETE",
+            "THREAD_LIST_SYNC",
+            "THREAD_MEMBER_UPDATE",
+            "STAGE_INSTANCE_CREATE",
+            "STAGE_INSTANCE_UPDATE",
+            "STAGE_INSTANCE_DELETE",
+        ),
+        GatewayIntent.GUILDS,
+    ),
+    "THREAD_MEMBERS_UPDATE": GatewayIntent.GUILDS | GatewayIntent.GUILD_MEMBERS,
+    **dict.fromkeys(
+        ("GUILD_MEMBER_ADD", "GUILD_MEMBER_UPDATE", "GUILD_MEMBER_REMOVE"),
+        GatewayIntent.GUILD_MEMBERS,
+    ),
+    **dict.fromkeys(
+        ("GUILD_AUDIT_LOG_ENTRY_CREATE", "GUILD_BAN_ADD", "GUILD_BAN_REMOVE"),
+        GatewayIntent.GUILD_MODERATION,
+    ),
+    **dict.fromkeys(
+        ("GUILD_EMOJIS_UPDATE", "GUILD_STICKERS_UPDATE"),
+        GatewayIntent.GUILD_EMOJIS_AND_STICKERS,
+    ),
+    **dict.fromkeys(
+        (
+            "GUILD_INTEGRATIONS_UPDATE",
+            "INTEGRATION_CREATE",
+            "INTEGRATION_UPDATE",
+            "INTEGRATION_DELETE",
+        ),
+        GatewayIntent.GUILD_INTEGRATIONS,
+    ),
+    "WEBHOOKS_UPDATE": GatewayIntent.GUILD_WEBHOOKS,
+    "INVITE_CREATE": GatewayIntent.GUILD_INVITES,
+    "INVITE_DELETE": GatewayIntent.GUILD_INVITES,
+    "VOICE_STATE_UPDATE": GatewayIntent.GUILD_VOICE_STATES,
+    "PRESENCE_UPDATE": GatewayIntent.GUILD_PRESENCES,
+    **dict.fromkeys(("MESSAGE_CREATE", "MESSAGE_UPDATE", "MESSAGE_DELETE"), _MESSAGES),
+    "MESSAGE_DELETE_BULK": GatewayIntent.GUILD_MESSAGES,
+    "CHANNEL_PINS_UPDATE": GatewayIntent.GUILDS | GatewayIntent.DIRECT_MESSAGES,
+    **dict.fromkeys(
+        (
+            "MESSAGE_REACTION_ADD",
+            "MESSAGE_REACTION_REMOVE",
+            "MESSAGE_REACTION_REMOVE_ALL",
+            "MESSAGE_REACTION_REMOVE_EMOJI",
+        ),
+        _REACTIONS,
+    ),
+    "TYPING_START": GatewayIntent.GUILD_MESSAGE_TYPING
+    | GatewayIntent.DIRECT_MESSAGE_TYPING,
+    **dict.fromkeys(
+        (
+            "GUILD_SCHEDULED_EVENT_CREATE",
+            "GUILD_SCHEDULED_EVENT_UPDATE",
+            "GUILD_SCHEDULED_EVENT_DELETE",
+            "GUILD_SCHEDULED_EVENT_USER_ADD",
+            "GUILD_SCHEDULED_EVENT_USER_REMOVE",
+        ),
+        GatewayIntent.GUILD_SCHEDULED_EVENTS,
+    ),
+    **dict.fromkeys(
+        (
+            "AUTO_MODERATION_RULE_CREATE",
+            "AUTO_MODERATION_RULE_UPDATE",
+            "AUTO_MODERATION_RULE_DELETE",
+        ),
+        GatewayIntent.AUTO_MODERATION_CONFIGURATION,
+    ),
+    "AUTO_MODERATION_ACTION_EXECUTION": GatewayIntent.AUTO_MODERATION_EXECUTION,
+}
+
+PRIVILEGED_INTENTS: int = (
+    GatewayIntent.GUILD_MEMBERS
+    | GatewayIntent.GUILD_PRESENCES
+    | GatewayIntent.MESSAGE_CONTENT
+)
+
+
+def _split(intents: int) -> List[GatewayIntent]:
+    return [intent for intent in GatewayIntent if intents & intent]
+
+
+class IntentReport:
+    """Intents a client needs and the features that need them.
+
+    Parameters
+    ----------
+    extra:
+        Intents to include whether or not anything needs them.
+    limit:
+        Upper bound for the required intents. Required intents outside it are
+        left out and logged. ``None`` allows every intent.
+    """
+
+    def __init__(self, extra: int = 0, limit: Optional[int] = None) -> None:
+        self.extra: int = int(extra)
+        self.limit: Optional[int] = None if limit is None else int(limit)
+        self.reasons: Dict[GatewayIntent, List[str]] = {}
+
+    def __repr__(self) -> str:
+        names = "|".join(i.name for i in _split(self.intents)) or "none"
+        return f"<IntentReport intents={names}>"
+
+    def require(self, intents: int, reason: str) -> None:
+        """Record that ``reason`` needs every intent in ``intents``."""
+
+        for intent in _split(intents):
+            reasons = self.reasons.setdefault(intent, [])
+            if reason not in reasons:
+                reasons.append(reason)
+
+    @property
+    def required(self) -> int:
+        """Intents needed by registered features."""
+
+        value = 0
+        for intent in self.reasons:
+            value |= intent
+        return value
+
+    @property
+    def intents(self) -> int:
+        """Intents to identify with: the required ones within ``limit`` plus
+        ``extra``."""
+
+        required = self.required
+        if self.limit is not None:
+            required &= self.limit
+        return required | self.extra
+
+    def unused(self, intents: int) -> List[GatewayIntent]:
+        """Intents in ``intents`` that nothing registered consumes."""
+
+        return _split(intents & ~self.required)
+
+    def missing(self, intents: int) -> List[Tuple[GatewayIntent, List[str]]]:
+        """Required intents absent from ``intents``, with their reasons."""
+
+        return [
+            (intent, self.reasons[intent])
+            for intent in _split(self.required & ~intents)
+        ]
+
+    def log(self) -> None:
+        """Log the derived intents, their reasons, required intents left out by
+        ``limit`` and unused extra intents."""
+
+        for intent, reasons in self.reasons.items():
+            privileged = " (privileged)" if intent & PRIVILEGED_INTENTS else ""
+            logger.info(
+                "Intent %s%s needed by: %s", intent.name, privileged, ", ".join(reasons)
+            )
+        if self.limit is not None:
+            for intent, reasons in self.missing(self.limit | self.extra):
+                logger.warning(
+                    "Intent %s is needed by %s but is not in the allowed intents.",
+                    intent.name,
+                    ", ".join(reasons),
+                )
+        for intent in self.unused(self.extra):
+            logger.warning(
+                "Intent %s is subscribed but no listener, command or cache uses it.",
+                intent.name,
+            )
+
+
+def derive_intents(
+    client: "Client", extra: int = 0, limit: Optional[int] = None
+) -> IntentReport:
+    """Compute the intents needed by what is registered on ``client``.
+
+    Parameters
+    ----------
+    client:
+        Client whose listeners, commands and cache settings are inspected.
+    extra:
+        Intents to include regardless, e.g. for events that are only awaited
+        with ``wait_for`` after the client connected.
+    limit:
+        Intents the client may subscribe to at most, or ``None``.
+    """
+
+    report = IntentReport(extra, limit)
+    report.require(GatewayIntent.GUILDS, "guild, channel and role caches")
+
+    for event_name, kind, callback in client._event_dispatcher.consumers():
+        if callback == client._process_message_for_commands:
+            continue  # covered by the prefix commands check below
+        if event_name.startswith("RAW_"):
+            event_name = event_name[4:]
+        intents = EVENT_INTENTS.get(event_name)
+        if intents:
+            name = getattr(callback, "__qualname__", None) or repr(callback)
+            reason = kind if callback is None else f"{kind} {name}"
+            report.require(intents, f"{reason} ({event_name})")
+
+    from .ext.commands.help import HelpCommand
+
+    if any(
+        not isinstance(command, HelpCommand)
+        for command in client.command_handler.commands.values()
+    ):
+        report.require(_MESSAGES, "prefix commands")
+        report.require(GatewayIntent.MESSAGE_CONTENT, "prefix commands")
+
+    flags = client.member_cache_flags
+    if not flags.all_enabled:
+        # MemberCacheFlags.all() caches whatever members arrive; only flags
+        # that select members depend on the events describing them.
+        if flags.joined:
+            report.require(GatewayIntent.GUILD_MEMBERS, "member cache flag 'joined'")
+        if flags.voice:
+            report.require(
+                GatewayIntent.GUILD_VOICE_STATES, "member cache flag 'voice'"
+            )
+        if flags.online:
+            report.require(GatewayIntent.GUILD_PRESENCES, "member cache flag 'online'")
+    if client.message_cache_maxlen:
+        report.require(_MESSAGES, "message cache")
+    if client.chunk_guilds_at_startup:
+        report.require(GatewayIntent.GUILD_MEMBERS, "chunk_guilds_at_startup")
+    return report
@@ -0,0 +1,169 @@
+"""Pluggable JSON backends used by the HTTP and Gateway clients."""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+JSONInput = Union[str, bytes, bytearray, memoryview]
+
+
+class JSONCodec(ABC):
+    """Base class for JSON encoders and decoders.
+
+    Subclasses must implement :meth:`loads` and :meth:`dumps_bytes`. All
+    decoding errors are raised as :class:`ValueError` so callers do not need to
+    know which backend is in use.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    def loads(self, data: JSONInput) -> Any:
+        """Decode ``data`` into Python objects."""
+
+    @abstractmethod
+    def dumps_bytes(self, obj: Any, *, indent: bool = False) -> bytes:
+        """Encode ``obj`` into UTF-8 encoded JSON."""
+
+    def dumps(self, obj: Any, *, indent: bool = False) -> str:
+        """Encode ``obj`` into a JSON string."""
+        return self.dumps_bytes(obj, indent=indent).decode("utf-8")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r}>"
+
+
+class StdlibJSONCodec(JSONCodec):
+    """Codec backed by the standard library :mod:`json` module."""
+
+    name = "json"
+
+    def loads(self, data: JSONInput) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, obj: Any, *, indent: bool = False) -> str:
+        if indent:
+            return json.dumps(obj, indent=2)
+        return json.dumps(obj, separators=(",", ":"))
+
+    def dumps_bytes(self, obj: Any, *, indent: bool = False) -> bytes:
+        return self.dumps(obj, indent=indent).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by :mod:`orjson`."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data: JSONInput) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps_bytes(self, obj: Any, *, indent: bool = False) -> bytes:
+        options = self._options
+        if indent:
+            options |= self._orjson.OPT_INDENT_2
+        return self._orjson.dumps(obj, option=options)
+
+
+class MsgspecCodec(JSONCodec):
+    """Codec backed by :mod:`msgspec`."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def loads(self, data: JSONInput) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def dumps_bytes(self, obj: Any, *, indent: bool = False) -> bytes:
+        encoded = self._encoder.encode(obj)
+        if indent:
+            return self._msgspec.json.format(encoded, indent=2)
+        return encoded
+
+
+_CODECS: Dict[str, Type[JSONCodec]] = {
+    "json": StdlibJSONCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+# Order in which backends are tried when ``"auto"`` is requested.
+_AUTO_ORDER = ("orjson", "msgspec", "json")
+
+_instances: Dict[str, JSONCodec] = {}
+
+
+def available_codecs() -> list[str]:
+    """Return the names of the JSON backends importable in this environment."""
+
+    names = []
+    for name in _CODECS:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(codec: Optional[Union[str, JSONCodec]] = "auto") -> JSONCodec:
+    """Resolve ``codec`` into a :class:`JSONCodec` instance.
+
+    Parameters
+    ----------
+    codec:
+        Either an existing codec instance, the name of a backend (``"json"``,
+        ``"orjson"`` or ``"msgspec"``), or ``"auto"``/``None`` to use the
+        fastest installed backend and fall back to the standard library.
+
+    Raises
+    ------
+    ValueError
+        If ``codec`` is not a known backend name.
+    ImportError
+        If a specific backend is requested but is not installed.
+    """
+
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    name = (codec or "auto").lower()
+    if name == "stdlib":
+        name = "json"
+
+    if name == "auto":
+        for candidate in _AUTO_ORDER:
+            try:
+                return get_codec(candidate)
+            except ImportError:
+                continue
+
+    if name not in _CODECS:
+        raise ValueError(
+            f"Unknown JSON codec {codec!r}. Expected one of: auto, {', '.join(_CODECS)}."
+        )
+
+    instance = _instances.get(name)
+    if instance is None:
+        instance = _CODECS[name]()
+        _instances[name] = instance
+    return instance
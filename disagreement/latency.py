@@ -0,0 +1,198 @@
+"""End-to-end latency of Gateway events.
+
+When enabled with ``Client(track_event_latency=True)``, every dispatched event
+is timed from the moment its frame was read off the socket:
+
+``decode``
+    Inflating and decoding the frame.
+``queue``
+    From decoded until the :class:`~disagreement.event_dispatcher.EventDispatcher`
+    picks the event up, including time spent in the dispatch queue.
+``parse``
+    Building models and updating caches in the event's parser.
+``total``
+    From arrival until every listener returned. With concurrent listeners it
+    ends once the listener tasks were started.
+
+Each listener's own run time is recorded separately, so a slow cog shows up
+under its own name. Durations are aggregated into fixed-size
+:class:`LatencyHistogram` objects per event type.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+# Timing of the event being dispatched; listener tasks inherit it.
+current_timing: ContextVar[Optional["EventTiming"]] = ContextVar(
+    "current_timing", default=None
+)
+
+
+class LatencyHistogram:
+    """Histogram of durations in seconds with logarithmic buckets.
+
+    Bucket bounds grow by ``2 ** 0.25`` (about 19%) from one microsecond up
+    to roughly an hour, so percentiles are accurate to one bucket and the
+    memory used does not grow with the number of samples.
+    """
+
+    BASE = 1e-6
+    GROWTH = 2**0.25
+    BUCKETS = 128
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    _log_growth = math.log(GROWTH)
+
+    def __init__(self) -> None:
+        self.counts: list[int] = [0] * self.BUCKETS
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= self.BASE:
+            index = 0
+        else:
+            index = math.ceil(math.log(seconds / self.BASE) / self._log_growth)
+            if index >= self.BUCKETS:
+                index = self.BUCKETS - 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (0-1)."""
+
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index == self.BUCKETS - 1:
+                    break  # overflow bucket has no upper bound
+                return min(self.BASE * self.GROWTH**index, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class EventTiming:
+    """Timestamps of one event on its way to the listeners."""
+
+    __slots__ = ("tracker", "event_name", "received", "decoded", "started")
+
+    def __init__(
+        self,
+        tracker: "EventLatencyTracker",
+        event_name: str,
+        received: float,
+        decoded: float,
+    ) -> None:
+        self.tracker = tracker
+        self.event_name = event_name
+        self.received = received
+        self.decoded = decoded
+        self.started = 0.0
+
+    def dispatched(self) -> None:
+        """Mark the dispatcher picking the event up."""
+
+        self.started = time.perf_counter()
+        record = self.tracker.record
+        record(self.event_name, "decode", self.decoded - self.received)
+        record(self.event_name, "queue", self.started - self.decoded)
+
+    def finish(self) -> None:
+        self.tracker.record(
+            self.event_name, "total", time.perf_counter() - self.received
+        )
+
+
+class TimedEvent:
+    """Event data waiting in a dispatch queue together with its timing."""
+
+    __slots__ = ("data", "timing")
+
+    def __init__(self, data: Any, timing: EventTiming) -> None:
+        self.data = data
+        self.timing = timing
+
+
+class EventLatencyTracker:
+    """Per-event-type latency histograms shared by all shards of a client."""
+
+    def __init__(self) -> None:
+        self.events: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self.listeners: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def begin(self, event_name: str, received: float, decoded: float) -> EventTiming:
+        return EventTiming(self, event_name, received, decoded)
+
+    def record(self, event_name: str, stage: str, seconds: float) -> None:
+        stages = self.events.get(event_name)
+        if stages is None:
+            stages = self.events[event_name] = {}
+        histogram = stages.get(stage)
+        if histogram is None:
+            histogram = stages[stage] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_listener(self, event_name: str, listener: Any, seconds: float) -> None:
+        name = getattr(listener, "__qualname__", None) or repr(listener)
+        key = (event_name, name)
+        histogram = self.listeners.get(key)
+        if histogram is None:
+            histogram = self.listeners[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Summaries keyed by event type and stage.
+
+        Listener run times appear as ``"listener:<qualified name>"`` stages.
+        All durations are in seconds.
+        """
+
+        report: Dict[str, Dict[str, Dict[str, float]]] = {
+            event_name: {stage: h.summary() for stage, h in stages.items()}
+            for event_name, stages in self.events.items()
+        }
+        for (event_name, name), histogram in self.listeners.items():
+            report.setdefault(event_name, {})[f"listener:{name}"] = histogram.summary()
+        return report
+
+    def slowest_listeners(self, limit: int = 10) -> list[Tuple[str, str, float]]:
+        """``(event, listener, p99)`` of the listeners with the highest p99."""
+
+        ranked = sorted(
+            (
+                (event_name, name, histogram.percentile(0.99))
+                for (event_name, name), histogram in self.listeners.items()
+            ),
+            key=lambda item: item[2],
+            reverse=True,
+        )
+        return ranked[:limit]
+
+    def reset(self) -> None:
+        self.events.clear()
+        self.listeners.clear()
@@ -0,0 +1,260 @@
+"""Streaming of ``GUILD_MEMBERS_CHUNK`` responses.
+
+Discord answers REQUEST_GUILD_MEMBERS with up to 1000 members per
+``GUILD_MEMBERS_CHUNK`` dispatch. A :class:`MemberChunkStream` parses every
+chunk into :class:`~disagreement.models.Member` objects as soon as it arrives,
+adds them to the member cache and hands the batch to whoever iterates the
+stream, so a large guild never has to sit in memory as raw payloads::
+
+    async for members in await client.request_members(guild_ids):
+        ...
+
+:class:`GuildChunker` chunks guilds as their ``GUILD_CREATE`` arrives, with a
+limit on how many requests are in flight per shard.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .gateway import GatewayClient
+    from .models import Member
+
+logger = logging.getLogger(__name__)
+
+# Seconds a request may go without receiving a chunk before it is abandoned.
+DEFAULT_CHUNK_TIMEOUT = 60.0
+
+_END = object()
+
+
+class MemberChunkStream:
+    """Async iterator over the members returned for one member request.
+
+    Each iteration yields the members of one ``GUILD_MEMBERS_CHUNK``. Iteration
+    ends once every requested guild sent its last chunk and raises
+    :class:`asyncio.TimeoutError` if no chunk arrives for ``timeout`` seconds.
+
+    Parameters
+    ----------
+    nonce:
+        Nonce sent with the request and echoed back in every chunk.
+    guild_ids:
+        Guilds the request covers.
+    timeout:
+        Seconds to wait for the next chunk.
+    cache:
+        Whether received members are added to the client's member cache.
+    """
+
+    def __init__(
+        self,
+        nonce: str,
+        guild_ids: Iterable[str],
+        *,
+        timeout: float = DEFAULT_CHUNK_TIMEOUT,
+        cache: bool = True,
+    ) -> None:
+        self.nonce: str = nonce
+        self.guild_ids: Tuple[str, ...] = tuple(guild_ids)
+        self.timeout: float = timeout
+        self.cache: bool = cache
+        self.received: int = 0
+        self.not_found: List[str] = []
+        self.done: bool = False
+        self._loop = asyncio.get_running_loop()
+        self.last_activity: float = self._loop.time()
+        # Chunks still expected per guild; ``None`` until the first one arrives.
+        self._pending: Dict[str, Optional[int]] = {g: None for g in self.guild_ids}
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue()
+
+    def __repr__(self) -> str:
+        return (
+            f"<MemberChunkStream nonce={self.nonce!r} guilds={len(self.guild_ids)} "
+            f"received={self.received} done={self.done}>"
+        )
+
+    def expired(self, now: float) -> bool:
+        return not self.done and now - self.last_activity > self.timeout
+
+    def feed(self, data: Dict[str, Any], client: "Client") -> None:
+        """Parse one ``GUILD_MEMBERS_CHUNK`` payload into the stream."""
+
+        if self.done:
+            return
+        self.last_activity = self._loop.time()
+        guild_id = str(data.get("guild_id"))
+        members = parse_chunk_members(data, client, cache=self.cache)
+        self.received += len(members)
+        self.not_found.extend(str(u) for u in data.get("not_found") or ())
+        if members:
+            self._queue.put_nowait(members)
+
+        if guild_id in self._pending:
+            left = self._pending[guild_id]
+            if left is None:
+                left = int(data.get("chunk_count", 1))
+            self._pending[guild_id] = left - 1
+        if all(left is not None and left <= 0 for left in self._pending.values()):
+            self._finish(_END)
+
+    def fail(self, exc: BaseException) -> None:
+        """End the stream with ``exc``, raised by the next iteration."""
+
+        if not self.done:
+            self._finish(exc)
+
+    def _finish(self, item: Any) -> None:
+        self.done = True
+        self._queue.put_nowait(item)
+
+    def __aiter__(self) -> "MemberChunkStream":
+        return self
+
+    async def __anext__(self) -> List["Member"]:
+        if self.done and self._queue.empty():
+            raise StopAsyncIteration
+        try:
+            item = await asyncio.wait_for(self._queue.get(), self.timeout)
+        except asyncio.TimeoutError:
+            self.done = True
+            raise
+        if item is _END:
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def flatten(self) -> List["Member"]:
+        """Collect the remaining members into a single list."""
+
+        members: List["Member"] = []
+        async for batch in self:
+            members.extend(batch)
+        return members
+
+
+def parse_chunk_members(
+    data: Dict[str, Any], client: "Client", *, cache: bool = True
+) -> List["Member"]:
+    """Parse the members of a ``GUILD_MEMBERS_CHUNK`` payload."""
+
+    from .models import Member
+
+    guild_id = str(data.get("guild_id"))
+    statuses = {
+        str(p.get("user", {}).get("id")): p.get("status")
+        for p in data.get("presences") or ()
+    }
+    members = []
+    for raw in data.get("members") or ():
+        # Merged before parsing, as in Client.parse_guild, so the member cache
+        # flags see the member's presence.
+        status = statuses.get(str(raw.get("user", {}).get("id")))
+        if status is not None:
+            raw["status"] = status
+        if cache:
+            member = client.parse_member(raw, guild_id)
+        else:
+            member = Member(raw, client_instance=client)
+            member.guild_id = guild_id
+        members.append(member)
+    return members
+
+
+class GuildChunker:
+    """Requests the members of guilds as they become available.
+
+    Guild IDs passed to :meth:`enqueue` are requested in batches of up to
+    ``batch_size`` guilds, with at most ``concurrency`` requests in flight.
+
+    Parameters
+    ----------
+    gateway:
+        Shard the guilds belong to.
+    concurrency:
+        Requests that may be in flight at once.
+    batch_size:
+        Guilds covered by one request.
+    timeout:
+        Seconds a request may go without a chunk before it is abandoned.
+    """
+
+    def __init__(
+        self,
+        gateway: "GatewayClient",
+        *,
+        concurrency: int = 2,
+        batch_size: int = 5,
+        timeout: float = DEFAULT_CHUNK_TIMEOUT,
+    ) -> None:
+        self.gateway: "GatewayClient" = gateway
+        self.batch_size: int = max(1, batch_size)
+        self.timeout: float = timeout
+        self.chunked: Set[str] = set()
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._requests: Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Guilds waiting for a request slot."""
+        return self._queue.qsize()
+
+    def enqueue(self, guild_id: str) -> None:
+        if guild_id in self.chunked:
+            return
+        self.chunked.add(guild_id)
+        self._queue.put_nowait(guild_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._semaphore.acquire()
+            task = asyncio.get_running_loop().create_task(self._chunk(batch))
+            self._requests.add(task)
+            task.add_done_callback(self._requests.discard)
+
+    async def _chunk(self, guild_ids: List[str]) -> None:
+        try:
+            stream = await self.gateway.request_members(
+                guild_ids, timeout=self.timeout
+            )
+            async for _ in stream:
+                pass
+            logger.debug(
+                "Chunked %s members of %s guilds.", stream.received, len(guild_ids)
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Member chunk request for guilds %s timed out.", guild_ids)
+            # Allow a later GUILD_CREATE to try again.
+            self.chunked.difference_update(guild_ids)
+        except Exception as e:  # noqa: BLE001
+            logger.error("Member chunk request for guilds %s failed: %s", guild_ids, e)
+            self.chunked.difference_update(guild_ids)
+        finally:
+            self._semaphore.release()
+
+    async def close(self) -> None:
+        tasks = [t for t in (self._task, *self._requests) if t is not None]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._requests.clear()
+        self.chunked.clear()
+        while not self._queue.empty():
+            self._queue.get_nowait()
@@ -0,0 +1,563 @@
+"""Column-oriented member storage for very large guilds.
+
+A :class:`~disagreement.cache.MemberCache` keeps one
+:class:`~disagreement.models.Member` per member, each with its own ID string,
+avatar URL, role list and user fields. :class:`ColumnarMemberStore` keeps the
+same data as parallel columns instead:
+
+* member IDs in an unsigned 64-bit array,
+* the role IDs of each member as an index into a table of distinct, interned
+  role tuples, since most members share one of a few role sets,
+* ``bot``, ``deaf``, ``mute`` and ``pending`` as bits of one byte,
+* the presence status as a small integer,
+* join times as microseconds and avatar hashes as two 64-bit halves,
+* rarely set fields, and values that do not fit a column, in a sparse mapping.
+
+Looking a member up returns a :class:`MemberView`, a
+:class:`~disagreement.models.Member` whose attributes read and write the
+columns. The array columns support the buffer protocol, so bulk scans such as
+role membership or online counts can also run over them with ``numpy``::
+
+    ids = numpy.frombuffer(store.ids, dtype=numpy.uint64)
+
+Clients enable the store for guilds from a given size with
+``Client(member_store_threshold=...)``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import sys
+from array import array
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .cache import MemberCache, estimate_size
+from .caching import MemberCacheFlags
+from .models import Member
+
+if TYPE_CHECKING:
+    from .client import Client
+
+# Status codes; anything else is stored as -1 with the string kept aside.
+STATUSES: Tuple[Optional[str], ...] = (None, "online", "idle", "dnd", "offline")
+_STATUS_CODES: Dict[Optional[str], int] = {s: i for i, s in enumerate(STATUSES)}
+_ACTIVE_CODES = (_STATUS_CODES["online"], _STATUS_CODES["idle"], _STATUS_CODES["dnd"])
+
+# Bits of the ``flag_bits`` column.
+BOT = 1 << 0
+DEAF = 1 << 1
+MUTE = 1 << 2
+PENDING = 1 << 3
+_FLAG_NAMES = {"bot": BOT, "deaf": DEAF, "mute": MUTE, "pending": PENDING}
+# The avatar is a packed hash on the user or guild CDN path. Without either
+# bit it is ``None`` or a URL kept in the sparse mapping.
+_USER_AVATAR = 1 << 4
+_GUILD_AVATAR = 1 << 5
+_ANIMATED_AVATAR = 1 << 6
+_AVATAR_BITS = _USER_AVATAR | _GUILD_AVATAR | _ANIMATED_AVATAR
+
+_CDN = "https://cdn.discordapp.com"
+_LOW_64 = (1 << 64) - 1
+
+# ``joined_at`` value for times kept in the sparse mapping or missing.
+_NO_TIME = -(1 << 63)
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+_TEXT_FIELDS = ("username", "discriminator", "nick")
+# Fields most members do not have, kept per member ID only when set.
+_SPARSE_FIELDS = frozenset(
+    {"premium_since", "permissions", "communication_disabled_until", "voice_state"}
+)
+# Member attributes copied into the store by :meth:`ColumnarMemberStore.set`.
+FIELDS = (
+    _TEXT_FIELDS
+    + tuple(_FLAG_NAMES)
+    + ("joined_at", "roles", "status", "_avatar")
+    + tuple(sorted(_SPARSE_FIELDS))
+)
+
+
+def _pack_time(text: Optional[str]) -> Optional[int]:
+    """Microseconds since the epoch if ``text`` formats back identically."""
+
+    if not text:
+        return None
+    try:
+        when = datetime.datetime.fromisoformat(text)
+        micros = (when - _EPOCH) // _MICROSECOND
+    except (TypeError, ValueError):
+        return None
+    # Discord's usual layout always round-trips; skip formatting it again.
+    if (
+        len(text) == 32
+        and text[10] == "T"
+        and text[19] == "."
+        and text.endswith("+00:00")
+    ):
+        return micros
+    return micros if _format_time(micros) == text else None
+
+
+def _format_time(micros: int) -> str:
+    return (_EPOCH + micros * _MICROSECOND).isoformat(timespec="microseconds")
+
+
+class ColumnarMemberStore(MemberCache):
+    """Member cache of one guild stored as parallel columns.
+
+    Supports the lookups of :class:`~disagreement.cache.MemberCache` and
+    respects its :class:`~disagreement.caching.MemberCacheFlags`, but has no
+    TTL, ``maxlen`` or byte limit. Member IDs must be snowflakes.
+
+    Views returned by :meth:`get` and :meth:`values` stay attached to the
+    store: assigning to their attributes, or changing their ``roles`` list in
+    place, updates the stored member. See :class:`MemberView` for what cannot
+    be changed.
+    """
+
+    def __init__(
+        self,
+        guild_id: str,
+        flags: MemberCacheFlags,
+        client_instance: Optional["Client"] = None,
+    ) -> None:
+        super().__init__(flags)
+        self.guild_id = str(guild_id)
+        self._client = client_instance
+        self._rows: Dict[int, int] = {}
+        self.ids = array("Q")
+        self.status_codes = array("b")
+        self.flag_bits = array("B")
+        # Index into ``role_sets`` per member.
+        self.role_set_ids = array("I")
+        self.joined_at = array("q")
+        self.avatar_high = array("Q")
+        self.avatar_low = array("Q")
+        self.role_sets: List[Tuple[str, ...]] = []
+        self._role_set_index: Dict[Tuple[str, ...], int] = {}
+        self.columns: Dict[str, List[Optional[str]]] = {
+            name: [] for name in _TEXT_FIELDS
+        }
+        self._sparse: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def set(self, key: str, value: Member) -> None:
+        if not self._should_cache(value):
+            return
+        member_id = int(key)
+        row = self._rows.get(member_id)
+        if row is None:
+            row = self._rows[member_id] = len(self.ids)
+            self.ids.append(member_id)
+            for column in self._arrays()[1:]:
+                column.append(0)
+            for text_column in self.columns.values():
+                text_column.append(None)
+        # Same as calling _store() for every field, unrolled since this runs
+        # for every member of a GUILD_CREATE or member chunk.
+        sparse = {
+            name: getattr(value, name)
+            for name in _SPARSE_FIELDS
+            if getattr(value, name, None) is not None
+        }
+        columns = self.columns
+        columns["username"][row] = value.username
+        discriminator = value.discriminator
+        columns["discriminator"][row] = (
+            sys.intern(discriminator) if discriminator else discriminator
+        )
+        columns["nick"][row] = value.nick
+        avatar = value._avatar
+        avatar_bits = self._pack_avatar(member_id, row, avatar)
+        if avatar and not avatar_bits:
+            sparse["_avatar"] = avatar
+        self.flag_bits[row] = (
+            (BOT if value.bot else 0)
+            | (DEAF if value.deaf else 0)
+            | (MUTE if value.mute else 0)
+            | (PENDING if value.pending else 0)
+            | avatar_bits
+        )
+        self.role_set_ids[row] = self._intern_roles(value.roles)
+        status = value.status
+        code = _STATUS_CODES.get(status, -1)
+        self.status_codes[row] = code
+        if code < 0:
+            sparse["status"] = status
+        micros = _pack_time(value.joined_at)
+        if micros is None:
+            micros = _NO_TIME
+            if value.joined_at is not None:
+                sparse["joined_at"] = value.joined_at
+        self.joined_at[row] = micros
+        if sparse:
+            self._sparse[member_id] = sparse
+        else:
+            self._sparse.pop(member_id, None)
+
+    def get(self, key: str) -> Optional[Member]:
+        try:
+            member_id = int(key)
+        except (TypeError, ValueError):
+            return None
+        if member_id not in self._rows:
+            return None
+        return MemberView(self, member_id)
+
+    def invalidate(self, key: str) -> None:
+        try:
+            member_id = int(key)
+        except (TypeError, ValueError):
+            return
+        row = self._rows.pop(member_id, None)
+        if row is None:
+            return
+        self._sparse.pop(member_id, None)
+        columns = self._arrays() + list(self.columns.values())
+        last = len(self.ids) - 1
+        if row != last:
+            # Move the last member into the freed row.
+            self._rows[self.ids[last]] = row
+            for column in columns:
+                column[row] = column[last]
+        for column in columns:
+            column.pop()
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._sparse.clear()
+        for column in self._arrays() + list(self.columns.values()):
+            del column[:]
+
+    def values(self) -> List[Member]:
+        return [MemberView(self, member_id) for member_id in self.ids]
+
+    def expire(self, limit: Optional[int] = None) -> int:
+        return 0
+
+    def add_budget(self, budget: Any) -> None:
+        raise TypeError("ColumnarMemberStore does not support memory budgets.")
+
+    def memory_usage(self) -> int:
+        return estimate_size(
+            [
+                self._rows,
+                self._arrays(),
+                self.role_sets,
+                self._role_set_index,
+                self.columns,
+                self._sparse,
+            ]
+        )
+
+    # Bulk queries
+
+    def count_status(self, status: Optional[str]) -> int:
+        """Number of members with presence ``status``."""
+
+        code = _STATUS_CODES.get(status)
+        if code is not None:
+            return self.status_codes.count(code)
+        return sum(
+            1 for fields in self._sparse.values() if fields.get("status") == status
+        )
+
+    @property
+    def online_count(self) -> int:
+        """Number of members that are online, idle or do not disturb."""
+
+        counts = Counter(self.status_codes)
+        return sum(counts[code] for code in _ACTIVE_CODES)
+
+    def status_counts(self) -> Dict[Optional[str], int]:
+        """Number of members per presence status."""
+
+        counts: Dict[Optional[str], int] = {}
+        for code, count in Counter(self.status_codes).items():
+            if code >= 0:
+                counts[STATUSES[code]] = count
+        for fields in self._sparse.values():
+            status = fields.get("status")
+            if status is not None:
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def role_counts(self) -> Dict[str, int]:
+        """Number of members per role ID."""
+
+        counts: Dict[str, int] = {}
+        for index, count in Counter(self.role_set_ids).items():
+            for role_id in self.role_sets[index]:
+                counts[role_id] = counts.get(role_id, 0) + count
+        return counts
+
+    def with_role(self, role_id: str) -> List[Member]:
+        """Members that have the role ``role_id``."""
+
+        matching = {
+            index for index, roles in enumerate(self.role_sets) if role_id in roles
+        }
+        if not matching:
+            return []
+        ids = self.ids
+        return [
+            MemberView(self, ids[row])
+            for row, index in enumerate(self.role_set_ids)
+            if index in matching
+        ]
+
+    # Column access used by MemberView
+
+    def _arrays(self) -> List[Any]:
+        return [
+            self.ids,
+            self.status_codes,
+            self.flag_bits,
+            self.role_set_ids,
+            self.joined_at,
+            self.avatar_high,
+            self.avatar_low,
+        ]
+
+    def _read(self, member_id: int, name: str) -> Any:
+        row = self._rows.get(member_id)
+        if row is None:
+            raise AttributeError(f"Member {member_id} is no longer cached.")
+        if name in self.columns:
+            return self.columns[name][row]
+        if name in _FLAG_NAMES:
+            return bool(self.flag_bits[row] & _FLAG_NAMES[name])
+        if name == "roles":
+            return list(self.role_sets[self.role_set_ids[row]])
+        if name == "status":
+            code = self.status_codes[row]
+            if code >= 0:
+                return STATUSES[code]
+        elif name == "joined_at":
+            micros = self.joined_at[row]
+            if micros != _NO_TIME:
+                return _format_time(micros)
+        elif name == "_avatar":
+            bits = self.flag_bits[row]
+            if bits & (_USER_AVATAR | _GUILD_AVATAR):
+                return self._avatar_url(member_id, row, bits)
+        return self._sparse.get(member_id, {}).get(name)
+
+    def _write(self, member_id: int, name: str, value: Any) -> None:
+        row = self._rows.get(member_id)
+        if row is None:
+            raise AttributeError(f"Member {member_id} is no longer cached.")
+        if name not in FIELDS:
+            raise AttributeError(f"{name!r} cannot be changed on a stored member.")
+        self._store(member_id, row, name, value)
+
+    def _store(self, member_id: int, row: int, name: str, value: Any) -> None:
+        if name in self.columns:
+            if name == "discriminator" and value:
+                value = sys.intern(value)
+            self.columns[name][row] = value
+            return
+        if name in _FLAG_NAMES:
+            bit = _FLAG_NAMES[name]
+            bits = self.flag_bits[row]
+            self.flag_bits[row] = bits | bit if value else bits & ~bit
+            return
+        if name == "roles":
+            self.role_set_ids[row] = self._intern_roles(value)
+            return
+        # The rest fall back to the sparse mapping for values without a
+        # column representation.
+        if name == "status":
+            code = _STATUS_CODES.get(value, -1)
+            self.status_codes[row] = code
+            if code >= 0:
+                value = None
+        elif name == "joined_at":
+            micros = _pack_time(value)
+            self.joined_at[row] = _NO_TIME if micros is None else micros
+            if micros is not None:
+                value = None
+        elif name == "_avatar":
+            bits = self._pack_avatar(member_id, row, value)
+            self.flag_bits[row] = self.flag_bits[row] & ~_AVATAR_BITS | bits
+            if bits:
+                value = None
+        self._set_sparse(member_id, name, value)
+
+    def _set_sparse(self, member_id: int, name: str, value: Any) -> None:
+        fields = self._sparse.get(member_id)
+        if value is not None:
+            if fields is None:
+                fields = self._sparse[member_id] = {}
+            fields[name] = value
+        elif fields is not None and fields.pop(name, None) is not None and not fields:
+            del self._sparse[member_id]
+
+    def _intern_roles(self, roles: Optional[List[str]]) -> int:
+        key = tuple(roles or ())
+        index = self._role_set_index.get(key)
+        if index is None:
+            key = tuple(sys.intern(str(role_id)) for role_id in key)
+            index = self._role_set_index[key] = len(self.role_sets)
+            self.role_sets.append(key)
+        return index
+
+    def _pack_avatar(self, member_id: int, row: int, url: Optional[str]) -> int:
+        """Store the hash of a CDN avatar ``url`` and return its flag bits.
+
+        Returns ``0`` when ``url`` is not a recognised avatar URL.
+        """
+
+        if not url or not url.endswith(".png"):
+            return 0
+        user_prefix = f"{_CDN}/avatars/{member_id}/"
+        guild_prefix = f"{_CDN}/guilds/{self.guild_id}/users/{member_id}/avatars/"
+        if url.startswith(user_prefix):
+            bits, avatar_hash = _USER_AVATAR, url[len(user_prefix) : -4]
+        elif url.startswith(guild_prefix):
+            bits, avatar_hash = _GUILD_AVATAR, url[len(guild_prefix) : -4]
+        else:
+            return 0
+        if avatar_hash.startswith("a_"):
+            bits |= _ANIMATED_AVATAR
+            avatar_hash = avatar_hash[2:]
+        try:
+            packed = int(avatar_hash, 16)
+        except ValueError:
+            return 0
+        if len(avatar_hash) != 32 or f"{packed:032x}" != avatar_hash:
+            return 0
+        self.avatar_high[row] = packed >> 64
+        self.avatar_low[row] = packed & _LOW_64
+        return bits
+
+    def _avatar_url(self, member_id: int, row: int, bits: int) -> str:
+        packed = self.avatar_high[row] << 64 | self.avatar_low[row]
+        avatar_hash = f"{'a_' if bits & _ANIMATED_AVATAR else ''}{packed:032x}"
+        if bits & _USER_AVATAR:
+            return f"{_CDN}/avatars/{member_id}/{avatar_hash}.png"
+        return (
+            f"{_CDN}/guilds/{self.guild_id}/users/{member_id}/avatars/{avatar_hash}.png"
+        )
+
+
+class _RoleList(list):
+    """``MemberView.roles``; changes made in place are written to the store."""
+
+    __slots__ = ("_view",)
+
+    def __init__(self, view: "MemberView", roles: List[str]) -> None:
+        super().__init__(roles)
+        self._view = view
+
+
+def _writes_back(name: str) -> Any:
+    method = getattr(list, name)
+
+    def wrapper(self: _RoleList, *args: Any) -> Any:
+        result = method(self, *args)
+        view = self._view
+        view._store._write(view._member_id, "roles", self)
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_RoleList, _name, _writes_back(_name))
+
+
+def _column(name: str) -> property:
+    def fget(self: "MemberView") -> Any:
+        return self._store._read(self._member_id, name)
+
+    def fset(self: "MemberView", value: Any) -> None:
+        self._store._write(self._member_id, name, value)
+
+    return property(fget, fset)
+
+
+def _fixed(name: str, fget: Any) -> property:
+    """A view attribute set by the store; assigning its current value is a
+    no-op and anything else raises :class:`AttributeError`."""
+
+    def fset(self: "MemberView", value: Any) -> None:
+        if value != fget(self):
+            raise AttributeError(f"{name!r} of a stored member cannot be changed.")
+
+    return property(fget, fset)
+
+
+class MemberView(Member):
+    """A :class:`~disagreement.models.Member` backed by a
+    :class:`ColumnarMemberStore` row.
+
+    Reading an attribute reads the store and assigning to one writes it, and
+    ``roles`` writes back changes made to the list in place. Unlike a
+    :class:`~disagreement.models.Member`:
+
+    * ``id``, ``guild_id`` and ``_client`` come from the store and raise
+      :class:`AttributeError` when set to a different value,
+    * a view of a member that was removed from the store raises
+      :class:`AttributeError` on access.
+
+    Views are cheap to create and not cached; two views of one member compare
+    equal.
+    """
+
+    __slots__ = ("_store", "_member_id")
+
+    def __init__(self, store: ColumnarMemberStore, member_id: int) -> None:
+        self._store = store
+        self._member_id = member_id
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Member) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    id = _fixed("id", lambda self: str(self._member_id))
+    guild_id = _fixed("guild_id", lambda self: self._store.guild_id)
+    _client = _fixed("_client", lambda self: self._store._client)
+
+    @property
+    def roles(self) -> List[str]:  # type: ignore[override]
+        return _RoleList(self, self._store._read(self._member_id, "roles"))
+
+    @roles.setter
+    def roles(self, value: List[str]) -> None:
+        self._store._write(self._member_id, "roles", value)
+
+    username = _column("username")
+    discriminator = _column("discriminator")
+    nick = _column("nick")
+    joined_at = _column("joined_at")
+    status = _column("status")
+    bot = _column("bot")
+    deaf = _column("deaf")
+    mute = _column("mute")
+    pending = _column("pending")
+    _avatar = _column("_avatar")
+    premium_since = _column("premium_since")
+    permissions = _column("permissions")
+    communication_disabled_until = _column("communication_disabled_until")
+    voice_state = _column("voice_state")
@@ -57,6 +57,7 @@ if TYPE_CHECKING:
     from .typing import Typing
     from .shard_manager import Shard
     from .asset import Asset
+    from .member_chunks import MemberChunkStream
 
     # Forward reference Message if it were used in type hints before its definition
     # from .models import Message # Not needed as Message is defined before its use in TextChannel.send etc.
@@ -66,6 +67,8 @@ if TYPE_CHECKING:
 class HashableById:
     """Mixin providing equality and hashing based on the ``id`` attribute."""
 
+    __slots__ = ()
+
     id: str
 
     def __eq__(self, other: object) -> bool:
@@ -78,6 +81,8 @@ class HashableById:
 class User(HashableById):
     """Represents a Discord User."""
 
+    __slots__ = ("_client", "id", "username", "discriminator", "bot", "_avatar")
+
     def __init__(self, data: dict, client_instance: Optional["Client"] = None) -> None:
         self._client = client_instance
         if "id" not in data and "user" in data:
@@ -152,6 +157,20 @@ class Message(HashableById):
         attachments (List[Attachment]): Attachments included with the message.
     """
 
+    __slots__ = (
+        "_client",
+        "id",
+        "channel_id",
+        "guild_id",
+        "author",
+        "content",
+        "timestamp",
+        "edited_timestamp",
+        "components",
+        "attachments",
+        "pinned",
+    )
+
     def __init__(self, data: dict, client_instance: "Client"):
         self._client: "Client" = (
             client_instance  # Store reference to client for methods like reply
@@ -675,6 +694,19 @@ class Embed:
 class Attachment:
     """Represents a message attachment."""
 
+    __slots__ = (
+        "id",
+        "filename",
+        "description",
+        "content_type",
+        "size",
+        "url",
+        "proxy_url",
+        "height",
+        "width",
+        "ephemeral",
+    )
+
     def __init__(self, data: Dict[str, Any]):
         self.id: str = data["id"]
         self.filename: str = data["filename"]
@@ -793,6 +825,8 @@ class AllowedMentions:
 class RoleTags:
     """Represents tags for a role."""
 
+    __slots__ = ("bot_id", "integration_id", "premium_subscriber")
+
     def __init__(self, data: Dict[str, Any]):
         self.bot_id: Optional[str] = data.get("bot_id")
         self.integration_id: Optional[str] = data.get("integration_id")
@@ -814,6 +848,20 @@ class RoleTags:
 class Role:
     """Represents a Discord Role."""
 
+    __slots__ = (
+        "id",
+        "name",
+        "color",
+        "hoist",
+        "_icon",
+        "unicode_emoji",
+        "position",
+        "permissions",
+        "managed",
+        "mentionable",
+        "tags",
+    )
+
     def __init__(self, data: Dict[str, Any]):
         self.id: str = data["id"]
         self.name: str = data["name"]
@@ -865,12 +913,29 @@ class Member(User):  # Member inherits from User
     This class combines User attributes with guild-specific Member attributes.
     """
 
+    __slots__ = (
+        "guild_id",
+        "status",
+        "voice_state",
+        "nick",
+        "roles",
+        "joined_at",
+        "premium_since",
+        "deaf",
+        "mute",
+        "pending",
+        "permissions",
+        "communication_disabled_until",
+        "_just_joined",
+    )
+
     def __init__(
         self, data: Dict[str, Any], client_instance: Optional["Client"] = None
     ):
         self._client: Optional["Client"] = client_instance
         self.guild_id: Optional[str] = None
-        self.status: Optional[str] = None
+        # Set from the presence merged in by Client.parse_guild, if any.
+        self.status: Optional[str] = data.get("status")
         self.voice_state: Optional[Dict[str, Any]] = None
         # User part is nested under 'user' key in member data from gateway/API
         user_data = data.get("user", {})
@@ -1285,6 +1350,56 @@ class Guild(HashableById):
         category_channels (List[CategoryChannel]): List of category channels in this guild.
     """
 
+    __slots__ = (
+        "_client",
+        "_shard_id",
+        "id",
+        "name",
+        "_icon",
+        "_splash",
+        "_discovery_splash",
+        "owner",
+        "owner_id",
+        "permissions",
+        "afk_channel_id",
+        "afk_timeout",
+        "widget_enabled",
+        "widget_channel_id",
+        "verification_level",
+        "default_message_notifications",
+        "explicit_content_filter",
+        "roles",
+        "emojis",
+        "features",
+        "mfa_level",
+        "application_id",
+        "system_channel_id",
+        "system_channel_flags",
+        "rules_channel_id",
+        "max_members",
+        "vanity_url_code",
+        "description",
+        "_banner",
+        "premium_tier",
+        "premium_subscription_count",
+        "preferred_locale",
+        "public_updates_channel_id",
+        "max_video_channel_users",
+        "approximate_member_count",
+        "approximate_presence_count",
+        "welcome_screen",
+        "nsfw_level",
+        "stickers",
+        "premium_progress_bar_enabled",
+        "_channels",
+        "_members",
+        "_threads",
+        "text_channels",
+        "voice_channels",
+        "category_channels",
+        "_scheduled_events",
+    )
+
     def __init__(
         self,
         data: Dict[str, Any],
@@ -1392,9 +1507,21 @@ class Guild(HashableById):
 
         # Internal caches, populated by events or specific fetches
         self._channels: ChannelCache = ChannelCache()
-        self._members: MemberCache = MemberCache(
-            getattr(client_instance, "member_cache_flags", MemberCacheFlags())
+        member_flags = getattr(
+            client_instance, "member_cache_flags", MemberCacheFlags()
         )
+        threshold = getattr(client_instance, "member_store_threshold", None)
+        if isinstance(threshold, int) and (data.get("member_count") or 0) >= threshold:
+            from .member_store import ColumnarMemberStore
+
+            self._members: MemberCache = ColumnarMemberStore(
+                self.id, member_flags, client_instance
+            )
+        else:
+            self._members = MemberCache(member_flags)
+            attach_budget = getattr(client_instance, "_attach_cache_budget", None)
+            if attach_budget is not None:
+                attach_budget(self._members, "members")
         self._threads: Dict[str, "Thread"] = {}
         self.text_channels: List["TextChannel"] = []
         self.voice_channels: List["VoiceChannel"] = []
@@ -1415,8 +1542,9 @@ class Guild(HashableById):
         manager = getattr(self._client, "_shard_manager", None)
         if not manager:
             return None
-        if 0 <= self._shard_id < len(manager.shards):
-            return manager.shards[self._shard_id]
+        for shard in manager.shards:
+            if shard.id == self._shard_id:
+                return shard
         return None
 
     def get_channel(self, channel_id: str) -> Optional["Channel"]:
@@ -1566,25 +1694,26 @@ class Guild(HashableById):
         DisagreementException
             The gateway is not available to make the request.
         asyncio.TimeoutError
-            The request timed out.
+            No member chunk arrived for 60 seconds.
         """
-        if not self._client._gateway:
-            raise DisagreementException("Gateway not available for member fetching.")
+        stream = await self._client.request_members(self.id, limit=limit or 0)
+        return await stream.flatten()
 
-        nonce = str(asyncio.get_running_loop().time())
-        future = self._client._gateway._loop.create_future()
-        self._client._gateway._member_chunk_requests[nonce] = future
+    async def chunk(self, **options: Any) -> "MemberChunkStream":
+        """|coro|
 
-        try:
-            await self._client._gateway.request_guild_members(
-                self.id, limit=limit or 0, nonce=nonce
-            )
-            member_data = await asyncio.wait_for(future, timeout=60.0)
-            return [Member(m, self._client) for m in member_data]
-        except asyncio.TimeoutError:
-            if nonce in self._client._gateway._member_chunk_requests:
-                del self._client._gateway._member_chunk_requests[nonce]
-            raise
+        Requests this guild's members and returns a stream of them.
+
+        Iterating the stream yields a list of members per chunk as Discord
+        sends them; received members are cached. ``options`` are passed to
+        :meth:`Client.request_members`.
+
+        Returns
+        -------
+        MemberChunkStream
+            Async iterator over the member chunks.
+        """
+        return await self._client.request_members(self.id, **options)
 
     async def prune_members(self, days: int, *, compute_count: bool = True) -> int:
         """|coro| Remove inactive members from the guild.
@@ -1664,6 +1793,18 @@ class Guild(HashableById):
 class Channel(HashableById):
     """Base class for Discord channels."""
 
+    __slots__ = (
+        "_client",
+        "id",
+        "_type_val",
+        "guild_id",
+        "name",
+        "position",
+        "permission_overwrites",
+        "nsfw",
+        "parent_id",
+    )
+
     def __init__(self, data: Dict[str, Any], client_instance: "Client"):
         self._client: "Client" = client_instance
         self.id: str = data["id"]
@@ -1770,6 +1911,8 @@ class Channel(HashableById):
 class Messageable:
     """Mixin for channels that can send messages and show typing."""
 
+    __slots__ = ()
+
     _client: "Client"
     id: str
 
@@ -1808,6 +1951,14 @@ class Messageable:
 class TextChannel(Channel, Messageable):
     """Represents a guild text channel or announcement channel."""
 
+    __slots__ = (
+        "topic",
+        "last_message_id",
+        "rate_limit_per_user",
+        "default_auto_archive_duration",
+        "last_pin_timestamp",
+    )
+
     def __init__(self, data: Dict[str, Any], client_instance: "Client"):
         super().__init__(data, client_instance)
         self.topic: Optional[str] = data.get("topic")
@@ -1970,6 +2121,8 @@ class TextChannel(Channel, Messageable):
 class VoiceChannel(Channel):
     """Represents a guild voice channel or stage voice channel."""
 
+    __slots__ = ("bitrate", "user_limit", "rtc_region", "video_quality_mode")
+
     def __init__(self, data: Dict[str, Any], client_instance: "Client"):
         super().__init__(data, client_instance)
         self.bitrate: int = data.get("bitrate", 64000)
@@ -1984,6 +2137,8 @@ class VoiceChannel(Channel):
 class StageChannel(VoiceChannel):
     """Represents a guild stage channel."""
 
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return f"<StageChannel id='{self.id}' name='{self.name}' guild_id='{self.guild_id}'>"
 
@@ -2063,6 +2218,8 @@ class StageInstance:
 class CategoryChannel(Channel):
     """Represents a guild category channel."""
 
+    __slots__ = ()
+
     def __init__(self, data: Dict[str, Any], client_instance: "Client"):
         super().__init__(data, client_instance)
 
@@ -2105,6 +2262,14 @@ class ThreadMetadata:
 class Thread(TextChannel):  # Threads are a specialized TextChannel
     """Represents a Discord Thread."""
 
+    __slots__ = (
+        "owner_id",
+        "message_count",
+        "member_count",
+        "thread_metadata",
+        "member",
+    )
+
     def __init__(self, data: Dict[str, Any], client_instance: "Client"):
         super().__init__(data, client_instance)  # Handles common text channel fields
         self.owner_id: Optional[str] = data.get("owner_id")
@@ -2167,6 +2332,8 @@ class Thread(TextChannel):  # Threads are a specialized TextChannel
 class DMChannel(Channel, Messageable):
     """Represents a Direct Message channel."""
 
+    __slots__ = ("last_message_id", "recipients")
+
     def __init__(self, data: Dict[str, Any], client_instance: "Client"):
         super().__init__(data, client_instance)
         self.last_message_id: Optional[str] = data.get("last_message_id")
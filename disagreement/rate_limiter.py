@@ -1,10 +1,16 @@
-"""Asynchronous rate limiter for Discord HTTP requests."""
+"""Asynchronous rate limiters for Discord HTTP requests and Gateway sessions."""
 
 from __future__ import annotations
 
 import asyncio
 import time
-from typing import Dict, Mapping
+from collections import deque
+from typing import Deque, Dict, Mapping, Optional
+
+from .enums import GatewayOpcode
+
+# Discord allows ``max_concurrency`` IDENTIFYs per this many seconds.
+IDENTIFY_WINDOW = 5.0
 
 
 class _Bucket:
@@ -73,3 +79,176 @@ class RateLimiter:
     async def _lift_global(self, delay: float) -> None:
         await asyncio.sleep(delay)
         self._global_event.set()
+
+
+class IdentifyLimiter:
+    """Paces Gateway IDENTIFY payloads according to the session start limit.
+
+    Shards are grouped into ``shard_id % max_concurrency`` buckets and each
+    bucket may identify once per ``window`` seconds. ``remaining`` tracks the
+    session starts left, as reported by ``GET /gateway/bot``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 1,
+        window: float = IDENTIFY_WINDOW,
+        remaining: Optional[int] = None,
+    ) -> None:
+        self.max_concurrency: int = max(1, max_concurrency)
+        self.window: float = window
+        self.remaining: Optional[int] = remaining
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._next_at: Dict[int, float] = {}
+
+    def bucket_for(self, shard_id: int) -> int:
+        return shard_id % self.max_concurrency
+
+    async def acquire(self, shard_id: int) -> None:
+        """Wait until ``shard_id`` may send an IDENTIFY."""
+
+        bucket = self.bucket_for(shard_id)
+        lock = self._locks.get(bucket)
+        if lock is None:
+            lock = self._locks[bucket] = asyncio.Lock()
+        async with lock:
+            delay = self._next_at.get(bucket, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_at[bucket] = time.monotonic() + self.window
+            if self.remaining is not None:
+                self.remaining -= 1
+
+
+# Discord closes connections that send more than this many commands per minute.
+GATEWAY_SEND_LIMIT = 120
+GATEWAY_SEND_WINDOW = 60.0
+
+# HEARTBEAT, IDENTIFY and RESUME keep the session alive and skip the queue.
+CRITICAL_GATEWAY_OPCODES = frozenset(
+    {GatewayOpcode.HEARTBEAT, GatewayOpcode.IDENTIFY, GatewayOpcode.RESUME}
+)
+
+
+class GatewaySendLimiter:
+    """Token bucket for commands sent over a Gateway connection.
+
+    ``limit`` tokens refill evenly over ``window`` seconds. Critical opcodes
+    (heartbeats, IDENTIFY and RESUME) may use the whole bucket; every other
+    command leaves ``reserved`` tokens untouched and waits in a per-opcode
+    queue. Queues are served round-robin, so a burst of member requests does
+    not hold back presence or voice state updates.
+    """
+
+    def __init__(
+        self,
+        limit: int = GATEWAY_SEND_LIMIT,
+        window: float = GATEWAY_SEND_WINDOW,
+        reserved: int = 5,
+    ) -> None:
+        if reserved >= limit:
+            raise ValueError("reserved must be smaller than limit.")
+        self.limit: int = limit
+        self.window: float = window
+        self.reserved: int = reserved
+        self._rate: float = limit / window
+        self._tokens: float = float(limit)
+        self._updated: float = time.monotonic()
+        self._lanes: Dict[int, Deque[asyncio.Future]] = {}
+        self._lane_order: Deque[int] = deque()
+        self._pump_task: Optional[asyncio.Task] = None
+
+        self.sent: int = 0
+        self.queued: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of commands waiting for a token."""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def reset(self) -> None:
+        """Refill the bucket; each new connection starts with a full limit."""
+        self._tokens = float(self.limit)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.limit), self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _delay_until(self, floor: float) -> float:
+        """Seconds until more than ``floor`` tokens are available."""
+        self._refill()
+        missing = floor + 1 - self._tokens
+        return max(0.0, missing / self._rate)
+
+    async def acquire(self, opcode: Optional[int]) -> None:
+        """Wait until a command with ``opcode`` may be sent."""
+
+        if opcode in CRITICAL_GATEWAY_OPCODES:
+            delay = self._delay_until(0)
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._delay_until(0)
+            self._tokens -= 1
+            self.sent += 1
+            return
+
+        if not self.queue_depth and self._delay_until(self.reserved) == 0:
+            self._tokens -= 1
+            self.sent += 1
+            return
+
+        key = opcode if opcode is not None else -1
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = deque()
+            self._lane_order.append(key)
+        lane.append(future)
+        self.queued += 1
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.get_running_loop().create_task(self._pump())
+
+        start = time.monotonic()
+        await future
+        waited = time.monotonic() - start
+        self.total_wait += waited
+        if waited > self.max_wait:
+            self.max_wait = waited
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        for _ in range(len(self._lane_order)):
+            key = self._lane_order[0]
+            lane = self._lanes[key]
+            while lane and lane[0].done():
+                lane.popleft()  # cancelled while queued
+            if not lane:
+                self._lane_order.popleft()
+                del self._lanes[key]
+                continue
+            self._lane_order.rotate(-1)
+            return lane.popleft()
+        return None
+
+    async def _pump(self) -> None:
+        while self.queue_depth:
+            delay = self._delay_until(self.reserved)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            future = self._next_waiter()
+            if future is None:
+                break
+            self._tokens -= 1
+            self.sent += 1
+            future.set_result(None)
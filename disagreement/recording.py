@@ -0,0 +1,180 @@
+"""Recording of raw Gateway traffic.
+
+A :class:`GatewayRecorder` stores every frame a shard receives exactly as it
+came off the socket, still transport-compressed, together with its arrival
+time. Frames are written by a background thread so disk I/O never blocks the
+event loop. :func:`disagreement.replay.replay` feeds recordings back through a
+client without a network connection.
+
+File format: the magic ``DGREC1\\n``, a little-endian ``uint32`` length and a
+JSON metadata object, followed by records of a ``<dBI`` header (seconds since
+the recording started, frame kind, payload length) and the payload.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+from .json_codec import JSONCodec, get_codec
+
+MAGIC = b"DGREC1\n"
+
+FRAME_TEXT = 0
+FRAME_BINARY = 1
+# Written when a new connection starts, so replay resets the inflater.
+FRAME_CONNECT = 2
+
+_LENGTH = struct.Struct("<I")
+_RECORD = struct.Struct("<dBI")
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Queue item asking the writer thread to flush the file.
+_FLUSH = object()
+
+
+@dataclass
+class RecordedFrame:
+    offset: float
+    kind: int
+    data: bytes
+
+
+class GatewayRecorder:
+    """Appends received Gateway frames to a recording file.
+
+    :meth:`record` only timestamps the frame and queues it; a writer thread
+    started with the first frame does the file I/O.
+
+    Parameters
+    ----------
+    path:
+        File to write. An existing file is overwritten when the first frame
+        is recorded.
+    metadata:
+        Stored in the file header. :class:`~disagreement.gateway.GatewayClient`
+        adds its encoding, transport compression and shard before the header
+        is written, so replay can match them.
+    json_codec:
+        Codec used to encode the header. Accepts the same values as
+        :func:`~disagreement.json_codec.get_codec`.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        metadata: Optional[Dict[str, Any]] = None,
+        json_codec: Union[str, JSONCodec, None] = "auto",
+    ):
+        self.path: str = os.fspath(path)
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+        self.json_codec: JSONCodec = get_codec(json_codec)
+        self.frames: int = 0
+        self._start: float = 0.0
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed: bool = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _start_writer(self) -> None:
+        self.metadata.setdefault("recorded_at", time.time())
+        header = self.json_codec.dumps_bytes(self.metadata)
+        self._start = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run_writer,
+            args=(header,),
+            name=f"disagreement-recorder-{os.path.basename(self.path)}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run_writer(self, header: bytes) -> None:
+        with open(self.path, "wb") as fp:
+            fp.write(MAGIC + _LENGTH.pack(len(header)) + header)
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                if item is _FLUSH:
+                    fp.flush()
+                    continue
+                offset, kind, data = item
+                fp.write(_RECORD.pack(offset, kind, len(data)))
+                fp.write(data)
+
+    def _write(self, kind: int, data: bytes) -> None:
+        if self._closed:
+            return
+        if self._thread is None:
+            self._start_writer()
+        self._queue.put((time.monotonic() - self._start, kind, data))
+        self.frames += 1
+
+    def record(self, msg_type: aiohttp.WSMsgType, data: Any) -> None:
+        """Record a TEXT or BINARY frame; other message types are ignored."""
+
+        if msg_type == aiohttp.WSMsgType.BINARY:
+            self._write(FRAME_BINARY, bytes(data))
+        elif msg_type == aiohttp.WSMsgType.TEXT:
+            self._write(FRAME_TEXT, data.encode("utf-8"))
+
+    def mark_connect(self) -> None:
+        """Record the start of a new connection and compression stream."""
+
+        self._write(FRAME_CONNECT, b"")
+
+    def flush(self) -> None:
+        """Ask the writer thread to flush frames queued so far to disk."""
+
+        if self._thread is not None and not self._closed:
+            self._queue.put(_FLUSH)
+
+    def close(self) -> None:
+        """Stop recording and wait for queued frames to be written."""
+
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def read_recording(
+    path: PathLike, json_codec: Union[str, JSONCodec, None] = "auto"
+) -> Tuple[Dict[str, Any], List[RecordedFrame]]:
+    """Load a recording into memory and return ``(metadata, frames)``."""
+
+    with open(path, "rb") as fp:
+        data = fp.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{os.fspath(path)!r} is not a Gateway recording.")
+    position = len(MAGIC)
+    (header_length,) = _LENGTH.unpack_from(data, position)
+    position += _LENGTH.size
+    metadata = get_codec(json_codec).loads(data[position : position + header_length])
+    position += header_length
+
+    frames = []
+    view = memoryview(data)
+    while position + _RECORD.size <= len(data):
+        offset, kind, length = _RECORD.unpack_from(data, position)
+        position += _RECORD.size
+        if position + length > len(data):
+            break  # truncated by a crash while recording
+        payload = bytes(view[position : position + length])
+        frames.append(RecordedFrame(offset, kind, payload))
+        position += length
+    return metadata, frames
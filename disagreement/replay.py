@@ -0,0 +1,138 @@
+"""Offline replay of recorded Gateway traffic.
+
+:func:`replay` feeds a recording made by
+:class:`~disagreement.recording.GatewayRecorder` through the real inflate,
+decode, dispatch and cache code of a :class:`~disagreement.client.Client`
+without a network connection, either as fast as possible or at the recorded
+pace. This makes production traffic usable for benchmarks, profiling and
+regression tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import aiohttp
+
+from .gateway import GatewayClient
+from .recording import FRAME_BINARY, FRAME_CONNECT, PathLike, read_recording
+
+if TYPE_CHECKING:  # pragma: no cover - for type checking only
+    from .client import Client
+
+
+@dataclass
+class ReplayStats:
+    frames: int = 0
+    dispatches: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def dispatches_per_second(self) -> float:
+        return self.dispatches / self.elapsed if self.elapsed else 0.0
+
+
+class _ReplayGateway(GatewayClient):
+    """Gateway that processes recorded frames and never touches the network."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.sent: List[Dict[str, Any]] = []
+        self.dispatches: int = 0
+
+    async def _send_json(self, payload: Dict[str, Any]):
+        self.sent.append(payload)
+
+    async def _keep_alive(self):
+        return
+
+    async def close(self, code: int = 1000, *, reconnect: bool = False):
+        return
+
+    async def _handle_dispatch(self, data: Dict[str, Any]):
+        self.dispatches += 1
+        await super()._handle_dispatch(data)
+
+    def _skip_dispatch(self, payload: bytes) -> bool:
+        skipped = super()._skip_dispatch(payload)
+        if skipped:
+            self.dispatches += 1
+        return skipped
+
+
+async def replay(
+    path: PathLike,
+    client: "Client",
+    *,
+    paced: bool = False,
+    speed: float = 1.0,
+) -> ReplayStats:
+    """Feed a recording through ``client``'s dispatch pipeline.
+
+    Frames are inflated and decoded with the encoding and compression they
+    were recorded with, then dispatched to ``client``'s listeners and caches.
+    Commands the client would have sent are discarded. Automatic command
+    sync on READY is disabled on ``client``, since it would use the REST API.
+
+    Parameters
+    ----------
+    path:
+        Recording written by :class:`GatewayRecorder`.
+    client:
+        Client whose event dispatcher and caches receive the events.
+    paced:
+        Sleep between frames to reproduce the recorded timing, divided by
+        ``speed``. Otherwise frames are replayed as fast as possible.
+    """
+
+    metadata, frames = read_recording(path, getattr(client, "json_codec", None))
+    client.sync_commands_on_ready = False
+    gateway = _ReplayGateway(
+        http_client=client._http,
+        event_dispatcher=client._event_dispatcher,
+        token=client.token,
+        intents=client.intents,
+        client_instance=client,
+        shard_id=metadata.get("shard_id"),
+        shard_count=metadata.get("shard_count"),
+        json_codec=getattr(client, "json_codec", None),
+        encoding=metadata.get("encoding", "json"),
+        compress=metadata.get("compress", "zlib-stream"),
+        lazy_dispatch=getattr(client, "gateway_lazy_dispatch", True),
+        decode_pool=getattr(client, "_decode_pool", None),
+        send_limit=None,
+    )
+    stats = ReplayStats()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for frame in frames:
+        if paced and frame.offset > 0:
+            delay = start + frame.offset / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if frame.kind == FRAME_CONNECT:
+            gateway._inflator.reset()
+            continue
+        if frame.kind == FRAME_BINARY:
+            message = aiohttp.WSMessage(aiohttp.WSMsgType.BINARY, frame.data, None)
+        else:
+            message = aiohttp.WSMessage(
+                aiohttp.WSMsgType.TEXT, frame.data.decode("utf-8"), None
+            )
+        await gateway._process_message(message)
+        stats.frames += 1
+        stats.bytes += len(frame.data)
+
+    join = getattr(client._event_dispatcher, "join", None)
+    if join is not None:
+        await join()
+    stats.elapsed = loop.time() - start
+    stats.dispatches = gateway.dispatches
+    return stats
@@ -0,0 +1,166 @@
+"""Persistence of Gateway resume state across process restarts.
+
+A shard that reconnects with its previous ``session_id`` and sequence number
+can RESUME instead of IDENTIFY, which avoids replaying READY and every
+``GUILD_CREATE`` and does not use a session start. :class:`GatewayClient`
+saves its resume state to a :class:`SessionStore` when it is closed for good
+and loads it again on :meth:`~disagreement.gateway.GatewayClient.connect`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional, Union
+
+from .json_codec import JSONCodec, get_codec
+
+logger = logging.getLogger(__name__)
+
+# Discord keeps a disconnected session resumable only for a short while.
+DEFAULT_MAX_AGE = 300.0
+
+
+@dataclass
+class SessionState:
+    """Resume state of one shard."""
+
+    session_id: str
+    sequence: int
+    resume_gateway_url: str
+    shard_count: Optional[int] = None
+    application_id: Optional[str] = None
+    user: Optional[Dict[str, Any]] = None
+    saved_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionState":
+        return cls(
+            session_id=data["session_id"],
+            sequence=int(data["sequence"]),
+            resume_gateway_url=data["resume_gateway_url"],
+            shard_count=data.get("shard_count"),
+            application_id=data.get("application_id"),
+            user=data.get("user"),
+            saved_at=float(data.get("saved_at", 0.0)),
+        )
+
+
+class SessionStore(ABC):
+    """Base class for resume state storage.
+
+    Subclasses implement :meth:`load`, :meth:`save` and :meth:`delete`, e.g. on
+    top of Redis or a database. ``shard_id`` is ``0`` for unsharded clients.
+    """
+
+    @abstractmethod
+    async def load(self, shard_id: int) -> Optional[SessionState]:
+        """Return the saved state of ``shard_id``, or ``None`` if there is none."""
+
+    @abstractmethod
+    async def save(self, shard_id: int, state: SessionState) -> None:
+        """Store ``state`` as the resume state of ``shard_id``."""
+
+    @abstractmethod
+    async def delete(self, shard_id: int) -> None:
+        """Forget the saved state of ``shard_id``."""
+
+
+class FileSessionStore(SessionStore):
+    """Stores the resume state of each shard in its own JSON file.
+
+    Parameters
+    ----------
+    path:
+        Base name of the files. Shard ``N`` is kept in ``{path}.N``, which is
+        replaced atomically on every save. Since every shard is run by exactly
+        one process, cluster processes sharing a ``path`` never write the same
+        file.
+    max_age:
+        States saved more than this many seconds ago are ignored, since
+        Discord would reject them with INVALID_SESSION anyway.
+    json_codec:
+        JSON backend used to read and write the files. :class:`Client` passes
+        its own codec.
+
+    File access runs in the loop's default executor so a slow disk does not
+    block the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"] = "gateway_sessions.json",
+        *,
+        max_age: float = DEFAULT_MAX_AGE,
+        json_codec: Union[str, JSONCodec] = "auto",
+    ) -> None:
+        self.path: str = os.fspath(path)
+        self.max_age: float = max_age
+        self.json_codec: JSONCodec = get_codec(json_codec)
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    def shard_path(self, shard_id: int) -> str:
+        """Return the file holding the state of ``shard_id``."""
+
+        return f"{self.path}.{shard_id}"
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as fp:
+                data = self.json_codec.loads(fp.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable session file %s: %s", path, e)
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _write(self, path: str, entry: Dict[str, Any]) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fp:
+            fp.write(self.json_codec.dumps_bytes(entry))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def load(self, shard_id: int) -> Optional[SessionState]:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            entry = await loop.run_in_executor(
+                None, self._read, self.shard_path(shard_id)
+            )
+        if entry is None:
+            return None
+        try:
+            state = SessionState.from_dict(entry)
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed session state for shard %s.", shard_id)
+            return None
+        if time.time() - state.saved_at > self.max_age:
+            logger.info("Stored session for shard %s expired.", shard_id)
+            return None
+        return state
+
+    async def save(self, shard_id: int, state: SessionState) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            await loop.run_in_executor(
+                None, self._write, self.shard_path(shard_id), state.to_dict()
+            )
+
+    async def delete(self, shard_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            await loop.run_in_executor(None, self._remove, self.shard_path(shard_id))
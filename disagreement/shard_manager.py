@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List, TYPE_CHECKING
+import logging
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
 
 from .gateway import GatewayClient
+from .rate_limiter import IdentifyLimiter
 
 if TYPE_CHECKING:  # pragma: no cover - for type checking only
     from .client import Client
 
 
+logger = logging.getLogger(__name__)
+
+
 class Shard:
     """Represents a single gateway shard."""
 
@@ -27,19 +32,117 @@ class Shard:
         """Closes this shard's gateway."""
         await self.gateway.close()
 
+    @property
+    def identified(self) -> bool:
+        """Whether this shard has sent IDENTIFY or RESUME on its connection."""
+        event = getattr(self.gateway, "identified_event", None)
+        return event is not None and event.is_set()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether this shard received READY or RESUMED."""
+        event = getattr(self.gateway, "ready_event", None)
+        return event is not None and event.is_set()
+
+    async def wait_until_identified(self) -> None:
+        event = getattr(self.gateway, "identified_event", None)
+        if event is not None:
+            await event.wait()
+
+    async def wait_until_ready(self) -> None:
+        event = getattr(self.gateway, "ready_event", None)
+        if event is not None:
+            await event.wait()
+
 
 class ShardManager:
-    """Manages multiple :class:`Shard` instances."""
+    """Manages multiple :class:`Shard` instances.
+
+    Shards are started in waves of ``max_concurrency`` shards, as reported in
+    the session start limit of ``GET /gateway/bot``. Every IDENTIFY also goes
+    through a shared :class:`~disagreement.rate_limiter.IdentifyLimiter`, so
+    reconnecting shards respect the 5 second identify window as well.
+
+    ``shard_ids`` (by default ``client.shard_ids``) limits the manager to a
+    subset of the ``shard_count`` shards, e.g. the range assigned to one
+    cluster process.
+    """
 
-    def __init__(self, client: "Client", shard_count: int) -> None:
+    def __init__(
+        self,
+        client: "Client",
+        shard_count: int,
+        *,
+        identify_timeout: float = 30.0,
+        shard_ids: Optional[Sequence[int]] = None,
+    ) -> None:
         self.client: "Client" = client
         self.shard_count: int = shard_count
+        if shard_ids is None:
+            shard_ids = client.shard_ids
+        self.shard_ids: List[int] = (
+            list(shard_ids) if shard_ids is not None else list(range(shard_count))
+        )
         self.shards: List[Shard] = []
+        self.identify_timeout: float = identify_timeout
+        self.identify_limiter: IdentifyLimiter = IdentifyLimiter()
+        self.session_start_limit: Dict[str, Any] = {}
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.identify_limiter.max_concurrency
+
+    @property
+    def remaining_session_starts(self) -> Optional[int]:
+        """Session starts left before the limit resets, if known."""
+        return self.identify_limiter.remaining
+
+    @property
+    def progress(self) -> Dict[str, int]:
+        """Counts of shards that are created, identified and ready."""
+        return {
+            "total": len(self.shard_ids),
+            "identified": sum(1 for s in self.shards if s.identified),
+            "ready": sum(1 for s in self.shards if s.is_ready),
+        }
+
+    async def _fetch_session_start_limit(self) -> None:
+        get_gateway_bot = getattr(self.client._http, "get_gateway_bot", None)
+        if get_gateway_bot is None:
+            return
+        try:
+            data = await get_gateway_bot()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Could not fetch session start limit: %s", e)
+            return
+
+        limit = data.get("session_start_limit") or {}
+        self.session_start_limit = limit
+        self.identify_limiter.max_concurrency = max(
+            1, int(limit.get("max_concurrency", 1))
+        )
+        remaining = limit.get("remaining")
+        if remaining is None:
+            return
+        self.identify_limiter.remaining = int(remaining)
+        logger.info(
+            "Session start limit: %s of %s remaining, max_concurrency %s.",
+            remaining,
+            limit.get("total"),
+            self.identify_limiter.max_concurrency,
+        )
+        if remaining < len(self.shard_ids):
+            logger.warning(
+                "Only %s session starts remain for %s shards; the limit resets in %.0f seconds.",
+                remaining,
+                len(self.shard_ids),
+                limit.get("reset_after", 0) / 1000,
+            )
 
     def _create_shards(self) -> None:
         if self.shards:
             return
-        for shard_id in range(self.shard_count):
+        for shard_id in self.shard_ids:
             gateway = GatewayClient(
                 http_client=self.client._http,
                 event_dispatcher=self.client._event_dispatcher,
@@ -51,13 +154,54 @@ class ShardManager:
                 shard_count=self.shard_count,
                 max_retries=self.client.gateway_max_retries,
                 max_backoff=self.client.gateway_max_backoff,
+                json_codec=self.client.json_codec,
+                encoding=self.client.gateway_encoding,
+                max_decompression_size=self.client.gateway_max_decompression_size,
+                compress=self.client.gateway_compression,
+                lazy_dispatch=self.client.gateway_lazy_dispatch,
+                decode_pool=self.client._decode_pool,
+                dispatch_queue_size=self.client.gateway_dispatch_queue_size,
+                dispatch_overflow=self.client.gateway_dispatch_overflow,
+                dispatch_priorities=self.client.gateway_dispatch_priorities,
+                identify_limiter=self.identify_limiter,
+                send_limit=self.client.gateway_send_limit,
+                session_store=self.client.gateway_session_store,
+                recorder=self.client._get_recorder(shard_id),
+                chunk_guilds=self.client.chunk_guilds_at_startup,
+                chunk_concurrency=self.client.chunk_concurrency,
+                chunk_batch_size=self.client.chunk_batch_size,
+                latency_tracker=self.client.event_latency,
             )
             self.shards.append(Shard(shard_id, self.shard_count, gateway))
 
     async def start(self) -> None:
-        """Starts all shards."""
+        """Starts all shards, one wave of ``max_concurrency`` shards at a time."""
+        await self._fetch_session_start_limit()
         self._create_shards()
-        await asyncio.gather(*(s.connect() for s in self.shards))
+        wave_size = self.max_concurrency
+        for index in range(0, len(self.shards), wave_size):
+            wave = self.shards[index : index + wave_size]
+            await asyncio.gather(*(s.connect() for s in wave))
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(s.wait_until_identified() for s in wave)),
+                    timeout=self.identify_timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Shards %s did not identify within %.0f seconds; continuing.",
+                    [s.id for s in wave if not s.identified],
+                    self.identify_timeout,
+                )
+            logger.info(
+                "Shard launch progress: %s/%s identified.",
+                self.progress["identified"],
+                len(self.shard_ids),
+            )
+
+    async def wait_until_ready(self) -> None:
+        """Waits until every shard received READY or RESUMED."""
+        await asyncio.gather(*(s.wait_until_ready() for s in self.shards))
 
     async def close(self) -> None:
         """Closes all shards."""
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+
+import pytest
+
+from disagreement.caching import MemberCacheFlags
+from disagreement.client import Client
+from disagreement.enums import GatewayIntent
+from disagreement.ext import commands
+
+
+def _client(**kwargs):
+    return Client(token="t", sync_commands_on_ready=False, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_bare_client_only_needs_guilds():
+    client = _client(auto_intents=True)
+    report = client.intent_report()
+    assert report.intents == GatewayIntent.GUILDS
+    unused = report.unused(GatewayIntent.default())
+    assert GatewayIntent.GUILDS not in unused
+    assert GatewayIntent.GUILD_MESSAGES in unused
+
+
+@pytest.mark.asyncio
+async def test_listeners_and_batches_map_to_intents():
+    client = _client(auto_intents=True)
+
+    @client.event
+    async def on_message(message):
+        pass
+
+    @client.on_batch("PRESENCE_UPDATE")
+    async def presences(items):
+        pass
+
+    @client.on_event("RAW_GUILD_BAN_ADD")
+    async def bans(data):
+        pass
+
+    report = client.intent_report()
+    assert report.intents == (
+        GatewayIntent.GUILDS
+        | GatewayIntent.GUILD_MESSAGES
+        | GatewayIntent.DIRECT_MESSAGES
+        | GatewayIntent.GUILD_PRESENCES
+        | GatewayIntent.GUILD_MODERATION
+    )
+    assert any(
+        r.startswith("batch listener") and r.endswith("(PRESENCE_UPDATE)")
+        for r in report.reasons[GatewayIntent.GUILD_PRESENCES]
+    )
+
+
+@pytest.mark.asyncio
+async def test_waiters_cogs_and_commands_are_counted():
+    client = _client(auto_intents=True)
+
+    class Reactions(commands.Cog):
+        @commands.listener("MESSAGE_REACTION_ADD")
+        async def on_reaction(self, reaction):
+            pass
+
+    async def ping(ctx):
+        pass
+
+    client.add_cog(Reactions(client))
+    client.command_handler.add_command(commands.Command(ping, name="ping"))
+    client._event_dispatcher.add_waiter(
+        "TYPING_START", asyncio.get_running_loop().create_future()
+    )
+
+    intents = client.intent_report().intents
+    for intent in (
+        GatewayIntent.GUILD_MESSAGE_REACTIONS,
+        GatewayIntent.GUILD_MESSAGE_TYPING,
+        GatewayIntent.GUILD_MESSAGES,
+        GatewayIntent.MESSAGE_CONTENT,
+    ):
+        assert intents & intent
+
+
+@pytest.mark.asyncio
+async def test_cache_settings_require_intents():
+    client = _client(
+        auto_intents=True,
+        member_cache_flags=MemberCacheFlags.only_voice(),
+        message_cache_maxlen=100,
+        chunk_guilds_at_startup=True,
+    )
+    intents = client.intent_report().intents
+    assert intents & GatewayIntent.GUILD_VOICE_STATES
+    assert intents & GatewayIntent.GUILD_MESSAGES
+    assert intents & GatewayIntent.GUILD_MEMBERS
+    assert not intents & GatewayIntent.GUILD_PRESENCES
+
+
+async def _connect(client):
+    async def fake_start():
+        raise RuntimeError("stop")
+
+    client._initialize_gateway = fake_start
+    with pytest.raises(RuntimeError):
+        await client.connect()
+
+
+@pytest.mark.asyncio
+async def test_connect_uses_derived_intents_and_warns_about_extras(caplog):
+    client = _client(
+        auto_intents=True,
+        extra_intents=GatewayIntent.GUILD_VOICE_STATES | GatewayIntent.GUILD_WEBHOOKS,
+    )
+
+    @client.on_event("VOICE_STATE_UPDATE")
+    async def voice(state):
+        pass
+
+    with caplog.at_level(logging.INFO, logger="disagreement.intents"):
+        await _connect(client)
+
+    assert client.intents == (
+        GatewayIntent.GUILDS
+        | GatewayIntent.GUILD_VOICE_STATES
+        | GatewayIntent.GUILD_WEBHOOKS
+    )
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert warnings == [
+        "Intent GUILD_WEBHOOKS is subscribed but no listener, command or cache uses it."
+    ]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_explicit_intents_bound_derived_ones(caplog):
+    client = _client(
+        auto_intents=True,
+        intents=GatewayIntent.all(),
+        chunk_guilds_at_startup=True,
+    )
+
+    @client.event
+    async def on_message(message):
+        pass
+
+    await _connect(client)
+
+    assert client.intents == (
+        GatewayIntent.GUILDS
+        | GatewayIntent.GUILD_MESSAGES
+        | GatewayIntent.DIRECT_MESSAGES
+        | GatewayIntent.GUILD_MEMBERS
+    )
+    assert not client.intents & GatewayIntent.GUILD_PRESENCES
+    assert not client.intents & GatewayIntent.MESSAGE_CONTENT
+    await client.close()
+
+    client = _client(
+        auto_intents=True,
+        intents=GatewayIntent.GUILDS | GatewayIntent.GUILD_MESSAGES,
+        chunk_guilds_at_startup=True,
+    )
+    with caplog.at_level(logging.WARNING, logger="disagreement.intents"):
+        await _connect(client)
+
+    assert client.intents == GatewayIntent.GUILDS
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert warnings == [
+        "Intent GUILD_MEMBERS is needed by chunk_guilds_at_startup "
+        "but is not in the allowed intents."
+    ]
+    await client.close()
+
+
+def test_intents_unchanged_without_auto_mode():
+    client = Client(token="t", intents=GatewayIntent.GUILDS)
+    assert client.intents == GatewayIntent.GUILDS
+    assert not client.auto_intents
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from disagreement.event_dispatcher import EventDispatcher
+
+
+class DummyClient:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_delivered_in_order():
+    dispatcher = EventDispatcher(DummyClient())
+    batches = []
+
+    async def listener(events):
+        batches.append(events)
+
+    dispatcher.register_batch("TEST_EVENT", listener, max_size=3, max_delay=60)
+    assert dispatcher.wants("TEST_EVENT")
+    for i in range(7):
+        await dispatcher.dispatch("TEST_EVENT", {"i": i})
+
+    assert [[e["i"] for e in b] for b in batches] == [[0, 1, 2], [3, 4, 5]]
+    await dispatcher.flush_batches()
+    assert [e["i"] for e in batches[-1]] == [6]
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_delivered_after_delay():
+    dispatcher = EventDispatcher(DummyClient())
+    received = asyncio.Queue()
+
+    async def listener(events):
+        await received.put(events)
+
+    dispatcher.register_batch("TEST_EVENT", listener, max_size=100, max_delay=0.01)
+    await dispatcher.dispatch("TEST_EVENT", {"i": 0})
+    await dispatcher.dispatch("TEST_EVENT", {"i": 1})
+    batch = await asyncio.wait_for(received.get(), 1)
+    assert [e["i"] for e in batch] == [0, 1]
+    await dispatcher.join()
+
+
+@pytest.mark.asyncio
+async def test_batches_receive_parsed_events():
+    dispatcher = EventDispatcher(DummyClient())
+    batches = []
+
+    async def listener(events):
+        batches.append(events)
+
+    dispatcher._event_parsers["TEST_EVENT"] = lambda data: data["value"]
+    dispatcher.register_batch("TEST_EVENT", listener, max_size=2)
+    await dispatcher.dispatch("TEST_EVENT", {"value": "a"})
+    await dispatcher.dispatch("TEST_EVENT", {"value": "b"})
+    assert batches == [["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dispatch_keeps_batch_order():
+    dispatcher = EventDispatcher(DummyClient(), max_concurrency=10)
+    batches = []
+
+    async def listener(events):
+        await asyncio.sleep(0.01 if events[0] == 0 else 0)
+        batches.append(events)
+
+    dispatcher.register_batch("TEST_EVENT", listener, max_size=2)
+    for i in range(4):
+        await dispatcher.dispatch("TEST_EVENT", i)
+    await dispatcher.join()
+    assert batches == [[0, 1], [2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_unregister_delivers_buffered_events():
+    dispatcher = EventDispatcher(DummyClient())
+    batches = []
+
+    async def listener(events):
+        batches.append(events)
+
+    dispatcher.register_batch("TEST_EVENT", listener, max_size=10)
+    await dispatcher.dispatch("TEST_EVENT", 1)
+    dispatcher.unregister_batch("TEST_EVENT", listener)
+    assert not dispatcher.wants("TEST_EVENT")
+    await dispatcher.dispatch("TEST_EVENT", 2)
+    await dispatcher.join()
+    assert batches == [[1]]
+
+
+def test_invalid_batch_options():
+    dispatcher = EventDispatcher(DummyClient())
+
+    async def listener(events):
+        pass
+
+    with pytest.raises(ValueError):
+        dispatcher.register_batch("TEST_EVENT", listener, max_size=0)
+    with pytest.raises(TypeError):
+        dispatcher.register_batch("TEST_EVENT", lambda events: None)
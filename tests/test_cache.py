@@ -1,6 +1,9 @@
+import asyncio
 import time
 
-from disagreement.cache import Cache
+import pytest
+
+from disagreement.cache import Cache, MemoryBudget, estimate_size
 from disagreement.client import Client
 from disagreement.caching import MemberCacheFlags
 from disagreement.enums import (
@@ -138,3 +141,136 @@ def test_client_get_all_members_disabled_cache():
     client.parse_guild(_guild_payload("1", 1, 2))
 
     assert client.get_all_members() == []
+
+
+def test_expire_drops_only_expired_entries_in_order():
+    cache = Cache(ttl=0.01)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.ttl = 60
+    cache.set("c", 3)
+    cache.set("a", 4)  # refreshed; its first heap record is stale
+    time.sleep(0.02)
+
+    evicted = []
+    cache.add_eviction_callback(lambda k, v, reason: evicted.append((k, v, reason)))
+    assert cache.expire() == 1
+    assert evicted == [("b", 2, "expired")]
+    assert sorted(cache.values()) == [3, 4]
+    assert len(cache) == 2
+
+
+def test_eviction_callbacks_for_maxlen_and_expired_get():
+    cache = Cache(ttl=0.01, maxlen=1)
+    evicted = []
+    cache.add_eviction_callback(lambda k, v, reason: evicted.append((k, reason)))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    time.sleep(0.02)
+    assert cache.get("b") is None
+    cache.invalidate("missing")
+    assert evicted == [("a", "maxlen"), ("b", "expired")]
+
+
+def test_expire_respects_limit_and_compacts_heap():
+    cache = Cache(ttl=0.01)
+    for _ in range(100):
+        cache.set("same", 1)
+    assert len(cache._expiry_heap) < 100
+    for i in range(10):
+        cache.set(str(i), i)
+    time.sleep(0.02)
+    assert cache.expire(limit=4) == 4
+    assert cache.expire() == 7
+    assert cache._data == {}
+
+
+@pytest.mark.asyncio
+async def test_sweeper_drops_expired_entries_without_reads():
+    cache = Cache(ttl=0.01)
+    cache.set("a", 1)
+    cache.start_sweeper(interval=0.01)
+    await asyncio.sleep(0.05)
+    assert "a" not in cache._data
+    # Nothing left to expire, so no sweep stays scheduled.
+    assert cache._sweep_handle is None
+    cache.set("b", 2)
+    assert cache._sweep_handle is not None
+    cache.stop_sweeper()
+    assert cache._sweep_handle is None
+
+
+@pytest.mark.asyncio
+async def test_sweeper_is_idle_without_ttl_entries():
+    cache = Cache(ttl=60)
+    cache.start_sweeper()
+    assert cache._sweep_handle is None
+    cache.stop_sweeper()
+
+
+class _Model:
+    def __init__(self, text: str, client=None):
+        self.text = text
+        self._client = client
+
+
+def test_estimate_size_grows_with_payload_and_skips_client():
+    small = estimate_size(_Model("x"))
+    large = estimate_size(_Model("x" * 10_000))
+    assert large - small >= 9_000
+    shared = ["y" * 100_000]
+    assert estimate_size(_Model("x", client=shared)) < small + 1_000
+
+
+def test_max_bytes_evicts_oldest_entries():
+    cache = Cache(max_bytes=250, sizeof=lambda value: 100)
+    evicted = []
+    cache.add_eviction_callback(lambda k, v, reason: evicted.append((k, reason)))
+    for key in "abc":
+        cache.set(key, key)
+    assert evicted == [("a", "memory")]
+    assert cache.nbytes == 200
+    cache.set("b", "bb")  # replacing an entry does not count it twice
+    assert cache.nbytes == 200
+    cache.invalidate("c")
+    assert cache.nbytes == 100
+    assert cache.evictions == {"memory": 1}
+
+
+def test_shared_budget_evicts_from_largest_cache():
+    budget = MemoryBudget(500)
+    big = Cache(sizeof=lambda value: 100)
+    small = Cache(sizeof=lambda value: 100)
+    small.set("s", 1)
+    small.add_budget(budget)
+    big.add_budget(budget)
+    for i in range(5):
+        big.set(str(i), i)
+    assert budget.used == 500
+    assert len(big) == 4 and len(small) == 1
+    assert budget.evictions == 1
+
+    del small
+    assert budget.used == 400
+
+
+def test_client_memory_limits_and_report():
+    client = Client(
+        token="t",
+        cache_memory_limits={"members": 1},
+        cache_memory_budget=10**9,
+    )
+    client.parse_guild(_guild_payload("1", 1, 3))
+
+    report = client.memory_report()
+    assert report["members"]["entries"] == 0
+    assert report["members"]["evictions"] == {"memory": 3}
+    assert report["members"]["limit"] == 1
+    assert report["guilds"]["entries"] == 1
+    assert report["guilds"]["bytes"] > 0
+    assert report["total"]["limit"] == 10**9
+
+
+def test_client_rejects_unknown_cache_name():
+    with pytest.raises(ValueError):
+        Client(token="t", cache_memory_limits={"emojis": 1})
@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import multiprocessing
+import queue
+import threading
+from unittest.mock import AsyncMock
+
+import pytest
+
+from disagreement.cluster import (
+    ClusterSupervisor,
+    ClusterWorker,
+    shard_for_guild,
+    shard_ranges,
+)
+from disagreement.errors import ClusterError
+
+
+class FakeClient:
+    """Stands in for Client inside cluster processes; never touches Discord."""
+
+    def __init__(self):
+        self.shard_count = None
+        self.shard_ids = None
+        self.cluster = None
+        self.guilds = []
+        self.latency = 0.05
+        self.change_presence = AsyncMock()
+        self.closed = False
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    def is_ready(self):
+        return True
+
+    def get_guild(self, guild_id):
+        return None
+
+
+def make_fake_client():
+    return FakeClient()
+
+
+def test_shard_ranges_split_evenly():
+    assert shard_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert shard_ranges(2, 4) == [[0], [1]]
+
+
+def test_shard_for_guild_matches_discord_formula():
+    guild_id = 81384788765712384
+    assert shard_for_guild(str(guild_id), 16) == (guild_id >> 22) % 16
+
+
+@pytest.mark.asyncio
+async def test_worker_answers_commands():
+    parent, child = multiprocessing.Pipe()
+    client = FakeClient()
+    worker = ClusterWorker(client, 1, [2, 3], 4, child)
+
+    assert client.cluster is worker
+    assert (client.shard_count, client.shard_ids) == (4, [2, 3])
+
+    await worker._handle({"op": "stats", "nonce": 1})
+    reply = parent.recv()
+    assert reply["nonce"] == 1
+    assert reply["data"]["shard_ids"] == [2, 3]
+
+    await worker._handle({"op": "presence", "nonce": 2, "data": {"status": "idle"}})
+    assert parent.recv() == {"op": "reply", "nonce": 2, "data": None}
+    client.change_presence.assert_awaited_once_with(status="idle")
+
+    await worker._handle({"op": "nope", "nonce": 3})
+    assert "Unknown" in parent.recv()["error"]
+
+
+def test_worker_owns_guilds_of_its_shards():
+    worker = ClusterWorker(FakeClient(), 0, [0, 1], 4, multiprocessing.Pipe()[1])
+    assert worker.owns_guild(0 << 22)
+    assert not worker.owns_guild(2 << 22)
+
+
+_EOF = object()
+
+
+class FakeConnection:
+    """One end of an in-process pipe.
+
+    Like an OS pipe, the other end reads EOF once every handle of this end is
+    closed. Closing also wakes this end's own reader so no executor thread
+    stays blocked after the test.
+    """
+
+    def __init__(self):
+        self.inbox = queue.Queue()
+        self.peer = None
+        self.handles = 1
+
+    @property
+    def closed(self):
+        return self.handles == 0
+
+    def send(self, message):
+        if self.closed or self.peer.closed:
+            raise BrokenPipeError
+        self.peer.inbox.put(message)
+
+    def recv(self):
+        message = self.inbox.get()
+        if message is _EOF:
+            self.inbox.put(_EOF)
+            raise EOFError
+        return message
+
+    def close(self):
+        if self.handles:
+            self.handles -= 1
+            if not self.handles:
+                self.inbox.put(_EOF)
+                self.peer.inbox.put(_EOF)
+
+
+class FakeProcess:
+    """Runs a cluster's ClusterWorker on the test's event loop."""
+
+    pids = itertools.count(1000)
+
+    def __init__(self, target, args, name, daemon):
+        self.args = args
+        self.pid = None
+        self.exitcode = None
+        self._exited = threading.Event()
+
+    def start(self):
+        factory, cluster_id, shard_ids, shard_count, conn = self.args
+        conn.handles += 1  # the "child" keeps its end open
+        self._conn = conn
+        self.pid = next(self.pids)
+        worker = ClusterWorker(factory(), cluster_id, shard_ids, shard_count, conn)
+        self._task = asyncio.get_running_loop().create_task(worker.run())
+        self._task.add_done_callback(lambda _: self._exit(0))
+
+    def _exit(self, code):
+        if self.exitcode is None:
+            self.exitcode = code
+            self._conn.close()
+            self._exited.set()
+
+    def is_alive(self):
+        return self.pid is not None and self.exitcode is None
+
+    def kill(self):
+        self._exit(-9)
+        self._task.cancel()
+
+    terminate = kill
+
+    def join(self, timeout=None):
+        self._exited.wait(timeout)
+
+
+class FakeContext:
+    Process = FakeProcess
+
+    @staticmethod
+    def Pipe():
+        parent, child = FakeConnection(), FakeConnection()
+        parent.peer, child.peer = child, parent
+        return parent, child
+
+
+@pytest.mark.asyncio
+async def test_supervisor_runs_and_restarts_clusters():
+    supervisor = ClusterSupervisor(
+        make_fake_client,
+        shard_count=4,
+        cluster_count=2,
+        ready_timeout=5,
+        restart_delay=0,
+        check_interval=0.01,
+    )
+    supervisor._context = FakeContext()
+    restarted = asyncio.Event()
+    restart = supervisor._restart
+
+    async def restart_and_signal(cluster):
+        await restart(cluster)
+        restarted.set()
+
+    supervisor._restart = restart_and_signal
+    await supervisor.start()
+    try:
+        assert all(cluster.ready.is_set() for cluster in supervisor.clusters)
+        stats = await supervisor.stats()
+        assert [stats[i]["shard_ids"] for i in (0, 1)] == [[0, 1], [2, 3]]
+        assert supervisor.cluster_for_guild(3 << 22).id == 1
+
+        first = supervisor.clusters[0].process
+        first.kill()
+        await asyncio.wait_for(restarted.wait(), 5)
+
+        cluster = supervisor.clusters[0]
+        assert cluster.process is not first and cluster.ready.is_set()
+        assert cluster.restarts == 1
+        assert (await supervisor.stats())[0]["shard_ids"] == [0, 1]
+    finally:
+        await supervisor.close()
+
+    assert all(cluster.process is None for cluster in supervisor.clusters)
+    with pytest.raises(ClusterError):
+        await supervisor.request(0, "stats")
+
+
+def test_manager_runs_only_assigned_shards():
+    from disagreement.client import Client
+    from disagreement.shard_manager import ShardManager
+
+    client = Client(token="t")
+    manager = ShardManager(client, 4, shard_ids=[2, 3])
+    manager._create_shards()
+    assert [shard.id for shard in manager.shards] == [2, 3]
+    assert manager.progress["total"] == 2
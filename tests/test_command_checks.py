@@ -9,6 +9,7 @@ from disagreement.ext.commands.decorators import (
     is_owner,
 )
 from disagreement.ext.commands.errors import CheckFailure, CommandOnCooldown
+from disagreement.models import Member
 from disagreement.permissions import Permissions
 
 
@@ -66,7 +67,7 @@ async def test_requires_permissions_pass(message):
         roles = []
 
         def get_member(self, mid):
-            return message.author
+            return Member({"user": {"id": mid}, "joined_at": "t", "roles": []})
 
     class Channel:
         def __init__(self, perms):
@@ -76,7 +77,6 @@ async def test_requires_permissions_pass(message):
         def permissions_for(self, member):
             return self.perms
 
-    message.author.roles = []
     message._client.get_channel = lambda cid: Channel(Permissions.SEND_MESSAGES)
     message._client.get_guild = lambda gid: Guild()
 
@@ -105,7 +105,7 @@ async def test_requires_permissions_fail(message):
         roles = []
 
         def get_member(self, mid):
-            return message.author
+            return Member({"user": {"id": mid}, "joined_at": "t", "roles": []})
 
     class Channel:
         def __init__(self, perms):
@@ -115,7 +115,6 @@ async def test_requires_permissions_fail(message):
         def permissions_for(self, member):
             return self.perms
 
-    message.author.roles = []
     message._client.get_channel = lambda cid: Channel(Permissions.SEND_MESSAGES)
     message._client.get_guild = lambda gid: Guild()
 
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from disagreement.event_dispatcher import EventDispatcher
+
+
+class DummyClient:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_listeners_run_concurrently():
+    dispatcher = EventDispatcher(DummyClient(), max_concurrency=10)
+    started = []
+    release = asyncio.Event()
+
+    async def first(_):
+        started.append("first")
+        await release.wait()
+
+    async def second(_):
+        started.append("second")
+        await release.wait()
+
+    dispatcher.register("TEST_EVENT", first)
+    dispatcher.register("TEST_EVENT", second)
+    await dispatcher.dispatch("TEST_EVENT", {})
+    await asyncio.sleep(0)
+
+    assert started == ["first", "second"]
+    release.set()
+    await dispatcher.join()
+
+
+@pytest.mark.asyncio
+async def test_global_limit_applies_backpressure():
+    dispatcher = EventDispatcher(DummyClient(), max_concurrency=1)
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def listener(_):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+
+    dispatcher.register("TEST_EVENT", listener)
+    await dispatcher.dispatch("TEST_EVENT", {})
+    second = asyncio.create_task(dispatcher.dispatch("TEST_EVENT", {}))
+    await asyncio.sleep(0.01)
+    assert not second.done()
+
+    release.set()
+    await second
+    await dispatcher.join()
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_per_event_limit():
+    dispatcher = EventDispatcher(DummyClient(), event_concurrency={"SLOW": 1})
+    release = asyncio.Event()
+
+    async def slow(_):
+        await release.wait()
+
+    fast_calls = []
+
+    async def fast(data):
+        fast_calls.append(data)
+
+    dispatcher.register("SLOW", slow)
+    dispatcher.register("FAST", fast)
+    await dispatcher.dispatch("SLOW", {})
+    blocked = asyncio.create_task(dispatcher.dispatch("SLOW", {}))
+    await dispatcher.dispatch("FAST", {"n": 1})
+    await asyncio.sleep(0.01)
+
+    assert fast_calls == [{"n": 1}]
+    assert not blocked.done()
+    release.set()
+    await blocked
+    await dispatcher.join()
+
+
+@pytest.mark.asyncio
+async def test_ordering_key_serialises_same_key():
+    dispatcher = EventDispatcher(
+        DummyClient(),
+        max_concurrency=10,
+        ordering_keys={"TEST_EVENT": lambda data: data["channel"]},
+    )
+    seen = []
+
+    async def listener(data):
+        # Earlier events sleep longer; same-channel order must still hold.
+        await asyncio.sleep(data["delay"])
+        seen.append((data["channel"], data["n"]))
+
+    dispatcher.register("TEST_EVENT", listener)
+    await dispatcher.dispatch("TEST_EVENT", {"channel": "a", "n": 1, "delay": 0.03})
+    await dispatcher.dispatch("TEST_EVENT", {"channel": "b", "n": 1, "delay": 0.0})
+    await dispatcher.dispatch("TEST_EVENT", {"channel": "a", "n": 2, "delay": 0.0})
+    await dispatcher.join()
+
+    assert seen.index(("b", 1)) < seen.index(("a", 1))
+    assert [n for channel, n in seen if channel == "a"] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_dispatch_error_hook():
+    dispatcher = EventDispatcher(DummyClient(), max_concurrency=2)
+    hook = AsyncMock()
+    dispatcher.on_dispatch_error = hook
+
+    async def listener(_):
+        raise RuntimeError("boom")
+
+    dispatcher.register("TEST_EVENT", listener)
+    await dispatcher.dispatch("TEST_EVENT", {})
+    await dispatcher.join()
+
+    hook.assert_awaited_once()
+    assert hook.call_args.args[0] == "TEST_EVENT"
+    assert isinstance(hook.call_args.args[1], RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_client_on_error():
+    class ErrorClient:
+        def __init__(self):
+            self.on_error = AsyncMock()
+
+    client = ErrorClient()
+    dispatcher = EventDispatcher(client, max_concurrency=2)
+
+    async def listener(_):
+        raise RuntimeError("boom")
+
+    dispatcher.register("TEST_EVENT", listener)
+    await dispatcher.dispatch("TEST_EVENT", {})
+    await dispatcher.join()
+
+    client.on_error.assert_awaited_once()
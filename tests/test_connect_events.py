@@ -3,7 +3,7 @@ import pytest
 from unittest.mock import AsyncMock
 
 from disagreement.shard_manager import ShardManager
-from disagreement.event_dispatcher import EventDispatcher
+from disagreement.client import Client
 
 
 class DummyGateway:
@@ -24,15 +24,10 @@ class DummyGateway:
         self.close.side_effect = emit_close
 
 
-class DummyClient:
+class DummyClient(Client):
     def __init__(self):
+        super().__init__(token="t")
         self._http = object()
-        self._event_dispatcher = EventDispatcher(self)
-        self.token = "t"
-        self.intents = 0
-        self.verbose = False
-        self.gateway_max_retries = 5
-        self.gateway_max_backoff = 60.0
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+import zlib
+
+import aiohttp
+import pytest
+
+from disagreement.decode_pool import DecodePool, LoopStallMonitor, _decode_in_worker
+from disagreement.etf import dumps as etf_dumps
+from disagreement.gateway import GatewayClient
+
+
+class DummyDispatcher:
+    def __init__(self):
+        self.events = []
+
+    async def dispatch(self, event_name, data):
+        self.events.append((event_name, data))
+
+
+class DummyClient:
+    pass
+
+
+class DummyMessage:
+    type = aiohttp.WSMsgType.BINARY
+
+    def __init__(self, data):
+        self.data = data
+
+
+def frames(*payloads):
+    compressor = zlib.compressobj()
+    return [
+        compressor.compress(p) + compressor.flush(zlib.Z_SYNC_FLUSH) for p in payloads
+    ]
+
+
+def make_gateway(pool):
+    return GatewayClient(
+        http_client=object(),
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        decode_pool=pool,
+    )
+
+
+def test_decode_pool_rejects_unknown_executor():
+    with pytest.raises(ValueError):
+        DecodePool(executor="fiber")
+
+
+def test_decode_in_worker_uses_named_codec():
+    assert _decode_in_worker("json", b'{"op":11}') == {"op": 11}
+    assert _decode_in_worker("etf", etf_dumps({"op": 11})) == {"op": 11}
+
+
+@pytest.mark.asyncio
+async def test_large_frames_are_offloaded_in_order():
+    pool = DecodePool(threshold=64)
+    gw = make_gateway(pool)
+    small = b'{"t":"A","s":1,"op":0,"d":{}}'
+    large = (
+        b'{"t":"B","s":2,"op":0,"d":{"x":"' + os.urandom(2048).hex().encode() + b'"}}'
+    )
+    try:
+        for frame in frames(small, large, small.replace(b'"s":1', b'"s":3')):
+            await gw._process_message(DummyMessage(frame))
+    finally:
+        pool.close()
+
+    assert [name for name, _ in gw._dispatcher.events] == ["A", "B", "A"]
+    assert gw._last_sequence == 3
+    assert gw.decode_stats.frames == 3
+    assert gw.decode_stats.offloaded == 1
+
+
+@pytest.mark.asyncio
+async def test_process_pool_decodes_frames():
+    pool = DecodePool(threshold=0, executor="process", max_workers=1)
+    gw = make_gateway(pool)
+    try:
+        (frame,) = frames(b'{"t":"A","s":5,"op":0,"d":{"k":1}}')
+        await gw._process_message(DummyMessage(frame))
+    finally:
+        pool.close()
+
+    assert gw._dispatcher.events == [("A", {"k": 1})]
+
+
+@pytest.mark.asyncio
+async def test_loop_stall_monitor_records_blocking():
+    monitor = LoopStallMonitor(interval=0.005, threshold=0.02)
+    monitor.start()
+    await asyncio.sleep(0.01)
+    time.sleep(0.05)
+    await asyncio.sleep(0.01)
+    await monitor.stop()
+
+    assert monitor.stalls >= 1
+    assert monitor.max_stall >= 0.02
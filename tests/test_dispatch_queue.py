@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from disagreement.dispatch_queue import DispatchQueue
+from disagreement.gateway import GatewayClient
+
+
+@pytest.mark.asyncio
+async def test_high_priority_events_skip_backlog():
+    queue = DispatchQueue(maxsize=10)
+    await queue.put("PRESENCE_UPDATE", 1)
+    await queue.put("MESSAGE_CREATE", 2)
+    await queue.put("INTERACTION_CREATE", 3)
+
+    assert [await queue.get() for _ in range(3)] == [
+        ("INTERACTION_CREATE", 3),
+        ("MESSAGE_CREATE", 2),
+        ("PRESENCE_UPDATE", 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_discards_same_event_type():
+    queue = DispatchQueue(maxsize=2, overflow="drop_oldest")
+    await queue.put("MESSAGE_CREATE", 1)
+    await queue.put("TYPING_START", 2)
+    await queue.put("TYPING_START", 3)
+
+    assert len(queue) == 2
+    assert queue.dropped["TYPING_START"] == 1
+    assert [await queue.get() for _ in range(2)] == [
+        ("MESSAGE_CREATE", 1),
+        ("TYPING_START", 3),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_evicts_lower_priority_lane():
+    queue = DispatchQueue(maxsize=1, overflow="drop_oldest")
+    await queue.put("PRESENCE_UPDATE", 1)
+    await queue.put("INTERACTION_CREATE", 2)
+
+    assert queue.dropped["PRESENCE_UPDATE"] == 1
+    assert await queue.get() == ("INTERACTION_CREATE", 2)
+
+
+@pytest.mark.asyncio
+async def test_spill_returns_false_when_full():
+    queue = DispatchQueue(maxsize=1, overflow="spill")
+    assert await queue.put("MESSAGE_CREATE", 1)
+    assert not await queue.put("MESSAGE_CREATE", 2)
+    assert queue.spilled == 1
+
+
+@pytest.mark.asyncio
+async def test_block_waits_for_space():
+    queue = DispatchQueue(maxsize=1)
+    await queue.put("MESSAGE_CREATE", 1)
+    put = asyncio.create_task(queue.put("MESSAGE_CREATE", 2))
+    await asyncio.sleep(0)
+    assert not put.done()
+
+    assert await queue.get() == ("MESSAGE_CREATE", 1)
+    await asyncio.wait_for(put, 1)
+    assert await queue.get() == ("MESSAGE_CREATE", 2)
+
+
+@pytest.mark.asyncio
+async def test_block_never_drops_and_serves_high_priority_first():
+    queue = DispatchQueue(maxsize=2)
+    await queue.put("PRESENCE_UPDATE", 1)
+    await queue.put("PRESENCE_UPDATE", 2)
+    put = asyncio.create_task(queue.put("INTERACTION_CREATE", "i"))
+    await asyncio.sleep(0)
+    assert not put.done()
+
+    assert await queue.get() == ("PRESENCE_UPDATE", 1)
+    await asyncio.wait_for(put, 1)
+    assert not queue.dropped
+    assert await queue.get() == ("INTERACTION_CREATE", "i")
+    assert await queue.get() == ("PRESENCE_UPDATE", 2)
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        DispatchQueue(overflow="discard")
+
+
+class SlowDispatcher:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.events = []
+
+    async def dispatch(self, event_name, data):
+        await self.release.wait()
+        self.events.append(event_name)
+
+
+@pytest.mark.asyncio
+async def test_gateway_ingest_does_not_wait_for_listeners():
+    dispatcher = SlowDispatcher()
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=dispatcher,
+        token="t",
+        intents=0,
+        client_instance=object(),
+        dispatch_queue_size=10,
+    )
+    gw._dispatch_task = asyncio.create_task(gw._dispatch_loop())
+
+    for seq, name in enumerate(["PRESENCE_UPDATE", "MESSAGE_CREATE"], start=1):
+        await asyncio.wait_for(
+            gw._handle_dispatch({"op": 0, "t": name, "s": seq, "d": {}}), 1
+        )
+    assert gw._last_sequence == 2
+
+    dispatcher.release.set()
+    while len(dispatcher.events) < 2:
+        await asyncio.sleep(0)
+    gw._dispatch_task.cancel()
+
+    assert dispatcher.events == ["PRESENCE_UPDATE", "MESSAGE_CREATE"]
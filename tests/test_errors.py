@@ -42,7 +42,7 @@ class MockAiohttpResponse:
         self._json_data = json_data
         self.headers = headers or {"Content-Type": "application/json"}
 
-    async def json(self):
+    async def json(self, loads=None):
         return self._json_data
 
     async def text(self):
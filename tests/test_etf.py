@@ -0,0 +1,142 @@
+import asyncio
+import zlib
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from disagreement import etf
+from disagreement.enums import GatewayOpcode
+from disagreement.gateway import GatewayClient
+
+
+class DummyDispatcher:
+    async def dispatch(self, *_):
+        pass
+
+
+class DummyClient:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.application_id = None
+
+
+def make_gateway(**kwargs):
+    return GatewayClient(
+        http_client=object(),
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        **kwargs,
+    )
+
+
+def test_round_trip_matches_json_shapes():
+    payload = {
+        "op": 0,
+        "s": 42,
+        "t": "GUILD_CREATE",
+        "d": {
+            "id": 81384788765712384,
+            "owner_id": 81384788765712385,
+            "roles": [81384788765712386],
+            "name": "café",
+            "unavailable": False,
+            "icon": None,
+            "ratio": 0.5,
+            "negative": -7,
+            "components": [{"id": 3, "type": 1}],
+            "activities": [{"timestamps": {"start": 1700000000000}}],
+            "members": [],
+        },
+    }
+
+    decoded = etf.loads(etf.dumps(payload, atom_keys=True))
+
+    assert decoded == etf.loads(etf.dumps(payload))
+    assert decoded["d"] == {
+        "id": "81384788765712384",
+        "owner_id": "81384788765712385",
+        "roles": ["81384788765712386"],
+        "name": "café",
+        "unavailable": False,
+        "icon": None,
+        "ratio": 0.5,
+        "negative": -7,
+        "components": [{"id": 3, "type": 1}],
+        "activities": [{"timestamps": {"start": 1700000000000}}],
+        "members": [],
+    }
+    assert decoded["s"] == 42
+
+
+def test_snowflake_map_keys_match_json():
+    user_id = 81384788765712384
+    role_id = 81384788765712386
+    payload = {
+        "t": "INTERACTION_CREATE",
+        "d": {
+            "id": 81384788765712390,
+            "type": 2,
+            "data": {
+                "id": 81384788765712391,
+                "name": "info",
+                "options": [{"name": "user", "type": 6, "value": user_id}],
+                "resolved": {
+                    "users": {user_id: {"id": user_id, "username": "u"}},
+                    "members": {user_id: {"roles": [role_id], "nick": None}},
+                    "roles": {role_id: {"id": role_id, "name": "r", "position": 1}},
+                },
+            },
+        },
+    }
+
+    resolved = etf.loads(etf.dumps(payload, atom_keys=True))["d"]["data"]["resolved"]
+
+    assert resolved == {
+        "users": {str(user_id): {"id": str(user_id), "username": "u"}},
+        "members": {str(user_id): {"roles": [str(role_id)], "nick": None}},
+        "roles": {str(role_id): {"id": str(role_id), "name": "r", "position": 1}},
+    }
+    assert etf.loads(etf.dumps({1: "a"})) == {1: "a"}
+
+
+def test_compressed_term():
+    body = etf.dumps({"a": "b"})[1:]
+    data = b"\x83P" + len(body).to_bytes(4, "big") + zlib.compress(body)
+    assert etf.loads(data) == {"a": "b"}
+
+
+def test_invalid_data_raises_value_error():
+    with pytest.raises(ValueError):
+        etf.loads(b'{"op": 1}')
+    with pytest.raises(ValueError):
+        etf.loads(etf.dumps({"a": "b"})[:-1])
+
+
+@pytest.mark.asyncio
+async def test_gateway_decodes_etf_frames():
+    gw = make_gateway(encoding="etf")
+    compressor = zlib.compressobj()
+    frame = compressor.compress(etf.dumps({"op": 11, "d": None}))
+    frame += compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    assert await gw._decompress_message(frame) == {"op": 11, "d": None}
+
+
+@pytest.mark.asyncio
+async def test_gateway_sends_etf_as_binary():
+    gw = make_gateway(encoding="etf")
+    gw._ws = MagicMock(closed=False, send_bytes=AsyncMock(), send_str=AsyncMock())
+
+    await gw._send_json({"op": GatewayOpcode.HEARTBEAT, "d": 5})
+
+    sent = gw._ws.send_bytes.await_args.args[0]
+    assert etf.loads(sent) == {"op": 1, "d": 5}
+    gw._ws.send_str.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_gateway_rejects_unknown_encoding():
+    with pytest.raises(ValueError):
+        make_gateway(encoding="xml")
@@ -100,3 +100,55 @@ async def test_raw_event_dispatched_before_parsing():
     assert events["raw"]["id"] == "1"
     assert events["cache_before"] == "cached"
     assert events["cache_after"] is None
+
+
+@pytest.mark.asyncio
+async def test_listener_signature_resolved_once(monkeypatch):
+    import inspect
+
+    from disagreement import event_dispatcher as module
+
+    calls = 0
+    real_signature = inspect.signature
+
+    def counting_signature(obj):
+        nonlocal calls
+        calls += 1
+        return real_signature(obj)
+
+    monkeypatch.setattr(module.inspect, "signature", counting_signature)
+    dispatcher = EventDispatcher(DummyClient())
+    seen = []
+
+    async def no_args():
+        seen.append("none")
+
+    async def one_arg(payload):
+        seen.append(payload)
+
+    dispatcher.register("TEST_EVENT", no_args)
+    dispatcher.register("TEST_EVENT", one_arg)
+    for _ in range(3):
+        await dispatcher.dispatch("TEST_EVENT", 1)
+
+    assert calls == 2
+    assert seen == ["none", 1] * 3
+
+
+@pytest.mark.asyncio
+async def test_invocation_table_rebuilt_on_unregister():
+    dispatcher = EventDispatcher(DummyClient())
+    seen = []
+
+    async def first(_):
+        seen.append("first")
+
+    async def second(_):
+        seen.append("second")
+
+    dispatcher.register("TEST_EVENT", first)
+    dispatcher.register("TEST_EVENT", second)
+    dispatcher.unregister("TEST_EVENT", first)
+    await dispatcher.dispatch("TEST_EVENT", {})
+
+    assert seen == ["second"]
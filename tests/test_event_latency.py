@@ -0,0 +1,119 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from disagreement.event_dispatcher import EventDispatcher
+from disagreement.gateway import GatewayClient
+from disagreement.latency import EventLatencyTracker, LatencyHistogram
+
+
+def test_histogram_percentiles_within_one_bucket():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 100
+    assert histogram.max == pytest.approx(0.1)
+    assert 0.050 <= histogram.percentile(0.5) <= 0.050 * LatencyHistogram.GROWTH
+    assert 0.099 <= histogram.percentile(0.99) <= 0.1
+    assert histogram.summary()["mean"] == pytest.approx(0.0505)
+
+
+def test_histogram_clamps_extremes():
+    histogram = LatencyHistogram()
+    histogram.record(0.0)
+    histogram.record(1e9)
+    assert histogram.counts[0] == 1
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(1.0) == 1e9
+
+
+class DummyClient:
+    pass
+
+
+def _gateway(tracker, **kwargs):
+    dispatcher = EventDispatcher(DummyClient())
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=dispatcher,
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        latency_tracker=tracker,
+        **kwargs,
+    )
+    return gw, dispatcher
+
+
+def _frame(event_name, seq):
+    payload = {"op": 0, "t": event_name, "s": seq, "d": {"value": seq}}
+    return SimpleNamespace(type=aiohttp.WSMsgType.TEXT, data=json.dumps(payload))
+
+
+@pytest.mark.asyncio
+async def test_stages_and_listeners_are_recorded():
+    tracker = EventLatencyTracker()
+    gw, dispatcher = _gateway(tracker)
+
+    async def slow_listener(data):
+        await asyncio.sleep(0.01)
+
+    async def fast_listener(data):
+        pass
+
+    dispatcher.register("SOME_EVENT", slow_listener)
+    dispatcher.register("SOME_EVENT", fast_listener)
+    dispatcher._event_parsers["SOME_EVENT"] = lambda data: data["value"]
+
+    for seq in (1, 2):
+        await gw._process_message(_frame("SOME_EVENT", seq))
+
+    report = tracker.report()["SOME_EVENT"]
+    for stage in ("decode", "queue", "parse", "total"):
+        assert report[stage]["count"] == 2
+    slow = report["listener:test_stages_and_listeners_are_recorded.<locals>.slow_listener"]
+    assert slow["count"] == 2
+    assert slow["p50"] >= 0.009
+    assert report["total"]["max"] >= slow["max"]
+    assert tracker.slowest_listeners(1)[0][1].endswith("slow_listener")
+
+
+@pytest.mark.asyncio
+async def test_timing_survives_dispatch_queue():
+    tracker = EventLatencyTracker()
+    gw, dispatcher = _gateway(tracker, dispatch_queue_size=10)
+    seen = []
+
+    async def listener(data):
+        seen.append(data)
+
+    dispatcher.register("SOME_EVENT", listener)
+    await gw._process_message(_frame("SOME_EVENT", 1))
+    await asyncio.sleep(0.01)
+    gw._dispatch_task = asyncio.create_task(gw._dispatch_loop())
+    while not seen:
+        await asyncio.sleep(0)
+    gw._dispatch_task.cancel()
+
+    assert seen == [{"value": 1}]
+    report = tracker.report()["SOME_EVENT"]
+    assert report["queue"]["max"] >= 0.009
+    assert report["total"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default():
+    gw, dispatcher = _gateway(None)
+    seen = []
+
+    async def listener(data):
+        seen.append(data)
+
+    dispatcher.register("SOME_EVENT", listener)
+    await gw._process_message(_frame("SOME_EVENT", 1))
+    assert seen == [{"value": 1}]
+    assert gw.event_latency is None
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from disagreement.client import Client
+from disagreement.errors import AuthenticationError
+from disagreement.fake_discord import FakeDiscord
+from disagreement.http import HTTPClient
+
+
+async def _wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.02)
+
+
+def _client(fake, **kwargs):
+    return Client(
+        token=fake.token,
+        sync_commands_on_ready=False,
+        http_options={"base_url": fake.api_url},
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_connects_and_caches_guilds():
+    async with FakeDiscord(guilds=3, members_per_guild=10) as fake:
+        client = _client(fake)
+        try:
+            await client.connect()
+            await asyncio.wait_for(client.wait_until_ready(), 5)
+            await _wait_for(lambda: len(client.guilds) == 3)
+            assert client.user.id == fake.application_id
+            assert fake.stats.identifies == 1
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_resumes_after_injected_reconnect():
+    async with FakeDiscord(event_rate=50) as fake:
+        client = _client(fake)
+        try:
+            await client.connect()
+            await asyncio.wait_for(client.wait_until_ready(), 5)
+            assert await fake.inject_reconnect() == 1
+            await _wait_for(lambda: fake.stats.resumes == 1)
+            assert fake.stats.identifies == 1
+            assert fake.stats.connections == 2
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_resumes_after_dropped_connection():
+    async with FakeDiscord() as fake:
+        client = _client(fake)
+        try:
+            await client.connect()
+            await asyncio.wait_for(client.wait_until_ready(), 5)
+            await fake.drop_connections()
+            await _wait_for(lambda: fake.stats.resumes == 1)
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_rest_rate_limit_headers_are_respected():
+    async with FakeDiscord(rest_rate_limit=2, rest_rate_window=0.2) as fake:
+        http = HTTPClient(token=fake.token, base_url=fake.api_url)
+        try:
+            results = [await http.request("GET", "/users/@me") for _ in range(5)]
+        finally:
+            await http.close()
+        assert all(r["id"] == fake.application_id for r in results)
+        assert fake.stats.rate_limited == 0
+
+
+@pytest.mark.asyncio
+async def test_rest_rejects_wrong_token():
+    async with FakeDiscord() as fake:
+        http = HTTPClient(token="wrong", base_url=fake.api_url)
+        try:
+            with pytest.raises(AuthenticationError):
+                await http.request("GET", "/users/@me")
+        finally:
+            await http.close()
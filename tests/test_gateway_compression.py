@@ -0,0 +1,143 @@
+import asyncio
+import zlib
+
+import pytest
+
+from disagreement.compression import ZlibStreamInflater
+from disagreement.errors import DecompressionLimitExceeded
+from disagreement.gateway import GatewayClient
+
+
+def frames(*payloads):
+    compressor = zlib.compressobj()
+    return [
+        compressor.compress(p) + compressor.flush(zlib.Z_SYNC_FLUSH) for p in payloads
+    ]
+
+
+def test_inflater_handles_stream_and_fragments():
+    inflater = ZlibStreamInflater()
+    first, second = frames(b'{"op":10}', b'{"op":11}')
+
+    assert inflater.feed(first) == b'{"op":10}'
+    assert inflater.feed(second[:3]) is None
+    assert inflater.feed(memoryview(second)[3:]) == b'{"op":11}'
+
+
+def test_inflater_enforces_size_limit():
+    inflater = ZlibStreamInflater(max_size=16)
+    (frame,) = frames(b"x" * 64)
+
+    with pytest.raises(DecompressionLimitExceeded):
+        inflater.feed(frame)
+
+
+def test_inflater_reset_starts_new_stream():
+    inflater = ZlibStreamInflater()
+    inflater.feed(frames(b"{}")[0])
+    inflater.reset()
+    assert inflater.feed(frames(b"[]")[0]) == b"[]"
+
+
+class DummyDispatcher:
+    async def dispatch(self, *_):
+        pass
+
+
+class DummyClient:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+
+
+@pytest.mark.asyncio
+async def test_gateway_raises_when_payload_too_large():
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        max_decompression_size=8,
+    )
+    small, large = frames(b'{"op":1}', b'{"op":0,"d":"' + b"x" * 32 + b'"}')
+
+    assert await gw._decompress_message(small) == {"op": 1}
+    with pytest.raises(DecompressionLimitExceeded):
+        await gw._decompress_message(large)
+
+
+def test_create_inflater_falls_back_without_zstd(monkeypatch):
+    from disagreement import compression
+
+    monkeypatch.setattr(compression, "ZSTD_AVAILABLE", False)
+    method, inflater = compression.create_inflater("zstd-stream")
+
+    assert method == "zlib-stream"
+    assert isinstance(inflater, ZlibStreamInflater)
+
+
+def test_create_inflater_rejects_unknown_method():
+    from disagreement.compression import create_inflater
+
+    with pytest.raises(ValueError):
+        create_inflater("brotli")
+
+
+def test_zstd_inflater_stream_and_limit():
+    zstandard = pytest.importorskip("zstandard")
+    from disagreement.compression import ZstdStreamInflater
+
+    compressor = zstandard.ZstdCompressor().compressobj()
+
+    def frame(data):
+        return compressor.compress(data) + compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    inflater = ZstdStreamInflater(max_size=32)
+    assert inflater.feed(frame(b'{"op":10}')) == b'{"op":10}'
+    assert inflater.feed(frame(b'{"op":11}')) == b'{"op":11}'
+    with pytest.raises(DecompressionLimitExceeded):
+        inflater.feed(frame(b"x" * 64))
+
+
+def test_zstandard_inflater_stops_at_limit(monkeypatch):
+    zstandard = pytest.importorskip("zstandard")
+    from disagreement import compression
+
+    monkeypatch.setattr(compression, "_stdlib_zstd", None)
+    inflater = compression.ZstdStreamInflater(max_size=1024)
+    # A bomb: 64 MiB of zeros compresses to a few KiB.
+    compressor = zstandard.ZstdCompressor().compressobj()
+    bomb = compressor.compress(b"\0" * (64 * 1024 * 1024)) + compressor.flush(
+        zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    )
+    produced = []
+
+    class Tracking:
+        def __init__(self, inner):
+            self.inner = inner
+
+        def decompress(self, chunk):
+            out = self.inner.decompress(chunk)
+            produced.append(len(out))
+            return out
+
+    inflater._decompressor = Tracking(inflater._decompressor)
+    with pytest.raises(DecompressionLimitExceeded):
+        inflater.feed(bomb)
+    assert sum(produced) < 4 * 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_gateway_uses_requested_compression():
+    pytest.importorskip("zstandard")
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        compress="zstd-stream",
+    )
+    assert gw._compress == "zstd-stream"
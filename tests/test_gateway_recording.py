@@ -0,0 +1,161 @@
+import asyncio
+import builtins
+import json
+import threading
+import zlib
+
+import aiohttp
+import pytest
+
+from disagreement.client import Client
+from disagreement.gateway import GatewayClient
+from disagreement.json_codec import StdlibJSONCodec
+from disagreement.recording import (
+    FRAME_BINARY,
+    FRAME_CONNECT,
+    GatewayRecorder,
+    read_recording,
+)
+from disagreement.replay import replay
+
+
+class DummyDispatcher:
+    async def dispatch(self, *_):
+        pass
+
+
+class DummyClient:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+
+
+def _guild(guild_id):
+    return {
+        "id": guild_id,
+        "name": "g",
+        "owner_id": "1",
+        "afk_timeout": 60,
+        "verification_level": 0,
+        "default_message_notifications": 0,
+        "explicit_content_filter": 0,
+        "roles": [],
+        "emojis": [],
+        "features": [],
+        "mfa_level": 0,
+        "system_channel_flags": 0,
+        "premium_tier": 0,
+        "nsfw_level": 0,
+        "channels": [],
+        "members": [],
+    }
+
+
+def _frames(*payloads):
+    compressor = zlib.compressobj()
+    return [
+        compressor.compress(json.dumps(p).encode())
+        + compressor.flush(zlib.Z_SYNC_FLUSH)
+        for p in payloads
+    ]
+
+
+def _record(path, *payloads):
+    recorder = GatewayRecorder(path, {"encoding": "json", "compress": "zlib-stream"})
+    recorder.mark_connect()
+    for frame in _frames(*payloads):
+        recorder.record(aiohttp.WSMsgType.BINARY, frame)
+    recorder.close()
+
+
+@pytest.mark.asyncio
+async def test_gateway_records_raw_frames(tmp_path):
+    path = tmp_path / "shard.rec"
+    recorder = GatewayRecorder(path)
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        shard_id=2,
+        shard_count=4,
+        recorder=recorder,
+    )
+    (frame,) = _frames({"op": 11})
+
+    await gw._process_message(aiohttp.WSMessage(aiohttp.WSMsgType.BINARY, frame, None))
+    recorder.close()
+
+    metadata, frames = read_recording(path)
+    assert metadata["shard_id"] == 2
+    assert metadata["compress"] == "zlib-stream"
+    assert [(f.kind, f.data) for f in frames] == [(FRAME_BINARY, frame)]
+
+
+def test_recorder_writes_off_calling_thread_with_codec(tmp_path, monkeypatch):
+    writers = []
+
+    def tracking_open(*args, **kwargs):
+        writers.append(threading.current_thread())
+        return builtins.open(*args, **kwargs)
+
+    class TrackingCodec(StdlibJSONCodec):
+        def __init__(self):
+            self.dumped = []
+
+        def dumps_bytes(self, obj):
+            self.dumped.append(obj)
+            return super().dumps_bytes(obj)
+
+    monkeypatch.setattr("disagreement.recording.open", tracking_open, raising=False)
+    codec = TrackingCodec()
+    path = tmp_path / "shard.rec"
+    recorder = GatewayRecorder(path, {"encoding": "json"}, json_codec=codec)
+    recorder.record(aiohttp.WSMsgType.TEXT, '{"op": 11}')
+    recorder.close()
+
+    assert writers and threading.current_thread() not in writers
+    assert codec.dumped[0]["encoding"] == "json"
+    metadata, frames = read_recording(path, codec)
+    assert metadata["encoding"] == "json"
+    assert [f.data for f in frames] == [b'{"op": 11}']
+
+
+def test_read_recording_ignores_truncated_tail(tmp_path):
+    path = tmp_path / "shard.rec"
+    _record(path, {"op": 11}, {"op": 11})
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+
+    _, frames = read_recording(path)
+    assert [f.kind for f in frames] == [FRAME_CONNECT, FRAME_BINARY]
+
+
+@pytest.mark.asyncio
+async def test_replay_feeds_events_and_cache(tmp_path):
+    path = tmp_path / "shard.rec"
+    _record(
+        path,
+        {"op": 10, "d": {"heartbeat_interval": 41250}},
+        {"t": "GUILD_CREATE", "s": 1, "op": 0, "d": _guild("123")},
+        {
+            "t": "TYPING_START",
+            "s": 2,
+            "op": 0,
+            "d": {"channel_id": "1", "user_id": "2", "timestamp": 0},
+        },
+    )
+    client = Client(token="t")
+    seen = []
+
+    @client.on_event("GUILD_CREATE")
+    async def on_guild(guild):
+        seen.append(guild.id)
+
+    stats = await replay(path, client)
+
+    assert seen == ["123"]
+    assert client.get_guild("123") is not None
+    assert stats.frames == 3
+    assert stats.dispatches == 2
+    await client.close()
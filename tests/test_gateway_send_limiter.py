@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from disagreement.enums import GatewayOpcode
+from disagreement.gateway import GatewayClient
+from disagreement.rate_limiter import GatewaySendLimiter
+
+
+@pytest.mark.asyncio
+async def test_critical_opcodes_use_reserved_capacity():
+    limiter = GatewaySendLimiter(limit=4, window=40.0, reserved=1)
+    for _ in range(3):
+        await limiter.acquire(GatewayOpcode.PRESENCE_UPDATE)
+
+    queued = asyncio.create_task(limiter.acquire(GatewayOpcode.PRESENCE_UPDATE))
+    await asyncio.sleep(0)
+    assert not queued.done()
+    assert limiter.queue_depth == 1
+
+    await asyncio.wait_for(limiter.acquire(GatewayOpcode.HEARTBEAT), 0.1)
+    queued.cancel()
+
+
+@pytest.mark.asyncio
+async def test_lanes_are_served_round_robin():
+    limiter = GatewaySendLimiter(limit=3, window=0.3, reserved=1)
+    await limiter.acquire(GatewayOpcode.REQUEST_GUILD_MEMBERS)
+    await limiter.acquire(GatewayOpcode.REQUEST_GUILD_MEMBERS)
+
+    order = []
+
+    async def send(opcode, label):
+        await limiter.acquire(opcode)
+        order.append(label)
+
+    tasks = [
+        asyncio.create_task(send(GatewayOpcode.REQUEST_GUILD_MEMBERS, f"members{i}"))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(send(GatewayOpcode.PRESENCE_UPDATE, "presence")))
+    await asyncio.wait_for(asyncio.gather(*tasks), 2)
+
+    assert order.index("presence") == 1
+    assert limiter.queue_depth == 0
+    assert limiter.queued == 4
+    assert limiter.max_wait > 0
+
+
+class DummyWS:
+    closed = False
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_str(self, data):
+        self.sent.append(data)
+
+
+@pytest.mark.asyncio
+async def test_gateway_send_goes_through_limiter():
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=object(),
+        token="t",
+        intents=0,
+        client_instance=object(),
+        send_limit=10,
+    )
+    gw._ws = DummyWS()
+
+    await gw.update_presence("online")
+    await gw._heartbeat()
+
+    assert len(gw._ws.sent) == 2
+    assert gw.send_limiter.sent == 2
+
+
+def test_send_limit_can_be_disabled():
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=object(),
+        token="t",
+        intents=0,
+        client_instance=object(),
+        send_limit=None,
+    )
+    assert gw.send_limiter is None
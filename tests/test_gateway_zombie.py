@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import aiohttp
+import pytest
+
+from disagreement.enums import GatewayOpcode
+from disagreement.gateway import GatewayClient
+
+
+class DummyDispatcher:
+    async def dispatch(self, *_):
+        pass
+
+
+class DummyClient:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+
+
+def make_gateway():
+    gw = GatewayClient(
+        http_client=object(),
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+    )
+    gw._heartbeat_interval = 10
+    gw._heartbeat = AsyncMock()
+    return gw
+
+
+@pytest.mark.asyncio
+async def test_missed_ack_closes_and_resumes(monkeypatch):
+    monkeypatch.setattr("disagreement.gateway.random.random", lambda: 0.0)
+    gw = make_gateway()
+    gw.close = AsyncMock()
+    gw._reconnect = AsyncMock()
+
+    await asyncio.wait_for(gw._keep_alive(), 1)
+    await asyncio.wait_for(gw._reconnect_task, 1)
+
+    assert gw._heartbeat.await_count == 1
+    assert gw.missed_heartbeat_acks == 1
+    assert gw.zombie_disconnects == 1
+    gw.close.assert_awaited_once_with(code=4000, reconnect=True)
+    gw._reconnect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_zombie_reconnect_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr("disagreement.gateway.random.random", lambda: 0.0)
+    gw = make_gateway()
+    gw.close = AsyncMock()
+    gw._reconnect = AsyncMock(side_effect=RuntimeError("down"))
+
+    await asyncio.wait_for(gw._keep_alive(), 1)
+    await asyncio.wait_for(gw._reconnect_task, 1)
+
+    assert gw.zombie_disconnects == 1
+    assert "Gateway reconnect failed: down" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_acked_heartbeats_keep_connection(monkeypatch):
+    monkeypatch.setattr("disagreement.gateway.random.random", lambda: 0.0)
+    gw = make_gateway()
+    gw._handle_zombie = Mock()
+
+    async def ack():
+        await gw._process_message(
+            aiohttp.WSMessage(
+                aiohttp.WSMsgType.TEXT, f'{{"op":{GatewayOpcode.HEARTBEAT_ACK.value}}}', None
+            )
+        )
+
+    gw._heartbeat.side_effect = ack
+    task = asyncio.create_task(gw._keep_alive())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert gw._heartbeat.await_count > 1
+    assert gw.missed_heartbeat_acks == 0
+    gw._handle_zombie.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_first_heartbeat_is_jittered(monkeypatch):
+    monkeypatch.setattr("disagreement.gateway.random.random", lambda: 0.5)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr("disagreement.gateway.asyncio.sleep", fake_sleep)
+    gw = make_gateway()
+    gw._heartbeat_interval = 40000
+
+    await gw._keep_alive()
+
+    assert sleeps == [20.0]
+    gw._heartbeat.assert_not_called()
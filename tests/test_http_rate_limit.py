@@ -12,7 +12,7 @@ class DummyResp:
         self._data = data or {}
         self.headers.setdefault("Content-Type", "application/json")
 
-    async def json(self):
+    async def json(self, loads=None):
         return self._data
 
     async def text(self):
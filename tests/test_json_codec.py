@@ -0,0 +1,82 @@
+import pytest
+
+from disagreement.enums import GatewayOpcode
+from disagreement.json_codec import (
+    JSONCodec,
+    StdlibJSONCodec,
+    available_codecs,
+    get_codec,
+)
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codec_round_trip(name):
+    codec = get_codec(name)
+    payload = {"op": GatewayOpcode.HEARTBEAT, "d": {"id": "1", "list": [1, 2.5, None]}}
+
+    encoded = codec.dumps(payload)
+    assert isinstance(encoded, str)
+    assert codec.loads(encoded) == {"op": 1, "d": {"id": "1", "list": [1, 2.5, None]}}
+    assert codec.loads(codec.dumps_bytes(payload)) == codec.loads(encoded)
+    assert codec.loads(memoryview(encoded.encode())) == codec.loads(encoded)
+
+
+@pytest.mark.parametrize("name", available_codecs())
+def test_codec_decode_error_is_value_error(name):
+    with pytest.raises(ValueError):
+        get_codec(name).loads(b"{not json")
+
+
+def test_get_codec_defaults_and_passthrough():
+    assert get_codec("auto").name in available_codecs()
+    assert isinstance(get_codec("stdlib"), StdlibJSONCodec)
+    custom = StdlibJSONCodec()
+    assert get_codec(custom) is custom
+    assert isinstance(get_codec(None), JSONCodec)
+
+
+def test_incomplete_codec_fails_on_instantiation():
+    class DecodeOnly(JSONCodec):
+        def loads(self, data):
+            return None
+
+    with pytest.raises(TypeError):
+        DecodeOnly()
+
+
+def test_get_codec_unknown_name():
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.asyncio
+async def test_http_client_encodes_body_with_codec(monkeypatch):
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    from disagreement.http import HTTPClient
+
+    class DummyResp:
+        status = 204
+        headers = {}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def text(self):
+            return ""
+
+    http = HTTPClient(token="t", json_codec="json")
+    monkeypatch.setattr(http, "_ensure_session", AsyncMock())
+    http._session = SimpleNamespace(request=MagicMock(return_value=DummyResp()))
+    http._rate_limiter.acquire = AsyncMock()
+    http._rate_limiter.release = MagicMock()
+
+    await http.request("POST", "/a", payload={"content": "hi"})
+
+    kwargs = http._session.request.call_args.kwargs
+    assert kwargs["data"] == b'{"content":"hi"}'
+    assert kwargs["headers"]["Content-Type"] == "application/json"
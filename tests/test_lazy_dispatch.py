@@ -0,0 +1,133 @@
+import zlib
+
+import aiohttp
+import pytest
+
+from disagreement.event_dispatcher import EventDispatcher
+from disagreement.gateway import GatewayClient, _peek_dispatch
+
+
+class DummyClient:
+    def __init__(self):
+        self.parsed = []
+
+
+class RecordingDispatcher(EventDispatcher):
+    def __init__(self):
+        super().__init__(DummyClient())
+        self.dispatched = []
+
+    async def dispatch(self, event_name, raw_data):
+        self.dispatched.append(event_name)
+        await super().dispatch(event_name, raw_data)
+
+
+class DummyMessage:
+    def __init__(self, data):
+        self.type = aiohttp.WSMsgType.BINARY
+        self.data = data
+
+
+def frame(payload: bytes) -> bytes:
+    compressor = zlib.compressobj()
+    return compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def make_gateway(dispatcher, **kwargs):
+    return GatewayClient(
+        http_client=object(),
+        event_dispatcher=dispatcher,
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        **kwargs,
+    )
+
+
+def test_peek_dispatch_reads_header():
+    assert _peek_dispatch(b'{"t":"TYPING_START","s":42,"op":0,"d":{}}') == (
+        "TYPING_START",
+        42,
+    )
+    assert _peek_dispatch(b'{"t":null,"s":null,"op":11,"d":null}') is None
+    # ``d`` first means the header cannot be trusted without a full decode.
+    assert _peek_dispatch(b'{"d":{"t":"X"},"t":"TYPING_START","s":1,"op":0}') is None
+
+
+def test_interest_set_tracks_listeners_and_waiters():
+    dispatcher = EventDispatcher(DummyClient())
+
+    async def listener(_):
+        pass
+
+    assert not dispatcher.wants("PRESENCE_UPDATE")
+    assert dispatcher.wants("MESSAGE_CREATE")  # needed by the message cache
+
+    dispatcher.register("RAW_PRESENCE_UPDATE", listener)
+    assert dispatcher.wants("PRESENCE_UPDATE")
+    dispatcher.unregister("RAW_PRESENCE_UPDATE", listener)
+    assert not dispatcher.wants("PRESENCE_UPDATE")
+
+    future = object()
+    dispatcher.add_waiter("TYPING_START", future)
+    assert dispatcher.wants("TYPING_START")
+    dispatcher.remove_waiter("TYPING_START", future)
+    assert not dispatcher.wants("TYPING_START")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_skips_parsing_without_consumers():
+    dispatcher = EventDispatcher(DummyClient())
+
+    def parser(_):
+        raise AssertionError("parser should not run")
+
+    dispatcher._event_parsers["PRESENCE_UPDATE"] = parser
+    await dispatcher.dispatch("PRESENCE_UPDATE", {"user": {"id": "1"}})
+
+
+@pytest.mark.asyncio
+async def test_gateway_skips_uninteresting_dispatch():
+    dispatcher = RecordingDispatcher()
+    gw = make_gateway(dispatcher)
+
+    await gw._process_message(
+        DummyMessage(frame(b'{"t":"PRESENCE_UPDATE","s":7,"op":0,"d":{"a":1}}'))
+    )
+
+    assert dispatcher.dispatched == []
+    assert gw._last_sequence == 7
+    assert gw.skipped_dispatches == 1
+
+
+@pytest.mark.asyncio
+async def test_gateway_decodes_dispatch_with_listener():
+    dispatcher = RecordingDispatcher()
+    received = []
+
+    async def listener(data):
+        received.append(data)
+
+    dispatcher.register("TYPING_START", listener)
+    dispatcher._event_parsers["TYPING_START"] = lambda data: data
+    gw = make_gateway(dispatcher)
+
+    await gw._process_message(
+        DummyMessage(frame(b'{"t":"TYPING_START","s":3,"op":0,"d":{"a":1}}'))
+    )
+
+    assert dispatcher.dispatched == ["TYPING_START"]
+    assert received == [{"a": 1}]
+    assert gw._last_sequence == 3
+
+
+@pytest.mark.asyncio
+async def test_lazy_dispatch_can_be_disabled():
+    dispatcher = RecordingDispatcher()
+    gw = make_gateway(dispatcher, lazy_dispatch=False)
+
+    await gw._process_message(
+        DummyMessage(frame(b'{"t":"PRESENCE_UPDATE","s":9,"op":0,"d":{}}'))
+    )
+
+    assert dispatcher.dispatched == ["PRESENCE_UPDATE"]
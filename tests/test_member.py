@@ -111,3 +111,18 @@ def test_guild_permissions_administrator_role_grants_all():
     member = _member(guild, client, admin)
 
     assert member.guild_permissions == Permissions(~0)
+
+
+def test_cached_models_have_no_instance_dict():
+    client = DummyClient()
+    guild = _base_guild(client)
+    role = _role(guild, "2", Permissions.VIEW_CHANNEL)
+    member = _member(guild, client, role)
+
+    for model in (guild, role, member):
+        assert not hasattr(model, "__dict__")
+    with pytest.raises(AttributeError):
+        member.not_an_attribute = 1
+
+    member.avatar = "https://cdn.discordapp.com/avatars/1/a.png"
+    assert member.avatar is not None and member.avatar.url.endswith("a.png")
@@ -0,0 +1,249 @@
+import asyncio
+
+import pytest
+
+from disagreement.cache import MemberCache
+from disagreement.caching import MemberCacheFlags
+from disagreement.client import Client
+from disagreement.enums import GatewayIntent
+from disagreement.errors import GatewayException
+from disagreement.fake_discord import FakeDiscord
+from disagreement.gateway import GatewayClient
+from disagreement.member_chunks import MemberChunkStream, parse_chunk_members
+
+
+class DummyDispatcher:
+    async def dispatch(self, *_):
+        pass
+
+
+class DummyClient:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.parsed = []
+
+    def parse_member(self, data, guild_id):
+        from disagreement.models import Member
+
+        member = Member(data)
+        member.guild_id = str(guild_id)
+        self.parsed.append(member)
+        return member
+
+
+def _member(user_id):
+    return {
+        "user": {"id": str(user_id), "username": f"u{user_id}"},
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00.000000+00:00",
+    }
+
+
+def _chunk(guild_id, nonce, index, count, ids, **extra):
+    return {
+        "guild_id": guild_id,
+        "nonce": nonce,
+        "chunk_index": index,
+        "chunk_count": count,
+        "members": [_member(i) for i in ids],
+        **extra,
+    }
+
+
+def _gateway(client, intents=0, **kwargs):
+    gw = GatewayClient(
+        http_client=None,
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=intents,
+        client_instance=client,
+        **kwargs,
+    )
+    sent = []
+
+    async def send(payload):
+        sent.append(payload)
+
+    gw._send_json = send
+    return gw, sent
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_parsed_batches_as_chunks_arrive():
+    client = DummyClient()
+    gw, sent = _gateway(client)
+    stream = await gw.request_members("1")
+    nonce = sent[0]["d"]["nonce"]
+    assert sent[0]["d"]["guild_id"] == "1"
+
+    gw._handle_member_chunk(_chunk("1", nonce, 0, 2, [10, 11]))
+    first = await stream.__anext__()
+    assert [m.id for m in first] == ["10", "11"]
+    assert first[0].guild_id == "1"
+    assert len(client.parsed) == 2  # cache fed before the stream is consumed
+
+    gw._handle_member_chunk(_chunk("1", nonce, 1, 2, [12], not_found=["99"]))
+    rest = [batch async for batch in stream]
+    assert [m.id for m in rest[0]] == ["12"]
+    assert stream.received == 3
+    assert stream.not_found == ["99"]
+    assert nonce not in gw._member_chunk_requests
+
+
+@pytest.mark.asyncio
+async def test_multi_guild_request_shares_one_stream():
+    client = DummyClient()
+    gw, sent = _gateway(client)
+    stream = await gw.request_members(["1", "2", "1"])
+    assert [p["d"]["guild_id"] for p in sent] == ["1", "2"]
+    nonce = sent[0]["d"]["nonce"]
+    assert sent[1]["d"]["nonce"] == nonce
+
+    gw._handle_member_chunk(_chunk("2", nonce, 0, 1, [20]))
+    assert not stream.done
+    gw._handle_member_chunk(_chunk("1", nonce, 0, 1, [10]))
+    members = await stream.flatten()
+    assert sorted(m.id for m in members) == ["10", "20"]
+
+
+@pytest.mark.asyncio
+async def test_abandoned_requests_expire():
+    client = DummyClient()
+    gw, sent = _gateway(client)
+    stream = await gw.request_members("1", timeout=0.01)
+    await asyncio.sleep(0.02)
+    gw._expire_member_requests()
+    assert gw._member_chunk_requests == {}
+    with pytest.raises(asyncio.TimeoutError):
+        await stream.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_stream_times_out_waiting_for_chunk():
+    stream = MemberChunkStream("n", ["1"], timeout=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        await stream.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_final_close_fails_open_streams():
+    client = DummyClient()
+    gw, _ = _gateway(client)
+    stream = await gw.request_members("1")
+    await gw.close()
+    with pytest.raises(GatewayException):
+        await stream.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_unrequested_chunks_still_feed_cache():
+    client = DummyClient()
+    gw, _ = _gateway(client)
+    gw._handle_member_chunk(_chunk("1", None, 0, 1, [10]))
+    assert [m.id for m in client.parsed] == ["10"]
+
+
+def test_chunk_presences_apply_before_caching():
+    client = Client(token="t")
+    guild = type("Guild", (), {})()
+    guild._members = MemberCache(MemberCacheFlags(joined=False, voice=False))
+    client._guilds.set("1", guild)
+    presences = [
+        {"user": {"id": "10"}, "status": "online"},
+        {"user": {"id": "11"}, "status": "offline"},
+    ]
+
+    members = parse_chunk_members(
+        _chunk("1", None, 0, 1, [10, 11], presences=presences), client
+    )
+
+    assert [m.status for m in members] == ["online", "offline"]
+    assert guild._members.get("10").status == "online"
+    assert guild._members.get("11") is None
+
+
+@pytest.mark.asyncio
+async def test_chunking_requires_members_intent():
+    client = DummyClient()
+    gw, _ = _gateway(client, chunk_guilds=True)
+    assert gw.chunker is None
+    gw, _ = _gateway(client, intents=GatewayIntent.GUILD_MEMBERS, chunk_guilds=True)
+    assert gw.chunker is not None
+
+
+@pytest.mark.asyncio
+async def test_startup_chunking_batches_guilds():
+    client = DummyClient()
+    gw, sent = _gateway(
+        client,
+        intents=GatewayIntent.GUILD_MEMBERS,
+        chunk_guilds=True,
+        chunk_concurrency=1,
+        chunk_batch_size=2,
+    )
+    for guild_id in ("1", "2", "3"):
+        gw._chunk_guild({"id": guild_id, "member_count": 5, "members": []})
+    gw._chunk_guild({"id": "4", "member_count": 1, "members": [_member(1)]})
+    gw._chunk_guild({"id": "5", "unavailable": True})
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    # One batch of two guilds in flight; the third waits for a slot.
+    assert [p["d"]["guild_id"] for p in sent] == ["1", "2"]
+    nonce = sent[0]["d"]["nonce"]
+    gw._handle_member_chunk(_chunk("1", nonce, 0, 1, [10]))
+    gw._handle_member_chunk(_chunk("2", nonce, 0, 1, [20]))
+    for _ in range(20):
+        if len(sent) == 3:
+            break
+        await asyncio.sleep(0)
+    assert [p["d"]["guild_id"] for p in sent] == ["1", "2", "3"]
+    await gw.chunker.close()
+
+
+@pytest.mark.asyncio
+async def test_client_streams_members_from_fake_discord():
+    async with FakeDiscord(guilds=2, members_per_guild=2500) as fake:
+        client = Client(
+            token=fake.token,
+            intents=GatewayIntent.default() | GatewayIntent.GUILD_MEMBERS,
+            sync_commands_on_ready=False,
+            http_options={"base_url": fake.api_url},
+        )
+        try:
+            await client.connect()
+            for _ in range(100):
+                if len(client.guilds) == 2:
+                    break
+                await asyncio.sleep(0.02)
+            guild_ids = [g["id"] for g in fake.guilds]
+            stream = await client.request_members(guild_ids)
+            batches = [len(batch) async for batch in stream]
+            assert sorted(batches) == [500, 500, 1000, 1000, 1000, 1000]
+            assert len(client.get_guild(guild_ids[0])._members.values()) == 2500
+        finally:
+            await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_chunks_large_guilds_at_startup():
+    async with FakeDiscord(guilds=3, members_per_guild=300) as fake:
+        client = Client(
+            token=fake.token,
+            intents=GatewayIntent.default() | GatewayIntent.GUILD_MEMBERS,
+            sync_commands_on_ready=False,
+            http_options={"base_url": fake.api_url},
+            chunk_guilds_at_startup=True,
+        )
+        try:
+            await client.connect()
+            for _ in range(200):
+                if len(client.guilds) == 3 and all(
+                    len(g._members.values()) == 300 for g in client.guilds
+                ):
+                    break
+                await asyncio.sleep(0.02)
+            assert [len(g._members.values()) for g in client.guilds] == [300, 300, 300]
+        finally:
+            await client.close()
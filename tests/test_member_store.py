@@ -0,0 +1,200 @@
+from array import array
+
+import pytest
+
+from disagreement.caching import MemberCacheFlags
+from disagreement.client import Client
+from disagreement.enums import (
+    ExplicitContentFilterLevel,
+    GuildNSFWLevel,
+    MFALevel,
+    MessageNotificationLevel,
+    PremiumTier,
+    VerificationLevel,
+)
+from disagreement.member_store import ColumnarMemberStore, MemberView
+from disagreement.models import Member
+
+
+def _guild_payload(gid: str, member_ids) -> dict:
+    return {
+        "id": gid,
+        "name": f"g{gid}",
+        "owner_id": "1",
+        "afk_timeout": 60,
+        "verification_level": VerificationLevel.NONE.value,
+        "default_message_notifications": MessageNotificationLevel.ALL_MESSAGES.value,
+        "explicit_content_filter": ExplicitContentFilterLevel.DISABLED.value,
+        "roles": [],
+        "emojis": [],
+        "features": [],
+        "mfa_level": MFALevel.NONE.value,
+        "system_channel_flags": 0,
+        "premium_tier": PremiumTier.NONE.value,
+        "nsfw_level": GuildNSFWLevel.DEFAULT.value,
+        "member_count": len(member_ids),
+        "members": [
+            {"user": {"id": mid, "username": f"u{mid}"}, "joined_at": "t", "roles": []}
+            for mid in member_ids
+        ],
+    }
+
+
+def _member(member_id: str, roles=(), **extra) -> Member:
+    data = {
+        "user": {
+            "id": member_id,
+            "username": f"u{member_id}",
+            "discriminator": "0",
+            "avatar": "a_" + "0f" * 16,
+        },
+        "joined_at": "2024-01-01T12:30:00.123456+00:00",
+        "roles": list(roles),
+        **extra,
+    }
+    member = Member(data)
+    member.guild_id = "1"
+    return member
+
+
+def test_store_round_trips_members_as_views():
+    store = ColumnarMemberStore("1", MemberCacheFlags.all())
+    original = _member("10", roles=["5", "6"], nick="n", deaf=True)
+    original.status = "idle"
+    store.set(original.id, original)
+
+    view = store.get("10")
+    assert isinstance(view, MemberView)
+    assert view == original
+    for name in ("id", "username", "nick", "roles", "joined_at", "status", "guild_id"):
+        assert getattr(view, name) == getattr(original, name)
+    assert view.deaf and not view.mute and not view.bot
+    assert view.avatar.url == original.avatar.url
+    assert view.display_name == "n"
+    assert store._sparse == {}  # every field fit a column
+
+    view.status = "offline"
+    view.roles = ["5"]
+    assert store.get("10").status == "offline"
+    assert store.get("10").roles == ["5"]
+    assert store.get("missing") is None
+
+
+def test_view_writes_role_changes_and_rejects_fixed_attributes():
+    store = ColumnarMemberStore("1", MemberCacheFlags.all())
+    store.set("10", _member("10", roles=["5"]))
+    view = store.get("10")
+
+    view.roles.append("6")
+    view.roles += ["7"]
+    view.roles.remove("5")
+    assert store.get("10").roles == ["6", "7"]
+
+    view.guild_id = "1"  # unchanged values are accepted
+    with pytest.raises(AttributeError):
+        view.guild_id = "2"
+    with pytest.raises(AttributeError):
+        view.id = "11"
+
+    store.invalidate("10")
+    with pytest.raises(AttributeError):
+        view.nick
+
+
+def test_store_keeps_unpackable_values_aside():
+    store = ColumnarMemberStore("1", MemberCacheFlags.all())
+    original = _member("10", joined_at="2024-01-01T00:00:00Z")
+    original.avatar = "https://example.com/a.png"
+    store.set(original.id, original)
+
+    view = store.get("10")
+    assert view.joined_at == "2024-01-01T00:00:00Z"
+    assert view.avatar.url == "https://example.com/a.png"
+    view.avatar = None
+    assert view.avatar is None
+
+
+def test_store_interns_role_sets_and_removes_by_swapping():
+    store = ColumnarMemberStore("1", MemberCacheFlags.all())
+    for i in range(1, 5):
+        store.set(str(i), _member(str(i), roles=["7"] if i % 2 else []))
+
+    assert len(store.role_sets) == 2
+    assert store.role_counts() == {"7": 2}
+    assert {m.id for m in store.with_role("7")} == {"1", "3"}
+
+    store.invalidate("1")
+    assert len(store) == 3
+    assert store.get("1") is None
+    assert store.get("4").username == "u4"
+    assert sorted(store.ids) == [2, 3, 4]
+
+
+def test_store_status_counts():
+    store = ColumnarMemberStore("1", MemberCacheFlags.all())
+    for i, status in enumerate(["online", "dnd", "offline", "online", "away"]):
+        member = _member(str(i + 1))
+        member.status = status
+        store.set(member.id, member)
+
+    assert store.online_count == 3
+    assert store.count_status("online") == 2
+    assert store.count_status("away") == 1
+    assert store.status_counts() == {"online": 2, "dnd": 1, "offline": 1, "away": 1}
+    assert isinstance(store.status_codes, array)
+
+
+def test_store_respects_member_cache_flags():
+    store = ColumnarMemberStore("1", MemberCacheFlags.none())
+    store.set("1", _member("1"))
+    assert len(store) == 0
+
+
+def test_client_uses_store_for_large_guilds():
+    client = Client(token="t", member_store_threshold=2)
+    small = _guild_payload("1", ["10"])
+    large = _guild_payload("2", ["20", "21"])
+    large["presences"] = [{"user": {"id": "20"}, "status": "online"}]
+    client.parse_guild(small)
+    guild = client.parse_guild(large)
+
+    assert not isinstance(client.get_guild("1")._members, ColumnarMemberStore)
+    assert isinstance(guild._members, ColumnarMemberStore)
+    assert guild.get_member("20").status == "online"
+    assert guild._members.online_count == 1
+    assert {m.id for m in client.get_all_members()} == {"10", "20", "21"}
+    assert client._users.get("20") is None
+    assert client.memory_report()["members"]["entries"] == 3
+
+    with pytest.raises(TypeError):
+        guild._members.add_budget(None)
+
+
+@pytest.mark.asyncio
+async def test_member_events_update_the_store():
+    client = Client(token="t", member_store_threshold=1)
+    guild = client.parse_guild(_guild_payload("2", ["20"]))
+    seen = []
+
+    @client.on_event("GUILD_MEMBER_ADD")
+    async def on_member(member):
+        seen.append(member)
+        member.roles.append("9")
+        member.nick = "listener"
+
+    await client._event_dispatcher.dispatch(
+        "GUILD_MEMBER_ADD",
+        {
+            "guild_id": "2",
+            "user": {"id": "20", "username": "renamed"},
+            "joined_at": "t",
+            "roles": ["8"],
+        },
+    )
+
+    assert isinstance(seen[0], MemberView)
+    stored = guild.get_member("20")
+    assert stored.username == "renamed"
+    assert stored.roles == ["8", "9"]
+    assert stored.nick == "listener"
+    assert len(guild._members) == 1
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from disagreement.gateway import GatewayClient
+from disagreement.json_codec import get_codec
+from disagreement.session_store import FileSessionStore, SessionState, SessionStore
+
+
+class DummyDispatcher:
+    async def dispatch(self, *_):
+        pass
+
+
+class DummyClient:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.application_id = None
+        self.user = None
+        self._ready_event = asyncio.Event()
+
+    def parse_user(self, data):
+        return data["username"]
+
+
+def make_gateway(store, **kwargs):
+    return GatewayClient(
+        http_client=object(),
+        event_dispatcher=DummyDispatcher(),
+        token="t",
+        intents=0,
+        client_instance=DummyClient(),
+        session_store=store,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_file_store_round_trip(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    state = SessionState("abc", 42, "wss://resume", shard_count=2)
+
+    await store.save(1, state)
+    assert await store.load(1) == state
+    assert await store.load(0) is None
+
+    await store.delete(1)
+    assert await store.load(1) is None
+
+
+@pytest.mark.asyncio
+async def test_file_store_ignores_expired_and_corrupt(tmp_path):
+    path = tmp_path / "sessions.json"
+    store = FileSessionStore(path, max_age=60)
+    await store.save(0, SessionState("abc", 1, "wss://r", saved_at=time.time() - 120))
+    assert await store.load(0) is None
+
+    (tmp_path / "sessions.json.0").write_text("not json")
+    assert await store.load(0) is None
+
+
+def test_processes_saving_different_shards_keep_each_other(tmp_path):
+    path = tmp_path / "sessions.json"
+
+    async def save_from_own_process(shard_id):
+        # Each cluster process has its own store and lock.
+        store = FileSessionStore(path)
+        await store.save(shard_id, SessionState(f"s{shard_id}", shard_id, "wss://r"))
+
+    async def main():
+        await asyncio.gather(*(save_from_own_process(i) for i in range(8)))
+        store = FileSessionStore(path)
+        return [await store.load(i) for i in range(8)]
+
+    states = asyncio.run(main())
+    assert [s.session_id for s in states] == [f"s{i}" for i in range(8)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"sessions.json.{i}" for i in range(8)
+    ]
+
+
+def test_incomplete_store_fails_on_instantiation():
+    class LoadOnly(SessionStore):
+        async def load(self, shard_id):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnly()
+
+
+@pytest.mark.asyncio
+async def test_file_store_uses_given_codec(tmp_path):
+    codec = get_codec("json")
+    store = FileSessionStore(tmp_path / "sessions.json", json_codec=codec)
+    assert store.json_codec is codec
+
+    await store.save(0, SessionState("abc", 1, "wss://r"))
+    assert (tmp_path / "sessions.json.0").read_bytes().startswith(b'{"session_id":')
+
+
+@pytest.mark.asyncio
+async def test_close_saves_session_with_resumable_code(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    gw = make_gateway(store)
+    gw._session_id = "abc"
+    gw._last_sequence = 7
+    gw._resume_gateway_url = "wss://resume"
+    gw._session_user = {"username": "bot"}
+    ws = AsyncMock()
+    ws.closed = False
+    gw._ws = ws
+
+    await gw.close()
+
+    ws.close.assert_awaited_once_with(code=4000)
+    state = await store.load(0)
+    assert (state.session_id, state.sequence) == ("abc", 7)
+    assert json.loads((tmp_path / "sessions.json.0").read_text())["user"] == {
+        "username": "bot"
+    }
+
+
+@pytest.mark.asyncio
+async def test_reconnect_close_does_not_save(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    gw = make_gateway(store)
+    gw._session_id = "abc"
+    gw._last_sequence = 7
+    gw._resume_gateway_url = "wss://resume"
+
+    await gw.close(code=4000, reconnect=True)
+
+    assert await store.load(0) is None
+
+
+@pytest.mark.asyncio
+async def test_restore_session_prepares_resume(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    await store.save(
+        0,
+        SessionState(
+            "abc", 7, "wss://resume", application_id="123", user={"username": "bot"}
+        ),
+    )
+    gw = make_gateway(store)
+
+    await gw._restore_session()
+
+    assert gw.restored_session
+    assert (gw._session_id, gw._last_sequence, gw._resume_gateway_url) == (
+        "abc",
+        7,
+        "wss://resume",
+    )
+    assert gw._client_instance.user == "bot"
+    assert gw._client_instance.application_id == "123"
+
+    await gw._handle_dispatch({"op": 0, "t": "RESUMED", "s": 8, "d": {}})
+    assert gw._client_instance._ready_event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_restore_skips_mismatched_shard_count(tmp_path):
+    store = FileSessionStore(tmp_path / "sessions.json")
+    await store.save(1, SessionState("abc", 7, "wss://resume", shard_count=2))
+    gw = make_gateway(store, shard_id=1, shard_count=4)
+
+    await gw._restore_session()
+
+    assert gw._session_id is None
+    assert not gw.restored_session
@@ -3,7 +3,6 @@ from unittest.mock import AsyncMock
 
 from disagreement.shard_manager import ShardManager
 from disagreement.client import Client, AutoShardedClient
-from disagreement.event_dispatcher import EventDispatcher
 
 
 class DummyGateway:
@@ -28,15 +27,10 @@ class DummyGateway:
         self.resume = AsyncMock(side_effect=emit_resume)
 
 
-class DummyClient:
+class DummyClient(Client):
     def __init__(self):
+        super().__init__(token="t")
         self._http = object()
-        self._event_dispatcher = EventDispatcher(self)
-        self.token = "t"
-        self.intents = 0
-        self.verbose = False
-        self.gateway_max_retries = 5
-        self.gateway_max_backoff = 60.0
 
 
 def test_shard_manager_creates_shards(monkeypatch):
@@ -116,3 +110,86 @@ async def test_shard_events_emitted(monkeypatch):
     assert ("connect", 0) in events
     assert ("disconnect", 0) in events
     assert ("resume", 0) in events
+
+
+@pytest.mark.asyncio
+async def test_identify_limiter_paces_buckets():
+    import asyncio
+    import time
+
+    from disagreement.rate_limiter import IdentifyLimiter
+
+    limiter = IdentifyLimiter(max_concurrency=2, window=0.05, remaining=10)
+    start = time.monotonic()
+    times = {}
+
+    async def identify(shard_id):
+        await limiter.acquire(shard_id)
+        times[shard_id] = time.monotonic() - start
+
+    await asyncio.gather(*(identify(i) for i in range(4)))
+
+    assert times[0] < 0.04 and times[1] < 0.04
+    assert times[2] >= 0.045 and times[3] >= 0.045
+    assert limiter.remaining == 6
+
+
+class IdentifyingGateway:
+    """Fake gateway that identifies through the shared limiter on connect."""
+
+    connected: list = []
+
+    def __init__(self, *args, **kwargs):
+        import asyncio
+
+        self.shard_id = kwargs["shard_id"]
+        self.limiter = kwargs["identify_limiter"]
+        self.identified_event = asyncio.Event()
+        self.ready_event = asyncio.Event()
+        self.close = AsyncMock()
+
+    async def connect(self):
+        import asyncio
+
+        IdentifyingGateway.connected.append(self.shard_id)
+
+        async def identify():
+            await self.limiter.acquire(self.shard_id)
+            self.identified_event.set()
+            self.ready_event.set()
+
+        asyncio.create_task(identify())
+
+
+@pytest.mark.asyncio
+async def test_shard_manager_launches_in_waves(monkeypatch):
+    monkeypatch.setattr(
+        "disagreement.shard_manager.GatewayClient", IdentifyingGateway
+    )
+    IdentifyingGateway.connected = []
+
+    class DummyHTTP:
+        async def get_gateway_bot(self):
+            return {
+                "url": "wss://gateway.discord.gg",
+                "shards": 4,
+                "session_start_limit": {
+                    "total": 1000,
+                    "remaining": 999,
+                    "reset_after": 1000,
+                    "max_concurrency": 2,
+                },
+            }
+
+    client = DummyClient()
+    client._http = DummyHTTP()
+    manager = ShardManager(client, shard_count=4)
+    manager.identify_limiter.window = 0.01
+
+    await manager.start()
+    await manager.wait_until_ready()
+
+    assert manager.max_concurrency == 2
+    assert manager.remaining_session_starts == 995
+    assert IdentifyingGateway.connected == [0, 1, 2, 3]
+    assert manager.progress == {"total": 4, "identified": 4, "ready": 4}
@@ -33,3 +33,92 @@ async def test_wait_for_timeout():
     client = Client(token="t")
     with pytest.raises(asyncio.TimeoutError):
         await client.wait_for("MESSAGE_CREATE", timeout=0.1)
+
+
+def _message(message_id, channel_id, author_id):
+    return {
+        "id": message_id,
+        "channel_id": channel_id,
+        "author": {"id": author_id, "username": "u", "discriminator": "0001"},
+        "content": message_id,
+        "timestamp": "t",
+    }
+
+
+@pytest.mark.asyncio
+async def test_wait_for_keyed_only_checks_matching_waiters():
+    client = Client(token="t")
+    checked = []
+
+    def check(message):
+        checked.append(message.id)
+        return True
+
+    waits = [
+        asyncio.create_task(
+            client.wait_for(
+                "MESSAGE_CREATE", check=check, channel_id=f"c{i}", author_id="1"
+            )
+        )
+        for i in range(100)
+    ]
+    await asyncio.sleep(0)
+
+    await client._event_dispatcher.dispatch("MESSAGE_CREATE", _message("m", "c7", "1"))
+    await client._event_dispatcher.dispatch("MESSAGE_CREATE", _message("x", "c8", "2"))
+    await asyncio.sleep(0)
+
+    assert checked == ["m"]
+    assert waits[7].done() and waits[7].result().id == "m"
+    assert not waits[8].done()
+    for task in waits:
+        task.cancel()
+    await asyncio.gather(*waits, return_exceptions=True)
+    assert client._event_dispatcher._waiters == {}
+    assert client._event_dispatcher._waiter_index == {}
+
+
+@pytest.mark.asyncio
+async def test_wait_for_key_types_are_normalised():
+    client = Client(token="t")
+    wait = asyncio.create_task(client.wait_for("MESSAGE_CREATE", channel_id=5, timeout=1))
+    await asyncio.sleep(0)
+    await client._event_dispatcher.dispatch("MESSAGE_CREATE", _message("m", "5", "1"))
+    assert (await wait).id == "m"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_keyed_and_unkeyed_waiters_both_resolve():
+    client = Client(token="t")
+    keyed = asyncio.create_task(
+        client.wait_for("MESSAGE_UPDATE", message_id="m", timeout=1)
+    )
+    unkeyed = asyncio.create_task(client.wait_for("MESSAGE_UPDATE", timeout=1))
+    await asyncio.sleep(0)
+    await client._event_dispatcher.dispatch("MESSAGE_UPDATE", _message("m", "c", "1"))
+    assert (await keyed).id == "m"
+    assert (await unkeyed).id == "m"
+
+
+@pytest.mark.asyncio
+async def test_waiter_index_extracts_raw_payload_keys():
+    client = Client(token="t")
+    dispatcher = client._event_dispatcher
+    reaction = asyncio.get_running_loop().create_future()
+    dispatcher.add_waiter(
+        "RAW_MESSAGE_REACTION_ADD", reaction, keys={"message_id": "m", "author_id": "u"}
+    )
+    component = asyncio.get_running_loop().create_future()
+    dispatcher.add_waiter("RAW_CUSTOM", component, keys={"custom_id": "confirm"})
+
+    dispatcher._resolve_waiters(
+        "RAW_MESSAGE_REACTION_ADD", {"message_id": "m", "user_id": "u", "channel_id": "c"}
+    )
+    dispatcher._resolve_waiters("RAW_CUSTOM", {"data": {"custom_id": "confirm"}})
+    assert reaction.done() and component.done()
+
+
+def test_unknown_waiter_key_rejected():
+    client = Client(token="t")
+    with pytest.raises(ValueError):
+        client._event_dispatcher.add_waiter("MESSAGE_CREATE", object(), keys={"nope": 1})